@@ -6,8 +6,10 @@ from reportlab.lib.units import mm
 from reportlab.lib.colors import HexColor
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.rl_config import TTFSearchPath
+from reportlab.platypus import Paragraph, Spacer
 import os
+import re
+import threading
 
 
 # ---------- Fonts Setup ----------
@@ -17,25 +19,52 @@ TIMES_BOLD = "/System/Library/Fonts/Supplemental/Times New Roman Bold.ttf"
 TIMES_ITALIC = "/System/Library/Fonts/Supplemental/Times New Roman Italic.ttf"
 TIMES_BOLD_ITALIC = "/System/Library/Fonts/Supplemental/Times New Roman Bold Italic.ttf"
 
+FONTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")  # next to this module, not the CWD
+
 FONT_CANDIDATES = [
     ("TimesCustom", TIMES_REG, TIMES_BOLD, TIMES_ITALIC, TIMES_BOLD_ITALIC),
-    ("DejaVuSerif", "fonts/DejaVuSerif.ttf", "fonts/DejaVuSerif-Bold.ttf", 
-     "fonts/DejaVuSerif-Italic.ttf", "fonts/DejaVuSerif-BoldItalic.ttf"),
+    ("DejaVuSerif", f"{FONTS_DIR}/DejaVuSerif.ttf", f"{FONTS_DIR}/DejaVuSerif-Bold.ttf",
+     f"{FONTS_DIR}/DejaVuSerif-Italic.ttf", f"{FONTS_DIR}/DejaVuSerif-BoldItalic.ttf"),
 ]
 
+# Installed fonts are searched for these families next (font_discovery.py): Times New
+# Roman, the serifs metric-compatible with it, then DejaVu Serif. The index of installed
+# fonts is saved and reused until a font directory changes. ACADEMIC_FONT_DISCOVERY=0
+# keeps to FONT_CANDIDATES.
+SERIF_FAMILIES = ["Times New Roman", "Liberation Serif", "Tinos", "Nimbus Roman", "FreeSerif", "DejaVu Serif"]
+FONT_DISCOVERY = os.environ.get("ACADEMIC_FONT_DISCOVERY", "1") != "0"
+
+class SharedTTFont(TTFont):
+    """TTFont that documents saved in several threads (worker_pool, pipeline) can embed
+    at once. Subsetting reads the font file through a read position on the face, so
+    one document at a time adds the font's subsets."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._subset_lock = threading.Lock()
+
+    def addObjects(self, doc):
+        with self._subset_lock:
+            super().addObjects(doc)
+
 def register_academic_fonts():
     """Registers fonts for academic style"""
-    TTFSearchPath.append(os.path.abspath("fonts"))
-    for fam, reg, bld, it, bi in FONT_CANDIDATES:
+    candidates = list(FONT_CANDIDATES)
+    if FONT_DISCOVERY:
+        from font_discovery import find_family
+        found = find_family(SERIF_FAMILIES)
+        if found:
+            candidates.append(found)
+    for fam, reg, bld, it, bi in candidates:
         if os.path.exists(reg):
             try:
-                pdfmetrics.registerFont(TTFont(fam, reg))
+                pdfmetrics.registerFont(SharedTTFont(fam, reg))
                 if os.path.exists(bld):
-                    pdfmetrics.registerFont(TTFont(fam+"-Bold", bld))
+                    pdfmetrics.registerFont(SharedTTFont(fam+"-Bold", bld))
                 if os.path.exists(it):
-                    pdfmetrics.registerFont(TTFont(fam+"-Italic", it))
+                    pdfmetrics.registerFont(SharedTTFont(fam+"-Italic", it))
                 if os.path.exists(bi):
-                    pdfmetrics.registerFont(TTFont(fam+"-BoldItalic", bi))
+                    pdfmetrics.registerFont(SharedTTFont(fam+"-BoldItalic", bi))
                 return fam
             except Exception:
                 continue
@@ -45,6 +74,33 @@ BASE_FONT = register_academic_fonts()
 BOLD_FONT = BASE_FONT + "-Bold" if BASE_FONT != "Times-Roman" else "Times-Bold"
 ITALIC_FONT = BASE_FONT + "-Italic" if BASE_FONT != "Times-Roman" else "Times-Italic"
 
+# Characters the academic font has no glyph for are set in the first of these fonts
+# that has one (font_fallback.py): (name, regular, bold or None). Files are loaded only
+# when a character needs them. ACADEMIC_FONT_FALLBACK=0 turns this off.
+DEJAVU_DIR = "/usr/share/fonts/truetype/dejavu"
+FALLBACK_FONTS = [
+    ("DejaVuSerif", f"{DEJAVU_DIR}/DejaVuSerif.ttf", f"{DEJAVU_DIR}/DejaVuSerif-Bold.ttf"),
+    ("DejaVuSans", f"{FONTS_DIR}/DejaVuSans.ttf", f"{FONTS_DIR}/DejaVuSans-Bold.ttf"),
+    ("DejaVuSans", f"{DEJAVU_DIR}/DejaVuSans.ttf", f"{DEJAVU_DIR}/DejaVuSans-Bold.ttf"),
+    ("FreeSerif", "/usr/share/fonts/truetype/freefont/FreeSerif.ttf",
+     "/usr/share/fonts/truetype/freefont/FreeSerifBold.ttf"),
+    ("ArialUnicode", "/System/Library/Fonts/Supplemental/Arial Unicode.ttf", None),
+    ("DroidSansFallback", "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf", None),
+]
+FONT_FALLBACK = os.environ.get("ACADEMIC_FONT_FALLBACK", "1") != "0"
+
+# Styles are set in kerned variants of the fonts (kerning.py) with ACADEMIC_KERNING=1;
+# the 'kern' table of a font is read once per process. Kerned text wraps by words
+# (CJK wrapping measures letters one at a time, without their pairs).
+KERNING = os.environ.get("ACADEMIC_KERNING", "0") == "1"
+
+def academic_font(name):
+    """Font name for styles: its kerned variant if KERNING is on (and the font has one)"""
+    if not KERNING:
+        return name
+    from kerning import kerned_font
+    return kerned_font(name)
+
 
 # ---------- Academic Style Colors ----------
 
@@ -58,13 +114,15 @@ LINK_COLOR = HexColor("#1a1a1a")      # For links (with underline)
 def get_academic_styles():
     """Returns dictionary of styles in academic format"""
     base = getSampleStyleSheet()
+    regular, bold = academic_font(BASE_FONT), academic_font(BOLD_FONT)
+    wrap = None if regular != BASE_FONT else 'CJK'
     
     return {
         # Document title (academic style)
         "title": ParagraphStyle(
             "title",
             parent=base["Normal"],
-            fontName=BOLD_FONT,
+            fontName=bold,
             fontSize=13,
             leading=16,
             textColor=TEXT_COLOR,
@@ -76,7 +134,7 @@ def get_academic_styles():
         "meta": ParagraphStyle(
             "meta",
             parent=base["Normal"],
-            fontName=BASE_FONT,
+            fontName=regular,
             fontSize=9.5,
             leading=12,
             textColor=META_COLOR,
@@ -88,7 +146,7 @@ def get_academic_styles():
         "date": ParagraphStyle(
             "date",
             parent=base["Normal"],
-            fontName=BASE_FONT,
+            fontName=regular,
             fontSize=10,
             leading=13,
             textColor=TEXT_COLOR,
@@ -100,35 +158,35 @@ def get_academic_styles():
         "body": ParagraphStyle(
             "body",
             parent=base["Normal"],
-            fontName=BASE_FONT,
+            fontName=regular,
             fontSize=10.5,
             leading=13,  # Tight leading for academic papers
             textColor=TEXT_COLOR,
             spaceAfter=3*mm,
             alignment=4,  # justify for academic style
             firstLineIndent=0,
-            wordWrap='CJK',  # Better word wrapping
+            wordWrap=wrap,  # Better word wrapping
         ),
         
         # Body text left-aligned (for lists without bullets - academic style)
         "body_left": ParagraphStyle(
             "body_left",
             parent=base["Normal"],
-            fontName=BASE_FONT,
+            fontName=regular,
             fontSize=10.5,
             leading=13,
             textColor=TEXT_COLOR,
             spaceAfter=1.5*mm,
             alignment=0,  # left
             leftIndent=0,
-            wordWrap='CJK',
+            wordWrap=wrap,
         ),
         
         # Signature
         "signature": ParagraphStyle(
             "signature",
             parent=base["Normal"],
-            fontName=BASE_FONT,
+            fontName=regular,
             fontSize=11,
             leading=16,
             textColor=TEXT_COLOR,
@@ -140,7 +198,7 @@ def get_academic_styles():
         "signature_name": ParagraphStyle(
             "signature_name",
             parent=base["Normal"],
-            fontName=BASE_FONT,
+            fontName=regular,
             fontSize=11,
             leading=16,
             textColor=TEXT_COLOR,
@@ -152,7 +210,7 @@ def get_academic_styles():
         "section": ParagraphStyle(
             "section",
             parent=base["Normal"],
-            fontName=BOLD_FONT,
+            fontName=bold,
             fontSize=10.5,
             leading=13,
             textColor=TEXT_COLOR,
@@ -166,7 +224,7 @@ def get_academic_styles():
         "subsection": ParagraphStyle(
             "subsection",
             parent=base["Normal"],
-            fontName=BOLD_FONT,
+            fontName=bold,
             fontSize=10.5,
             leading=13,
             textColor=TEXT_COLOR,
@@ -178,7 +236,7 @@ def get_academic_styles():
         "meta_text": ParagraphStyle(
             "meta_text",
             parent=base["Normal"],
-            fontName=BASE_FONT,
+            fontName=regular,
             fontSize=9.5,
             leading=12,
             textColor=META_COLOR,
@@ -188,6 +246,61 @@ def get_academic_styles():
     }
 
 
+# ---------- Letterhead, Line Breaking, Layout Cache and Fast Path ----------
+
+# The NAME / LINKS header of letters is drawn once per PDF as a shared form (letterhead.py):
+# in the first page layout on the first page of each document and, with
+# ACADEMIC_LETTERHEAD_CONTINUATION=compact or full, in the top margin of its later pages
+# (default: none, later pages as before). ACADEMIC_LETTERHEAD=0 keeps the header as
+# plain paragraphs on the first page only.
+LETTERHEAD_LAYOUTS = ("full", "compact", "none")
+LETTERHEAD = os.environ.get("ACADEMIC_LETTERHEAD", "1") != "0"
+LETTERHEAD_FIRST_PAGE = os.environ.get("ACADEMIC_LETTERHEAD_FIRST_PAGE", "full")
+LETTERHEAD_CONTINUATION = os.environ.get("ACADEMIC_LETTERHEAD_CONTINUATION", "none")
+
+# Justified text is broken greedily by reportlab ("greedy"), by the optimal-fit breaker
+# in line_breaking.py ("optimal", between words only) or by the optimal-fit breaker
+# with hyphenation ("hyphenated", not ATS-safe). ACADEMIC_LINE_BREAKING=optimal switches
+# every template without code changes (worker processes inherit it too).
+LINE_BREAKING_MODES = ("greedy", "optimal", "hyphenated")
+LINE_BREAKING = os.environ.get("ACADEMIC_LINE_BREAKING", "greedy")
+
+# Wrapped paragraph blocks are reused across documents rendered in the same process
+# (layout_cache.py); ACADEMIC_LAYOUT_CACHE=0 turns this off
+LAYOUT_CACHE = os.environ.get("ACADEMIC_LAYOUT_CACHE", "1") != "0"
+
+# Simple one-page letters are drawn straight onto the canvas (fast_letter.py);
+# ACADEMIC_FAST_LETTER=0 builds every document with SimpleDocTemplate
+FAST_LETTER = os.environ.get("ACADEMIC_FAST_LETTER", "1") != "0"
+
+# Images are read and decoded in a thread pool while the story is assembled
+# (image_loader.py); ACADEMIC_IMAGE_PREFETCH=0 leaves them to reportlab's Image
+IMAGE_PREFETCH = os.environ.get("ACADEMIC_IMAGE_PREFETCH", "1") != "0"
+
+def prepare_story(story, mode=None):
+    """Applies fallback fonts, the letterhead, line breaking mode (default:
+    LINE_BREAKING), the layout cache and kerned drawing to story"""
+    mode = mode or LINE_BREAKING
+    if mode not in LINE_BREAKING_MODES:
+        raise ValueError(f"Unknown line breaking mode: {mode} (use one of {', '.join(LINE_BREAKING_MODES)})")
+    if FONT_FALLBACK:
+        from font_fallback import fallback_story
+        fallback_story(story)
+    if LETTERHEAD:
+        from letterhead import letterhead_story
+        letterhead_story(story, LETTERHEAD_FIRST_PAGE, LETTERHEAD_CONTINUATION)
+    if mode != "greedy":
+        from line_breaking import optimize_story
+        optimize_story(story, hyphenate=mode == "hyphenated")
+    if LAYOUT_CACHE:
+        from layout_cache import cache_story
+        cache_story(story)
+    if KERNING:
+        from kerning import kern_story
+        kern_story(story)
+    return story
+
+
 # ---------- Academic Margins ----------
 
 def get_academic_margins():
@@ -206,18 +319,53 @@ def format_academic_email_link(email):
     """Formats email in academic style (with underline)"""
     return f'<a href="mailto:{email}" color="#1a1a1a"><u>{email}</u></a>'
 
+def academic_full_url(url):
+    """Adds https:// to URLs without a scheme"""
+    if not url.startswith(("http://", "https://")):
+        return f"https://{url}"
+    return url
+
 def format_academic_url_link(name, url):
     """Formats URL in academic style (with underline)"""
-    if not url.startswith(("http://", "https://")):
-        full_url = f"https://{url}"
-    else:
-        full_url = url
-    return f'<a href="{full_url}" color="#1a1a1a"><u>{name}</u></a>'
+    return f'<a href="{academic_full_url(url)}" color="#1a1a1a"><u>{name}</u></a>'
 
 def format_academic_simple_url(url):
     """Formats URL without name in academic style"""
-    if not url.startswith(("http://", "https://")):
-        full_url = f"https://{url}"
-    else:
-        full_url = url
-    return f'<a href="{full_url}" color="#1a1a1a"><u>{url}</u></a>'
+    return f'<a href="{academic_full_url(url)}" color="#1a1a1a"><u>{url}</u></a>'
+
+
+# ---------- Letter Body ----------
+
+# Blank-line separated blocks of a letter body become one paragraph each, spaced one
+# line apart (the blank line <br/><br/> used to leave), so pages break between and
+# inside paragraphs with widow/orphan control, and each paragraph wraps and caches on
+# its own. Lead-ins (salutation, sign-off, "Label:") and short headings (a line that
+# ends in a letter or digit) keep with the paragraph after them.
+HEADING_MAX_CHARS = 40
+
+def _keeps_with_next(markup):
+    text = re.sub(r"<[^>]+>", "", markup).strip()
+    return text.endswith((",", ":")) or (len(text) <= HEADING_MAX_CHARS and text[-1:].isalnum())
+
+def body_paragraphs(text, style):
+    """Flowables of letter body text: a paragraph per blank-line separated block"""
+    para_style = ParagraphStyle(style.name, parent=style, spaceAfter=style.leading, allowWidows=0, allowOrphans=0)
+    blocks, blank = [], 0  # [markup, blank lines before], as with "\n\n" -> "<br/><br/>"
+    for part in text.replace("\n\n", "<br/><br/>").split("<br/>"):
+        if not part.strip():
+            blank += 1
+        elif blocks and not blank:
+            blocks[-1][0] += "<br/>" + part
+        else:
+            blocks.append([part, blank])
+            blank = 0
+    flowables = []
+    for i, (markup, blank) in enumerate(blocks):
+        extra = blank if i == 0 else blank - 1  # one blank line is the previous paragraph's spaceAfter
+        if extra > 0:
+            flowables.append(Spacer(1, extra * style.leading))
+        p = Paragraph(markup, para_style)
+        if i < len(blocks) - 1 and _keeps_with_next(markup):
+            p.keepWithNext = 1
+        flowables.append(p)
+    return flowables
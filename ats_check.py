@@ -0,0 +1,620 @@
+# ats_check.py
+# ATS readability check: reads the text layer of generated PDFs back and compares it
+# with the template source
+#
+# Applicant tracking systems see the text layer of a PDF, not its appearance. A small
+# text extractor for the PDFs reportlab writes here (Flate/ASCII85 streams, object
+# streams from the compact profile, WinAnsi and ToUnicode fonts, form XObjects)
+# rebuilds lines in reading order the way extractors do: top to bottom, left to
+# right, spaces inferred from gaps. The words are then aligned with the source
+# (story paragraphs built from BODY/DATA, or DATA for canvas-drawn CVs) to flag broken
+# or merged words, text read out of order, missing text and links whose annotation
+# is missing or sits over other text.
+
+import base64
+import contextlib
+import io
+import os
+import re
+import zlib
+from difflib import SequenceMatcher
+from operator import itemgetter
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.rl_codecs import RL_Codecs
+
+from templates import load_template
+
+
+SPACE_GAP = 0.15  # gap between text pieces (in font sizes) read as a space
+LINE_TOLERANCE = 0.35  # baseline difference (in font sizes) still read as the same line
+
+BROKEN = "broken word"
+MERGED = "merged words"
+REORDERED = "reordered"
+MISSING = "missing text"
+MISSING_LINK = "missing link"
+LINK_TEXT = "misplaced link"
+
+RL_Codecs.register()  # "winansi" codec: reportlab's encoding of the standard fonts
+
+
+# ---------- PDF Objects ----------
+
+_TOKEN_RE = re.compile(rb"""
+    \s+ | %[^\r\n]*
+  | (\((?:[^()\\]|\\.)*\))            # 1 literal string (reportlab escapes parentheses)
+  | (<<|>>|\[|\])                     # 2 delimiter
+  | (<[0-9A-Fa-f\s]*>)                # 3 hex string
+  | (/[^\s()<>\[\]{}/%]*)             # 4 name
+  | ([+-]?(?:\d+\.?\d*|\.\d+))        # 5 number
+  | ([^\s()<>\[\]{}/%]+)              # 6 keyword or operator
+""", re.S | re.X)
+_STRING, _DELIM, _HEX, _NAME, _NUMBER, _KEYWORD = range(1, 7)
+
+_NUMBERS_RE = re.compile(rb"\[([\s\d.+-]*)\]")  # arrays of plain numbers (widths, rectangles)
+_OBJ_RE = re.compile(rb"(\d+)\s+\d+\s+obj\b")
+_STREAM_RE = re.compile(rb"\s*stream\r?\n")
+_ESCAPE_RE = re.compile(rb"\\([0-7]{1,3}|\r\n|.)", re.S)
+_ESCAPES = {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f", b"\r\n": b"", b"\n": b"", b"\r": b""}
+
+
+class _Ref(int):
+    """Indirect object reference (object number)"""
+    __slots__ = ()
+
+
+def _literal(token):
+    """Bytes of a (...) string token"""
+    s = token[1:-1]
+    if b"\\" not in s:
+        return s
+    return _ESCAPE_RE.sub(lambda m: bytes([int(m.group(1), 8) & 255]) if m.group(1)[:1].isdigit()
+                          else _ESCAPES.get(m.group(1), m.group(1)), s)
+
+
+def _hex(token):
+    digits = re.sub(rb"\s", b"", token[1:-1])
+    return bytes.fromhex((digits + b"0" * (len(digits) % 2)).decode())
+
+
+def _parse_object(data, pos):
+    """Parses one object (number, string, name, array, dict) at pos: (value, end)"""
+    stack = [[]]
+    while True:
+        m = _TOKEN_RE.match(data, pos)
+        if not m:
+            raise ValueError(f"Unreadable PDF object at byte {pos}")
+        pos = m.end()
+        kind = m.lastindex
+        if kind is None:
+            continue
+        token = m.group(kind)
+        if kind == _STRING:
+            value = _literal(token)
+        elif kind == _DELIM:
+            numbers = _NUMBERS_RE.match(data, m.start()) if token == b"[" else None
+            if numbers:
+                pos = numbers.end()
+                value = [float(n) if b"." in n else int(n) for n in numbers.group(1).split()]
+            elif token in (b"[", b"<<"):
+                stack.append([])
+                continue
+            else:
+                items = stack.pop()
+                value = items if token == b"]" else dict(zip(items[::2], items[1::2]))
+        elif kind == _HEX:
+            value = _hex(token)
+        elif kind == _NAME:
+            value = token[1:].decode("latin-1")
+        elif kind == _NUMBER:
+            value = float(token) if b"." in token else int(token)
+        elif token == b"R":
+            stack[-1].pop()  # generation
+            value = _Ref(stack[-1].pop())
+        else:
+            value = {b"true": True, b"false": False}.get(token)
+        if len(stack) == 1:
+            return value, pos
+        stack[-1].append(value)
+
+
+def _decode_stream(d, raw):
+    filters = d.get("Filter", [])
+    for name in [filters] if isinstance(filters, str) else filters:
+        if name == "FlateDecode":
+            raw = zlib.decompressobj().decompress(raw)
+        elif name == "ASCII85Decode":
+            raw = base64.a85decode(raw.strip(), adobe=True)
+        else:
+            raise ValueError(f"Unsupported stream filter: {name}")
+    return raw
+
+
+class _Pdf:
+    """Objects of a PDF file, read by one sequential scan (no cross-reference table needed)"""
+
+    def __init__(self, data):
+        self.objects = {}
+        self.streams = {}  # object number -> raw stream bytes
+        pos = 0
+        while True:
+            m = _OBJ_RE.search(data, pos)
+            if not m:
+                break
+            num = int(m.group(1))
+            value, pos = _parse_object(data, m.end())
+            self.objects[num] = value
+            s = _STREAM_RE.match(data, pos)
+            if s and isinstance(value, dict):
+                length = value.get("Length")
+                if not isinstance(length, int) or isinstance(length, _Ref):
+                    length = data.index(b"endstream", s.end()) - s.end()
+                self.streams[num] = data[s.end():s.end() + length]
+                pos = s.end() + length
+        for num, value in list(self.objects.items()):
+            if isinstance(value, dict) and value.get("Type") == "ObjStm":
+                body = self.stream(num)
+                header = body[:value["First"]].split()
+                for i in range(0, len(header), 2):
+                    self.objects[int(header[i])] = _parse_object(body, value["First"] + int(header[i + 1]))[0]
+
+    def get(self, value):
+        while isinstance(value, _Ref):
+            value = self.objects.get(value)
+        return value
+
+    def stream(self, ref):
+        return _decode_stream(self.objects[ref], self.streams.get(ref, b""))
+
+    def pages(self):
+        """[(page dict, inherited resources), ...] in document order"""
+        root = next(v for v in self.objects.values() if isinstance(v, dict) and v.get("Type") == "Catalog")
+        out = []
+
+        def walk(node, resources):
+            node = self.get(node)
+            resources = self.get(node.get("Resources", resources))
+            if node.get("Type") == "Pages":
+                for kid in self.get(node["Kids"]):
+                    walk(kid, resources)
+            else:
+                out.append((node, resources))
+
+        walk(root["Pages"], {})
+        return out
+
+
+# ---------- Fonts ----------
+
+_BFCHAR_RE = re.compile(rb"beginbfchar(.*?)endbfchar", re.S)
+_BFRANGE_RE = re.compile(rb"beginbfrange(.*?)endbfrange", re.S)
+_PAIR_RE = re.compile(rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>")
+_RANGE_RE = re.compile(rb"<([0-9A-Fa-f]+)>\s*<([0-9A-Fa-f]+)>\s*(<[0-9A-Fa-f]+>|\[[^\]]*\])")
+_CMAP_CACHE = {}  # raw ToUnicode stream -> translation table
+
+
+def _utf16(hex_digits):
+    text = bytes.fromhex(hex_digits.decode()).decode("utf-16-be", "replace")
+    return "\ufffd" if text == "\x00" else text
+
+
+def _to_unicode(cmap):
+    """Translation table {code: text} of a single-byte ToUnicode CMap"""
+    table = dict.fromkeys(range(256), "\ufffd")
+    for block in _BFCHAR_RE.findall(cmap):
+        for code, text in _PAIR_RE.findall(block):
+            table[int(code, 16) & 255] = _utf16(text)
+    for block in _BFRANGE_RE.findall(cmap):
+        for lo, hi, dst in _RANGE_RE.findall(block):
+            lo, hi = int(lo, 16), int(hi, 16)
+            if dst.startswith(b"["):
+                for code, text in zip(range(lo, hi + 1), re.findall(rb"<([0-9A-Fa-f]+)>", dst)):
+                    table[code & 255] = _utf16(text)
+            else:
+                start = int(dst[1:-1], 16)
+                for code in range(lo, min(hi, 255) + 1):
+                    table[code] = chr(start + code - lo)
+    return table
+
+
+_WINANSI = {code: bytes([code]).decode("winansi", "replace") for code in range(256)}
+
+
+class _Font:
+    """Text and glyph widths (1/1000 of the font size) of a simple font's codes"""
+
+    __slots__ = ("table", "widths")
+
+    def __init__(self, pdf, font):
+        base = str(font.get("BaseFont", "")).split("+")[-1]
+        to_unicode = font.get("ToUnicode")
+        if isinstance(to_unicode, _Ref):
+            raw = pdf.streams.get(to_unicode, b"")
+            if raw not in _CMAP_CACHE:
+                _CMAP_CACHE[raw] = _to_unicode(pdf.stream(to_unicode))
+            self.table = _CMAP_CACHE[raw]
+        else:
+            self.table = _WINANSI
+        widths = pdf.get(font.get("Widths"))
+        if widths:
+            first = font.get("FirstChar", 0)
+            self.widths = [0.0] * 256
+            for i, w in enumerate(pdf.get(widths)):
+                if first + i < 256:
+                    self.widths[first + i] = float(pdf.get(w))
+        elif base in pdfmetrics.standardFonts:
+            self.widths = pdfmetrics.getFont(base).widths
+        else:
+            self.widths = [500.0] * 256
+
+    def show(self, s):
+        """(text, width in 1/1000 font size) of a shown string"""
+        return s.decode("latin-1").translate(self.table), sum(map(self.widths.__getitem__, s))
+
+
+# ---------- Text Extraction ----------
+
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def _mul(m, n):
+    a, b, c, d, e, f = m
+    A, B, C, D, E, F = n
+    return (a * A + b * C, a * B + b * D, c * A + d * C, c * B + d * D, e * A + f * C + E, e * B + f * D + F)
+
+
+class _TextRun:
+    """Runs one content stream; collects shown strings as (y, x0, x1, size, text) pieces"""
+
+    def __init__(self, pdf, pieces):
+        self.pdf = pdf
+        self.pieces = pieces
+        self.fonts = {}  # font object number -> _Font
+
+    def font(self, resources, name):
+        ref = self.pdf.get(resources.get("Font", {})).get(name)
+        if ref not in self.fonts:
+            self.fonts[ref] = _Font(self.pdf, self.pdf.get(ref) or {})
+        return self.fonts[ref]
+
+    def run(self, content, resources, ctm=_IDENTITY, depth=0):
+        pieces = self.pieces
+        stack = []
+        tm = tlm = _IDENTITY
+        font, size, tc, tw, th, tl = None, 0.0, 0.0, 0.0, 1.0, 0.0
+        operands, array = [], None
+
+        def show(s):
+            nonlocal tm
+            text, width = font.show(s)
+            tx = (width * size / 1000 + tc * len(s) + tw * s.count(32)) * th
+            m = _mul(tm, ctm)
+            pieces.append((m[5], m[4], m[4] + tx * m[0], size * abs(m[3]) or size, text))
+            tm = tm[:4] + (tm[4] + tx * tm[0], tm[5] + tx * tm[1])
+
+        for match in _TOKEN_RE.finditer(content):
+            kind = match.lastindex
+            if kind is None:
+                continue
+            token = match.group(kind)
+            if kind != _KEYWORD:
+                if kind == _NUMBER:
+                    value = float(token)
+                elif kind == _STRING:
+                    value = _literal(token)
+                elif kind == _NAME:
+                    value = token[1:].decode("latin-1")
+                elif kind == _HEX:
+                    value = _hex(token)
+                elif token == b"[":
+                    array = []
+                    continue
+                elif token == b"]":
+                    operands.append(array)
+                    array = None
+                    continue
+                else:
+                    continue  # inline dictionaries (marked content) are not needed
+                (operands if array is None else array).append(value)
+                continue
+
+            op = token
+            if op == b"Tj" and operands:
+                show(operands[-1])
+            elif op == b"TJ" and operands:
+                for item in operands[-1]:
+                    if isinstance(item, bytes):
+                        show(item)
+                    else:
+                        tx = -item / 1000 * size * th
+                        tm = tm[:4] + (tm[4] + tx * tm[0], tm[5] + tx * tm[1])
+            elif op in (b"Td", b"TD") and len(operands) >= 2:
+                tx, ty = operands[-2:]
+                if op == b"TD":
+                    tl = -ty
+                a, b, c, d, e, f = tlm
+                tm = tlm = (a, b, c, d, tx * a + ty * c + e, tx * b + ty * d + f)
+            elif op in (b"T*", b"'", b'"'):
+                if op == b'"' and len(operands) >= 3:
+                    tw, tc = operands[-3], operands[-2]
+                a, b, c, d, e, f = tlm
+                tm = tlm = (a, b, c, d, -tl * c + e, -tl * d + f)
+                if op != b"T*" and operands:
+                    show(operands[-1])
+            elif op == b"Tm" and len(operands) >= 6:
+                tm = tlm = tuple(operands[-6:])
+            elif op == b"Tf" and len(operands) >= 2:
+                font, size = self.font(resources, operands[-2]), operands[-1]
+            elif op == b"BT":
+                tm = tlm = _IDENTITY
+            elif op == b"cm" and len(operands) >= 6:
+                ctm = _mul(tuple(operands[-6:]), ctm)
+            elif op == b"q":
+                stack.append(ctm)
+            elif op == b"Q" and stack:
+                ctm = stack.pop()
+            elif op == b"TL" and operands:
+                tl = operands[-1]
+            elif op == b"Tc" and operands:
+                tc = operands[-1]
+            elif op == b"Tw" and operands:
+                tw = operands[-1]
+            elif op == b"Tz" and operands:
+                th = operands[-1] / 100
+            elif op == b"Do" and operands and depth < 8:
+                ref = self.pdf.get(resources.get("XObject", {})).get(operands[-1])
+                form = self.pdf.get(ref)
+                if isinstance(form, dict) and form.get("Subtype") == "Form":
+                    matrix = tuple(map(float, self.pdf.get(form.get("Matrix", _IDENTITY))))
+                    self.run(self.pdf.stream(ref), self.pdf.get(form.get("Resources", resources)),
+                             _mul(matrix, ctm), depth + 1)
+            operands = []
+
+
+def _lines(pieces):
+    """Groups pieces into lines (top to bottom), joins each left to right"""
+    lines = []
+    line = []
+    for piece in sorted(pieces, key=lambda p: (-p[0], p[1])):
+        if line and abs(piece[0] - line[0][0]) > LINE_TOLERANCE * piece[3]:
+            lines.append(_join(line))
+            line = []
+        line.append(piece)
+    if line:
+        lines.append(_join(line))
+    return [text for text in lines if text.strip()]
+
+
+def _join(line):
+    line.sort(key=itemgetter(1))
+    out = [line[0][4]]
+    end = line[0][2]
+    for _, x0, x1, size, text in line[1:]:
+        if x0 - end > SPACE_GAP * size and not out[-1][-1:].isspace() and not text[:1].isspace():
+            out.append(" ")
+        out.append(text)
+        end = max(end, x1)
+    return "".join(out)
+
+
+def _text_under(pieces, rect):
+    x0, y0, x1, y1 = min(rect[0], rect[2]), min(rect[1], rect[3]), max(rect[0], rect[2]), max(rect[1], rect[3])
+    hits = []
+    for y, px0, px1, size, text in pieces:
+        overlap = min(px1, x1) - max(px0, x0)
+        if y0 - LINE_TOLERANCE * size <= y <= y1 and overlap > 0.5 * min(px1 - px0, x1 - x0):
+            hits.append((-y, px0, text))
+    return " ".join(text for _, _, text in sorted(hits))
+
+
+def extract_pdf(data):
+    """Text layer of a PDF (bytes or path) as an extractor reads it.
+
+    Returns (pages, links): pages is a list of text lines per page, links is a list
+    of (page number, url, text under the link rectangle) for URI link annotations.
+    """
+    if isinstance(data, (str, os.PathLike)):
+        with open(data, "rb") as f:
+            data = f.read()
+    pdf = _Pdf(data)
+    pages, links = [], []
+    for number, (page, resources) in enumerate(pdf.pages(), 1):
+        pieces = []
+        run = _TextRun(pdf, pieces)
+        contents = pdf.get(page.get("Contents", []))
+        for ref in contents if isinstance(contents, list) else [page["Contents"]]:
+            run.run(pdf.stream(ref), resources or {})
+        pages.append(_lines(pieces))
+        for annot in map(pdf.get, pdf.get(page.get("Annots", [])) or []):
+            action = pdf.get(annot.get("A")) or {}
+            if annot.get("Subtype") == "Link" and action.get("S") == "URI":
+                rect = [float(pdf.get(v)) for v in pdf.get(annot["Rect"])]
+                links.append((number, pdf.get(action["URI"]).decode("utf-8", "replace"), _text_under(pieces, rect)))
+    return pages, links
+
+
+# ---------- Source Text ----------
+
+def _frag_link(frag):
+    link = getattr(frag, "link", None)
+    if isinstance(link, list):
+        link = link[-1] if link else None
+    return link[-1] if isinstance(link, tuple) else link
+
+
+def _paragraphs(flowables):
+    from reportlab.platypus import Paragraph
+
+    for f in flowables:
+        if isinstance(f, Paragraph):
+            yield f
+        elif isinstance(getattr(f, "_content", None), list):  # KeepTogether and friends
+            yield from _paragraphs(f._content)
+        elif getattr(f, "_cellvalues", None):  # tables
+            for row in f._cellvalues:
+                for cell in row:
+                    yield from _paragraphs(cell if isinstance(cell, (list, tuple)) else [cell])
+
+
+def _contact_links(data):
+    """Links generate_cv.py draws for CV contacts: [(text, url), ...]"""
+    links = []
+    for value in data.get("contacts", {}).values():
+        if "@" in value and "://" not in value:
+            links.append((value, f"mailto:{value}"))
+        else:
+            links.append((value, value if value.startswith(("http://", "https://")) else f"https://{value}"))
+    return links
+
+
+def expected_content(module):
+    """(text, [(link text, url), ...]) a template is meant to put into its PDF.
+
+    Story templates are read from their paragraphs (built from NAME, LINKS, BODY or
+    DATA); canvas-drawn CVs from DATA.
+    """
+    if hasattr(module, "build_story"):
+        from academic_styles import get_academic_styles
+        with contextlib.redirect_stdout(io.StringIO()):
+            story = module.build_story(get_academic_styles())
+        blocks, links = [], []
+        for para in _paragraphs(story):
+            parts = [para.bulletText] if isinstance(getattr(para, "bulletText", None), str) else []
+            link = None
+            for frag in para.frags:
+                text = "\n" if getattr(frag, "lineBreak", False) else getattr(frag, "text", "")
+                parts.append(text)
+                url = _frag_link(frag)
+                if url and not url.startswith("#"):
+                    if link is not None and links[-1][1] == url:
+                        links[-1] = (links[-1][0] + text, url)
+                    else:
+                        links.append((text, url))
+                link = url
+            blocks.append("".join(parts))
+        return "\n".join(blocks), links
+    if hasattr(module, "DATA"):
+        from doc_index import source_text
+        return source_text(module), _contact_links(module.DATA)
+    raise ValueError(f"Template {module.__name__} has no story or DATA to check against")
+
+
+# ---------- Comparison ----------
+
+def _snippet(words, limit=12):
+    text = " ".join(words[:limit])
+    return f'"{text} …"' if len(words) > limit else f'"{text}"'
+
+
+def compare(expected, extracted):
+    """Issues [(kind, detail), ...] of extracted PDF text against the expected content"""
+    text, expected_links = expected
+    pages, links = extracted
+    want = text.split()
+    got = [w for lines in pages for line in lines for w in line.split()]
+
+    issues, deleted, inserted = [], [], []
+    for op, i1, i2, j1, j2 in SequenceMatcher(None, want, got, autojunk=False).get_opcodes():
+        if op == "equal":
+            continue
+        if op == "replace" and "".join(want[i1:i2]) == "".join(got[j1:j2]):
+            kind = BROKEN if j2 - j1 > i2 - i1 else MERGED
+            issues.append((kind, f'{_snippet(want[i1:i2])} reads as {_snippet(got[j1:j2])}'))
+            continue
+        if i2 > i1:
+            deleted.append(want[i1:i2])
+        if j2 > j1:
+            inserted.append(" " + " ".join(got[j1:j2]) + " ")
+
+    extra = "".join(inserted)
+    for words in deleted:
+        if f" {' '.join(words)} " in extra:
+            issues.append((REORDERED, f"{_snippet(words)} is read out of order"))
+        else:
+            issues.append((MISSING, f"{_snippet(words)} is not in the text layer"))
+
+    by_url = {}
+    for _, url, under in links:
+        by_url.setdefault(url, []).append(under)
+    for label, url in expected_links:
+        if url not in by_url:
+            issues.append((MISSING_LINK, f'"{label}" has no link annotation for {url}'))
+        elif "".join(label.split()) not in "".join("".join(by_url[url]).split()):
+            issues.append((LINK_TEXT, f'{url} covers "{" / ".join(by_url[url])}" instead of "{label}"'))
+    return issues
+
+
+# ---------- Checks ----------
+
+def check_pdf(pdf, module):
+    """Issues of a rendered PDF (bytes or path) against its template module"""
+    return compare(expected_content(module), extract_pdf(pdf))
+
+
+def check_template(name, profile="default", **overrides):
+    """Renders template in memory and checks it; returns issues"""
+    module = load_template(name, **overrides)
+    buf = io.BytesIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.build_pdf(buf, profile)
+    return check_pdf(buf.getvalue(), module)
+
+
+def check_job(job):
+    """Checks rendered (template, path, overrides) job; returns (path, issues)"""
+    name, path, overrides = job
+    return path, check_pdf(path, load_template(name, **(overrides or {})))
+
+
+def check_batch(jobs, processes=None, start_method="forkserver"):
+    """Checks rendered jobs in a worker pool; returns [(path, issues), ...] in job order"""
+    from worker_pool import get_context, preload
+
+    jobs = list(jobs)
+    ctx = get_context(start_method)
+    with ctx.Pool(processes, initializer=preload) as pool:
+        chunk = max(1, len(jobs) // (8 * (processes or os.cpu_count() or 1)))
+        return pool.map(check_job, jobs, chunksize=chunk)
+
+
+def print_report(results, elapsed):
+    flagged = 0
+    for path, issues in results:
+        if issues:
+            flagged += 1
+            print(f"⚠️ {path}: {len(issues)} issue(s)")
+            for kind, detail in issues:
+                print(f"    {kind}: {detail}")
+    print(f"{'✅' if not flagged else '⚠️'} Checked {len(results)} documents in {elapsed:.2f}s "
+          f"({len(results) / elapsed:.0f} docs/s), {flagged} with issues")
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from templates import TEMPLATES
+    from worker_pool import read_jobs
+
+    parser = argparse.ArgumentParser(description="Check that generated PDFs read back as their source text")
+    parser.add_argument("templates", nargs="*", help="templates to render in memory and check (default: all)")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override configuration variable (repeatable)")
+    parser.add_argument("--profile", default="default", help="output profile used for in-memory renders")
+    parser.add_argument("--pdf", help="check this existing PDF against the (single) template")
+    parser.add_argument("--jobs", metavar="CSV", help="check the rendered PDFs of a batch jobs file")
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    overrides = dict(item.split("=", 1) for item in args.set)
+    start = time.perf_counter()
+    if args.jobs:
+        results = check_batch(read_jobs(args.jobs), args.processes)
+    elif args.pdf:
+        if len(args.templates) != 1:
+            parser.error("--pdf needs exactly one template")
+        results = [(args.pdf, check_pdf(args.pdf, load_template(args.templates[0], **overrides)))]
+    else:
+        results = [(name, check_template(name, args.profile, **overrides)) for name in args.templates or sorted(TEMPLATES)]
+    print_report(results, time.perf_counter() - start)
@@ -0,0 +1,73 @@
+# benchmarks/bench_ats_check.py
+# ATS check benchmark: text extraction and source comparison throughput for a 10k batch
+#
+# Run from the repository root:
+#   python benchmarks/bench_ats_check.py [documents] [processes]
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_check import check_batch, compare, expected_content, extract_pdf
+from pdf_output import OUTPUT_PROFILES
+from templates import TEMPLATES, load_template
+
+
+def render_sample(out_dir):
+    """Every template in every output profile: [(template, path), ...]"""
+    sample = []
+    for profile in OUTPUT_PROFILES:
+        for name in sorted(TEMPLATES):
+            path = os.path.join(out_dir, f"{name}_{profile}.pdf")
+            with contextlib.redirect_stdout(io.StringIO()):
+                load_template(name).build_pdf(path, profile)
+            sample.append((name, path))
+    return sample
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    with tempfile.TemporaryDirectory() as tmp:
+        sample = render_sample(tmp)
+        data = {path: open(path, "rb").read() for _, path in sample}
+        jobs = [(*sample[i % len(sample)], None) for i in range(n)]
+
+        # Serial stage timings over the sample; the source text is rebuilt for every document
+        stages = {"extract": 0.0, "expected": 0.0, "compare": 0.0}
+        flagged = 0
+        runs = max(1, min(n, 2000) // len(sample))
+        for _ in range(runs):
+            for name, path in sample:
+                t0 = time.perf_counter()
+                extracted = extract_pdf(data[path])
+                t1 = time.perf_counter()
+                expected = expected_content(load_template(name))
+                t2 = time.perf_counter()
+                flagged += bool(compare(expected, extracted))
+                t3 = time.perf_counter()
+                stages["extract"] += t1 - t0
+                stages["expected"] += t2 - t1
+                stages["compare"] += t3 - t2
+        checked = runs * len(sample)
+        total = sum(stages.values())
+        print(f"{len(sample)} sample PDFs ({len(TEMPLATES)} templates x {len(OUTPUT_PROFILES)} profiles), "
+              f"{flagged // runs} with issues")
+        for stage, seconds in stages.items():
+            print(f"  {stage:<10}{seconds / checked * 1000:>8.2f} ms/doc")
+        print(f"  {'total':<10}{total / checked * 1000:>8.2f} ms/doc  ({checked / total:.0f} docs/s serial)")
+
+        start = time.perf_counter()
+        results = check_batch(jobs, processes)
+        elapsed = time.perf_counter() - start
+        print(f"check_batch: {n} documents in {elapsed:.1f}s ({n / elapsed:.0f} docs/s, "
+              f"{processes or os.cpu_count()} process(es)), {sum(1 for _, issues in results if issues)} with issues")
+
+
+if __name__ == "__main__":
+    main()
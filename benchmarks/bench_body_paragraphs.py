@@ -0,0 +1,90 @@
+# benchmarks/bench_body_paragraphs.py
+# Letter body benchmark: one <br/>-joined paragraph vs a paragraph flowable per block, 1-20 pages
+#
+# Run from the repository root:
+#   python benchmarks/bench_body_paragraphs.py [runs]
+
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Paragraph, SimpleDocTemplate
+
+from academic_styles import body_paragraphs, get_academic_margins, get_academic_styles, prepare_story
+from layout_cache import LAYOUT_CACHE
+from layout_check import dry_run
+from templates import load_template
+
+
+PAGES = [1, 2, 5, 10, 20]
+
+
+def make_story(module, body, split):
+    """Portfolio project story with body as one paragraph or as paragraph flowables"""
+    s = get_academic_styles()
+    head = module.build_story(s)[:4]  # title, spacer, links, spacer
+    text = module.nz(body).replace("\n---", "\n\n---")
+    if split:
+        return head + body_paragraphs(text, s["body"])
+    return head + [Paragraph(text.replace("\n\n", "<br/><br/>"), s["body"])]
+
+
+def repeated_body(module, n):
+    """Portfolio body blocks n times, numbered so no block repeats (no layout cache hits
+    within a document)"""
+    blocks = [b for b in module.BODY.split("\n\n") if b.strip()]
+    return "\n\n".join(f"{i + 1}. {b}" for i in range(n) for b in blocks)
+
+
+def body_for_pages(module, pages):
+    """Portfolio body that fills the given number of pages"""
+    n = 1
+    while dry_run(prepare_story(make_story(module, repeated_body(module, n), True)), max_pages=99)["pages"] < pages:
+        n += 1
+    body = repeated_body(module, n)
+    # trim to the last block that still needs this many pages
+    while len(body.split("\n\n")) > 1:
+        shorter = body.rsplit("\n\n", 1)[0]
+        if dry_run(prepare_story(make_story(module, shorter, True)), max_pages=99)["pages"] < pages:
+            break
+        body = shorter
+    return body
+
+
+def render(module, body, split):
+    """(seconds, pages) of one build with a cold layout cache"""
+    LAYOUT_CACHE.clear()
+    story = prepare_story(make_story(module, body, split))
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4, **get_academic_margins())
+    start = time.perf_counter()
+    doc.build(story)
+    return time.perf_counter() - start, doc.page
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    module = load_template("portfolio_project")
+    render(module, module.BODY, True)  # warm up fonts
+    print(f"portfolio project body, median of {runs} builds (layout cache cleared before each)")
+    for pages in PAGES:
+        body = body_for_pages(module, pages)
+        results = {}
+        for mode, split in (("one paragraph", False), ("per block", True)):
+            times, counts = [], set()
+            for _ in range(runs):
+                t, n = render(module, body, split)
+                times.append(t)
+                counts.add(n)
+            results[mode] = (statistics.median(times), counts)
+        (t0, p0), (t1, p1) = results["one paragraph"], results["per block"]
+        print(f"  ~{pages:>2} page(s): {t0 * 1000:>8.1f} -> {t1 * 1000:>7.1f} ms  ({t0 / t1:.2f}x)  "
+              f"pages {'/'.join(map(str, sorted(p0)))} -> {'/'.join(map(str, sorted(p1)))}")
+
+
+if __name__ == "__main__":
+    main()
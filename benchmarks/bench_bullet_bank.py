@@ -0,0 +1,83 @@
+# benchmarks/bench_bullet_bank.py
+# Bullet bank benchmark: indexed CV assembly vs scanning every entry
+#
+# Run from the repository root:
+#   python benchmarks/bench_bullet_bank.py [entries ...]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bullet_bank import TAG_WEIGHT, BulletBank, _tag_key
+from keywords import tokenize
+from templates import load_template
+
+
+TAGS = """
+accessibility analytics b2b b2c design-systems ecommerce enterprise experimentation fintech
+growth healthcare localization marketplace mobile onboarding payments personalization pricing
+research retention saas search subscription web
+""".split()
+JOBS = 8
+
+
+def make_bank(n, seed=0):
+    rng = random.Random(seed)
+    data = load_template("cv").DATA
+    bank = BulletBank.from_data(dict(data, experience=[]))
+    words = sorted({w for line in data["ai_impact"] + data["core_skills"] for w in line.split()})
+    words += [w for job in data["experience"] for line in job["bullets"] for w in line.split()]
+    for j in range(JOBS):
+        bank.add_job(f"job{j}", f"Company {j}", "Product Designer", f"{2024 - 2 * j} - {2026 - 2 * j}")
+    start = time.perf_counter()
+    for i in range(n):
+        section = rng.choice(["bullets"] * 8 + ["ai_impact", "core_skills"])
+        bank.add(
+            " ".join(rng.choices(words + TAGS, k=rng.randint(6, 14))),
+            section,
+            job=f"job{rng.randrange(JOBS)}" if section == "bullets" else None,
+            tags=rng.sample(TAGS, rng.randint(0, 3)),
+            metrics={"activation": "30%"} if rng.random() < 0.2 else None,
+            priority=rng.randint(1, 5),
+        )
+    return bank, time.perf_counter() - start
+
+
+def scan_assemble(bank, tags, text):
+    """Reference without indexes: tokenizes and scores every entry for every query"""
+    terms = set(tokenize(text, ngrams=1))
+    tag_keys = {_tag_key(t) for t in tags} | {t for t in tokenize(text, ngrams=2) if t in bank.tag_index}
+    scores = {}
+    for n, entry in enumerate(bank.entries):
+        entry_tags = {_tag_key(t) for t in [*entry["tags"], *entry["metrics"]]}
+        score = TAG_WEIGHT * len(entry_tags & tag_keys) + len(set(tokenize(entry["text"], ngrams=1)) & terms)
+        if score:
+            scores[n] = score
+    return scores
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 10000, 50000]
+    posting = ("Product designer for a fintech payments team. Design systems, onboarding experiments, "
+               "user research and accessibility. Mobile and web.")
+    print(f"{'entries':>8}{'index s':>10}{'assemble ms':>14}{'scan ms':>10}")
+    for n in sizes:
+        bank, index_s = make_bank(n)
+        runs = 20
+        start = time.perf_counter()
+        for _ in range(runs):
+            data = bank.assemble(["growth"], posting)
+        assemble_ms = (time.perf_counter() - start) / runs * 1000
+        start = time.perf_counter()
+        reference = scan_assemble(bank, ["growth"], posting)
+        scan_ms = (time.perf_counter() - start) * 1000
+        assert reference == dict(bank.match(["growth"], posting))
+        assert len(data["experience"]) == JOBS
+        print(f"{n:>8}{index_s:>10.2f}{assemble_ms:>14.2f}{scan_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
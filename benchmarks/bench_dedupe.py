@@ -0,0 +1,65 @@
+# benchmarks/bench_dedupe.py
+# Near-duplicate check benchmark: MinHash/LSH vs all-pairs comparison by batch size
+#
+# Run from the repository root:
+#   python benchmarks/bench_dedupe.py [batch size ...]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedupe import minhash_signatures, near_duplicates, shingles
+from text_backends import render_text
+
+
+BASE_TEMPLATES = ["cover_letter", "follow_up", "networking_email", "recruiter_email", "thank_you_letter"]
+DUPLICATE_SHARE = 0.05
+
+
+def make_batch(n, seed=0):
+    """n letters: rendered templates with most words rewritten, plus ~5% near-copies"""
+    rng = random.Random(seed)
+    base = [render_text(t, "text", False).split(" ") for t in BASE_TEMPLATES]
+    texts = []
+    for i in range(n):
+        if texts and rng.random() < DUPLICATE_SHARE:
+            words = rng.choice(texts).split(" ")
+            changes = len(words) // 50  # ~98% of words kept
+        else:
+            words = list(rng.choice(base))
+            changes = len(words) // 2
+        for _ in range(changes):
+            words[rng.randrange(len(words))] = f"w{rng.randrange(10 ** 6)}"
+        texts.append(" ".join(words))
+    return texts
+
+
+def all_pairs_seconds(texts, threshold, sample=1000):
+    """All-pairs signature comparison time (measured on a sample, scaled by pair count)"""
+    signatures = minhash_signatures([shingles(t) for t in texts[:sample]])
+    start = time.perf_counter()
+    for i in range(len(signatures)):
+        (signatures[i + 1:] == signatures[i]).mean(axis=1) >= threshold
+    elapsed = time.perf_counter() - start
+    m, n = len(signatures), len(texts)
+    return elapsed * (n * (n - 1)) / (m * (m - 1))
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [1000, 5000, 20000, 50000]
+    print(f"{'letters':>8}{'lsh s':>9}{'us/letter':>11}{'all-pairs s':>13}{'clusters':>10}{'in clusters':>13}")
+    for n in sizes:
+        texts = make_batch(n)
+        start = time.perf_counter()
+        clusters, pairs = near_duplicates(texts, 0.8)
+        lsh = time.perf_counter() - start
+        brute = all_pairs_seconds(texts, 0.8)
+        in_clusters = sum(len(c) for c in clusters)
+        print(f"{n:>8}{lsh:>9.2f}{lsh / n * 1e6:>11.0f}{brute:>13.1f}{len(clusters):>10}{in_clusters:>13}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_doc_index.py
+# Document index benchmark: bulk indexing, queries and incremental updates at 100k documents
+#
+# Run from the repository root:
+#   python benchmarks/bench_doc_index.py [documents]
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from doc_index import DocumentIndex, document_metadata, source_text
+from templates import load_template
+
+
+BASE_TEMPLATES = ["cover_letter", "follow_up", "networking_email", "recruiter_email", "thank_you_letter",
+                  "informational_interview", "salary_negotiation", "cv", "portfolio_project"]
+TOPICS = ["AI assistant case study", "design system audit", "checkout redesign", "fraud dashboard",
+          "onboarding experiments", "accessibility review"]
+
+
+def make_documents(n, seed=0):
+    rng = random.Random(seed)
+    bases = []
+    for name in BASE_TEMPLATES:
+        module = load_template(name)
+        bases.append((name, source_text(module), document_metadata(module)))
+    companies = [f"Company {i}" for i in range(n // 20 or 1)]
+    for i in range(n):
+        name, text, (company, role, variant) = rng.choice(bases)
+        new_company = rng.choice(companies)
+        text = text.replace(company, new_company) if company else text
+        text += f"\n\nAttached: {rng.choice(TOPICS)}."
+        day = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        yield f"/archive/{name}_{i}.pdf", name, text, new_company, role, variant, day
+
+
+def timed_ms(fn, runs=20):
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = fn()
+    return (time.perf_counter() - start) / runs * 1000, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as tmp, DocumentIndex(os.path.join(tmp, "bench.db")) as index:
+        documents = list(make_documents(n))
+        start = time.perf_counter()
+        for i in range(0, n, 5000):
+            index.add_many(documents[i:i + 5000])
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(index.path) / 1e6
+        print(f"index {n} documents: {elapsed:.1f}s ({n / elapsed:.0f} docs/s, {size:.0f} MB)")
+
+        queries = {
+            "search rare phrase (top 20)": lambda: index.search("fraud dashboard"),
+            "search common word (top 20)": lambda: index.search("design"),
+            "search common word, ranked": lambda: index.search("design", rank=True),
+            "search + company filter": lambda: index.search("design", company="Company 7"),
+            "companies for phrase": lambda: index.companies("AI assistant case study"),
+            "companies, template + date": lambda: index.companies("AI assistant", template="cover_letter",
+                                                                  since="2026-10-01"),
+        }
+        for label, fn in queries.items():
+            ms, rows = timed_ms(fn)
+            print(f"  {label:<30}{ms:>8.2f} ms  ({len(rows)} rows)")
+
+        new = list(make_documents(20, seed=1))
+        ms, _ = timed_ms(lambda: index.add(*new.pop()[:3]), runs=10)
+        print(f"  {'incremental add (1 document)':<30}{ms:>8.2f} ms")
+        ms, _ = timed_ms(lambda: index.add_many(documents[:1000]), runs=1)
+        print(f"  {'re-index 1000 unchanged':<30}{ms:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
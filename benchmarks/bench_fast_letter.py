@@ -0,0 +1,67 @@
+# benchmarks/bench_fast_letter.py
+# Fast letter benchmark: SimpleDocTemplate vs direct canvas drawing, per template
+#
+# Run from the repository root:
+#   python benchmarks/bench_fast_letter.py [runs] [profile]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate
+
+import academic_styles
+from academic_styles import get_academic_margins, get_academic_styles, prepare_story
+from fast_letter import build_letter
+from templates import TEMPLATES, load_template
+
+
+def fast_path_taken(module):
+    """True if the template's story is drawn by the fast path"""
+    doc = SimpleDocTemplate(io.BytesIO(), pagesize=A4, **get_academic_margins())
+    return build_letter(doc, prepare_story(module.build_story(get_academic_styles())))
+
+
+def measure(module, profile, runs):
+    """{mode: median seconds} of module.build_pdf with and without the fast path
+    (runs interleaved, so both modes see the same machine noise)"""
+    times = {"platypus": [], "fast": []}
+    for _ in range(runs):
+        for mode in times:
+            academic_styles.FAST_LETTER = mode == "fast"
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                module.build_pdf(io.BytesIO(), profile)
+            times[mode].append(time.perf_counter() - start)
+    academic_styles.FAST_LETTER = True
+    return {mode: statistics.median(t) for mode, t in times.items()}
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    profile = sys.argv[2] if len(sys.argv) > 2 else "default"
+    cases = [(name, load_template(name)) for name in TEMPLATES if hasattr(load_template(name), "build_story")]
+    body = load_template("cover_letter").BODY
+    cases.append(("cover_letter, 2 pages", load_template("cover_letter", BODY=body * 2)))
+    print(f"{profile} profile, median of {runs} builds (layout cache warm)")
+    total = {"platypus": 0.0, "fast": 0.0}
+    for label, module in cases:
+        measure(module, profile, 3)  # warm up fonts and the layout cache
+        results = measure(module, profile, runs)
+        path = "direct" if fast_path_taken(module) else "fallback"
+        t0, t1 = results["platypus"], results["fast"]
+        for mode in total:
+            total[mode] += results[mode]
+        print(f"  {label:<26}{path:<10}{t0 * 1000:>7.2f} -> {t1 * 1000:>6.2f} ms  ({t0 / t1:.2f}x)")
+    t0, t1 = total["platypus"], total["fast"]
+    print(f"  {'all':<36}{t0 * 1000:>7.2f} -> {t1 * 1000:>6.2f} ms  ({t0 / t1:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# benchmarks/bench_font_discovery.py
+# Font discovery benchmark: scanning font directories vs loading the saved index
+#
+# Run from the repository root:
+#   python benchmarks/bench_font_discovery.py [runs] [extra font directory ...]
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import font_discovery
+from academic_styles import SERIF_FAMILIES
+from font_discovery import FONT_DIRS, load_index
+
+
+def timed(fn, runs):
+    """(median seconds, last result) of fn() over runs calls"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    roots = FONT_DIRS + sys.argv[2:]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "font-index.json")
+        cold, index = timed(lambda: load_index(roots, path, rescan=True), max(runs // 5, 1))
+
+        def warm():
+            font_discovery._INDEXES.clear()  # as in a new process
+            return load_index(roots, path)
+
+        warm_time, _ = timed(warm, runs)
+        find_time, found = timed(lambda: index.find(SERIF_FAMILIES), runs)
+        size = os.path.getsize(path)
+    dirs = sum(1 for root in roots for _ in os.walk(os.path.expanduser(root)))
+    print(f"{len(index.fonts)} TrueType fonts in {len(index.families)} families, {dirs} directories")
+    print(f"  scan and save index:   {cold * 1000:8.2f} ms")
+    print(f"  load saved index:      {warm_time * 1000:8.2f} ms  ({cold / warm_time:.0f}x faster, {size / 1024:.1f} KiB)")
+    print(f"  resolve serif family:  {find_time * 1e6:8.2f} us  -> {found[0] if found else 'none (Times-Roman)'}")
+
+
+if __name__ == "__main__":
+    main()
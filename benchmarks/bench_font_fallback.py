@@ -0,0 +1,79 @@
+# benchmarks/bench_font_fallback.py
+# Font fallback benchmark: cover letter mail-merge with Latin and mixed-script names,
+# fallback on vs off
+#
+# Run from the repository root:
+#   python benchmarks/bench_font_fallback.py [letters] [runs]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import academic_styles
+from academic_styles import BASE_FONT
+from font_fallback import coverage, font_runs
+from templates import load_template
+
+
+LATIN_NAMES = ["Jane Smith", "John Doe", "Maria Garcia", "Lukas Müller", "Zoë Dupont"]
+MIXED_NAMES = ["Дмитрий Иванов", "Σωκράτης Παππάς", "Ayşe Yılmaz", "Nguyễn Văn An", "Łukasz Kowalczyk"]
+
+
+def letters(names, n):
+    """n cover letter modules, one name each, with the name in the salutation too"""
+    body = load_template("cover_letter").BODY
+    return [load_template("cover_letter", NAME=names[i % len(names)],
+                          BODY=f"Dear {names[(i + 1) % len(names)]},\n\n{body}") for i in range(n)]
+
+
+def time_batch(modules, runs):
+    """{mode: median seconds} of building every module once, fallback off and on
+    (runs interleaved, so both modes see the same machine noise)"""
+    times = {"off": [], "on": []}
+    for _ in range(runs):
+        for mode in times:
+            academic_styles.FONT_FALLBACK = mode == "on"
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for module in modules:
+                    module.build_pdf(io.BytesIO(), "default")
+            times[mode].append(time.perf_counter() - start)
+    academic_styles.FONT_FALLBACK = True
+    return {mode: statistics.median(t) for mode, t in times.items()}
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    start = time.perf_counter()
+    cov = coverage(BASE_FONT)
+    print(f"{BASE_FONT}: {len(cov)} codepoints in {len(cov.blocks)} blocks, "
+          f"indexed in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for names in (LATIN_NAMES, MIXED_NAMES):
+        fallbacks = sorted({f for name in names for f, _ in font_runs(name, BASE_FONT)} - {BASE_FONT})
+        text = " ".join(names) * 20
+        font_runs(text, BASE_FONT)  # load the fallback fonts
+        t = min(timeit_runs(text) for _ in range(runs))
+        print(f"{', '.join(names[:2])}, ...: fallback fonts {', '.join(fallbacks) or 'none'}; "
+              f"runs of {len(text)} characters in {t * 1e6:.0f} us ({t / len(text) * 1e9:.0f} ns/char)")
+        modules = letters(names, n)
+        time_batch(modules[:3], 1)  # warm up fonts and the layout cache
+        results = time_batch(modules, runs)
+        t0, t1 = results["off"], results["on"]
+        print(f"  {n} letters: fallback off {t0 * 1000:.1f} ms, on {t1 * 1000:.1f} ms  ({t1 / t0:.2f}x)")
+
+
+def timeit_runs(text):
+    start = time.perf_counter()
+    font_runs(text, BASE_FONT)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
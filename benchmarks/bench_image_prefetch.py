@@ -0,0 +1,91 @@
+# benchmarks/bench_image_prefetch.py
+# Image prefetch benchmark: portfolio case builds with 10, 50 and 200 screenshots.
+# Images decoded by reportlab while drawing (with its own ASCII85 encoder, then with
+# the loader's) vs prefetched in the loader's threads
+#
+# Run from the repository root:
+#   python benchmarks/bench_image_prefetch.py [runs] [counts ...]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+from reportlab.lib import rl_accel
+from reportlab.pdfbase import pdfdoc
+
+import academic_styles
+from image_loader import MAX_WORKERS, use_fast_ascii85
+from templates import load_template
+
+
+SIZE = (1440, 900)  # a laptop screenshot
+
+use_fast_ascii85()
+MODES = {  # mode: (prefetch, ASCII85 encoder)
+    "reportlab": (False, rl_accel.asciiBase85Encode),
+    "encoder": (False, pdfdoc.asciiBase85Encode),  # the standard library's, unless rl_accel is compiled
+    "prefetch": (True, pdfdoc.asciiBase85Encode),
+}
+
+
+def screenshot(path, seed):
+    """PNG like a UI screenshot: flat panels, a gradient chart and a noisy photo area"""
+    im = Image.new("RGB", SIZE, (245, 245, 245))
+    draw = ImageDraw.Draw(im)
+    draw.rectangle([0, 0, SIZE[0], 60], fill=(30 + seed % 60, 40, 60))
+    for i in range(6):
+        draw.rectangle([40, 100 + 120 * i, 400, 200 + 120 * i], outline=(200, 200, 200), width=2)
+        draw.text((60, 130 + 120 * i), f"Item {seed}-{i}", fill=(40, 40, 40))
+    chart = Image.linear_gradient("L").resize((600, 360)).convert("RGB")
+    im.paste(chart, (460, 100))
+    im.paste(Image.effect_noise((360, 300), 30 + seed % 20).convert("RGB"), (1080 - 20, 520))
+    im.save(path, "PNG")
+
+
+def time_builds(modules, runs):
+    """{mode: median seconds} of building each module once in every mode (runs
+    interleaved, so all modes see the same machine noise)"""
+    times = {mode: [] for mode in MODES}
+    for _ in range(runs):
+        for mode, (prefetch, encoder) in MODES.items():
+            academic_styles.IMAGE_PREFETCH, pdfdoc.asciiBase85Encode = prefetch, encoder
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for module in modules:
+                    module.build_pdf(io.BytesIO(), "default")
+            times[mode].append(time.perf_counter() - start)
+    academic_styles.IMAGE_PREFETCH, pdfdoc.asciiBase85Encode = MODES["prefetch"]
+    return {mode: statistics.median(t) for mode, t in times.items()}
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    counts = [int(n) for n in sys.argv[2:]] or [10, 50, 200]
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        paths = []
+        for i in range(max(counts)):
+            paths.append(os.path.join(tmp, f"screen_{i:03d}.png"))
+            screenshot(paths[-1], i)
+        size = sum(map(os.path.getsize, paths)) / len(paths)
+        print(f"{len(paths)} screenshots {SIZE[0]}x{SIZE[1]} ({size / 1024:.0f} KiB PNG each) "
+              f"made in {time.perf_counter() - start:.1f}s; {MAX_WORKERS} loader threads, {os.cpu_count()} CPUs")
+        for n in counts:
+            images = [{"path": p, "caption": f"Figure {i + 1}. Screen {i + 1}."} for i, p in enumerate(paths[:n])]
+            module = load_template("portfolio_case", IMAGES=images)
+            time_builds([module], 1)  # warm up fonts and the page cache
+            results = time_builds([module], runs)
+            t0, t1, t2 = results["reportlab"], results["encoder"], results["prefetch"]
+            print(f"  {n:4d} images: reportlab {t0:7.2f}s, faster ASCII85 {t1:7.2f}s ({t0 / t1:.2f}x), "
+                  f"prefetched {t2:7.2f}s ({t0 / t2:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_job_match.py
+# Job match benchmark: batched TF-IDF scoring vs one posting at a time vs pure Python
+#
+# Run from the repository root:
+#   python benchmarks/bench_job_match.py [bullets] [postings]
+
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from job_match import cv_items, score_matrix, tokenize
+from templates import load_template
+
+
+EXTRA_TERMS = """
+accessibility analytics android api b2b b2c backend churn cohort compliance conversion dashboard
+data discovery ecommerce enterprise experimentation fintech frontend funnel growth healthcare ios
+kpi localization marketplace metrics mobile navigation onboarding payments personalization
+pricing prototyping retention roadmap saas search segmentation stakeholder subscription
+usability web workshop wireframes
+""".split()
+
+
+def make_corpus(n_items, n_postings, seed=0):
+    """Bullets and postings built from the words of the sample CV plus domain terms"""
+    rng = random.Random(seed)
+    data = load_template("cv").DATA
+    words = sorted({w for _, text in cv_items(data) for w in text.split()}) + EXTRA_TERMS
+    items = [" ".join(rng.choices(words, k=rng.randint(6, 16))) for _ in range(n_items)]
+    postings = [" ".join(rng.choices(words, k=rng.randint(150, 400))) for _ in range(n_postings)]
+    return items, postings
+
+
+def python_scores(items, postings):
+    """Reference: dict-based cosine similarity for every (item, posting) pair"""
+    item_counts = [Counter(tokenize(t)) for t in items]
+    posting_counts = [Counter(tokenize(t)) for t in postings]
+    df = Counter()
+    for counts in item_counts + posting_counts:
+        df.update(counts.keys())
+    n = len(items) + len(postings)
+    idf = {t: math.log((1 + n) / (1 + d)) + 1 for t, d in df.items()}
+
+    def vector(counts):
+        v = {t: (1 + math.log(c)) * idf[t] for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in v.values())) or 1.0
+        return {t: w / norm for t, w in v.items()}
+
+    item_vectors = [vector(c) for c in item_counts]
+    posting_vectors = [vector(c) for c in posting_counts]
+    return [[sum(w * p.get(t, 0.0) for t, w in v.items()) for p in posting_vectors] for v in item_vectors]
+
+
+def main():
+    n_items = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    n_postings = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    items, postings = make_corpus(n_items, n_postings)
+
+    start = time.perf_counter()
+    score_matrix(items, postings)
+    batch_ms = (time.perf_counter() - start) / n_postings * 1000
+
+    sample = postings[:10]
+    start = time.perf_counter()
+    for posting in sample:
+        score_matrix(items, [posting])
+    single_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+    start = time.perf_counter()
+    reference = python_scores(items, sample)
+    python_ms = (time.perf_counter() - start) / len(sample) * 1000
+
+    print(f"{n_items} bullets, ms per posting:")
+    for label, ms in ((f"batched ({n_postings} postings)", batch_ms),
+                      ("score_matrix per posting", single_ms),
+                      (f"pure Python ({len(sample)} postings)", python_ms)):
+        print(f"  {label:<30}{ms:>9.2f}")
+
+    # Same IDF corpus is needed for identical scores, so compare on the sample only
+    check = score_matrix(items, sample)
+    error = max(abs(check[i][p] - reference[i][p]) for i in range(n_items) for p in range(len(sample)))
+    print(f"  {'max difference vs pure Python':<30}{error:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/bench_kerning.py
+# Kerning benchmark: kerned vs plain fonts in width measurement, paragraph wrapping and builds
+#
+# Run from the repository root:
+#   python benchmarks/bench_kerning.py [runs] [profile]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFontFace
+from reportlab.platypus import Paragraph
+
+import academic_styles
+from academic_styles import BASE_FONT, BOLD_FONT, get_academic_margins, get_academic_styles
+from kerning import kern_table, kerned_font
+from templates import TEMPLATES, load_template
+
+
+def letter_words():
+    """Every word of the letter template bodies"""
+    words = []
+    for name in TEMPLATES:
+        body = getattr(load_template(name), "BODY", "")
+        words += body.replace("<br/>", " ").split()
+    return words
+
+
+def time_widths(words, font, runs):
+    """Median seconds to measure every word once"""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        for w in words:
+            pdfmetrics.stringWidth(w, font, 10.5)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def time_wrap(texts, modes, width, runs):
+    """{mode: median seconds} to wrap every (text, style name) paragraph once with
+    each mode's styles (runs interleaved)"""
+    times = {mode: [] for mode in modes}
+    for _ in range(runs):
+        for mode, styles in modes.items():
+            paragraphs = [Paragraph(text, styles[style]) for text, style in texts]
+            start = time.perf_counter()
+            for p in paragraphs:
+                p.wrap(width, 1e6)
+            times[mode].append(time.perf_counter() - start)
+    return {mode: statistics.median(t) for mode, t in times.items()}
+
+
+def time_builds(cases, profile, runs):
+    """{mode: median seconds} of building every case once, kerned and plain
+    (runs interleaved, so both modes see the same machine noise)"""
+    times = {"plain": [], "kerned": []}
+    for _ in range(runs):
+        for mode in times:
+            academic_styles.KERNING = mode == "kerned"
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for module in cases:
+                    module.build_pdf(io.BytesIO(), profile)
+            times[mode].append(time.perf_counter() - start)
+    academic_styles.KERNING = False
+    return {mode: statistics.median(t) for mode, t in times.items()}
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    profile = sys.argv[2] if len(sys.argv) > 2 else "default"
+    font = pdfmetrics.getFont(BASE_FONT)
+    if not hasattr(font, "face"):
+        print(f"⚠️  {BASE_FONT} is a standard font without a kerning table: nothing to compare")
+        return
+
+    face = TTFontFace(font.face.filename)
+    start = time.perf_counter()
+    table = kern_table(face)
+    print(f"{BASE_FONT}: {len(table)} kerning pairs, read in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    words = letter_words()
+    kerned = kerned_font(BASE_FONT)
+    time_widths(words, kerned, 3)  # warm up
+    t0, t1 = time_widths(words, BASE_FONT, runs), time_widths(words, kerned, runs)
+    kerned_words = sum(1 for w in words if table.total(w))
+    print(f"stringWidth, {len(words)} words ({kerned_words} with a pair): "
+          f"{t0 / len(words) * 1e6:.2f} -> {t1 / len(words) * 1e6:.2f} us/word  ({t1 / t0:.2f}x)")
+
+    styles = get_academic_styles()
+    width = A4[0] - get_academic_margins()["leftMargin"] - get_academic_margins()["rightMargin"]
+    texts = [(load_template(name).BODY.strip(), "body") for name in TEMPLATES
+             if hasattr(load_template(name), "BODY")]
+    texts += [(text.upper(), "title") for text, _ in texts]
+    modes = {}
+    for mode, (regular, bold) in (("plain", (BASE_FONT, BOLD_FONT)), ("kerned", (kerned, kerned_font(BOLD_FONT)))):
+        modes[mode] = {"body": ParagraphStyle("body", parent=styles["body"], fontName=regular, wordWrap=None),
+                       "title": ParagraphStyle("title", parent=styles["title"], fontName=bold)}
+    time_wrap(texts, modes, width, 3)  # warm up
+    results = time_wrap(texts, modes, width, runs)
+    t0, t1 = results["plain"], results["kerned"]
+    print(f"wrap, {len(texts)} paragraphs (word wrapping): {t0 * 1000:.2f} -> {t1 * 1000:.2f} ms  ({t1 / t0:.2f}x)")
+
+    cases = [load_template(name) for name in TEMPLATES if hasattr(load_template(name), "build_story")]
+    time_builds(cases, profile, 2)  # warm up fonts and the layout cache
+    results = time_builds(cases, profile, runs)
+    t0, t1 = results["plain"], results["kerned"]
+    print(f"build, {len(cases)} templates ({profile} profile, layout cache warm): "
+          f"{t0 * 1000:.1f} -> {t1 * 1000:.1f} ms  ({t1 / t0:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
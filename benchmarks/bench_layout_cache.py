@@ -0,0 +1,61 @@
+# benchmarks/bench_layout_cache.py
+# Layout cache benchmark: mail-merge batch of cover letters that differ only in greeting and company
+#
+# Run from the repository root:
+#   python benchmarks/bench_layout_cache.py [letters] [line breaking mode]
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import academic_styles
+from layout_cache import LAYOUT_CACHE
+from templates import load_template
+
+
+GREETINGS = ["Hi {name},", "Dear {name},", "Hello {name},", "Dear Hiring Team at {company},"]
+NAMES = ["Alex", "Sam Lee", "Jordan Smith", "Taylor", "Morgan Brown", "Casey"]
+
+
+def make_jobs(n):
+    """[(overrides), ...] for n cover letters; only the greeting and company vary"""
+    body = load_template("cover_letter").BODY
+    jobs = []
+    for i in range(n):
+        company = f"Company {i}"
+        greeting = GREETINGS[i % len(GREETINGS)].format(name=NAMES[i % len(NAMES)], company=company)
+        text = body.replace("Hi,", greeting, 1).replace("I'm reaching out because", f"I'm reaching out to {company} because", 1)
+        jobs.append({"COMPANY": company, "BODY": text})
+    return jobs
+
+
+def render_batch(jobs, cache):
+    academic_styles.LAYOUT_CACHE = cache
+    LAYOUT_CACHE.clear()
+    start = time.perf_counter()
+    for overrides in jobs:
+        with contextlib.redirect_stdout(io.StringIO()):
+            load_template("cover_letter", **overrides).build_pdf(io.BytesIO())
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    if len(sys.argv) > 2:
+        academic_styles.LINE_BREAKING = sys.argv[2]
+    jobs = make_jobs(n)
+    render_batch(jobs[:20], False)  # warm up fonts and template code
+    off = render_batch(jobs, False)
+    on = render_batch(jobs, True)
+    print(f"{n} cover letters ({academic_styles.LINE_BREAKING} line breaking), greeting and company vary")
+    print(f"  {'no cache':<14}{off:>7.2f}s  {n / off:>6.0f} docs/s")
+    print(f"  {'layout cache':<14}{on:>7.2f}s  {n / on:>6.0f} docs/s  ({off / on:.2f}x)")
+    print(f"  {LAYOUT_CACHE.format_stats()}")
+
+
+if __name__ == "__main__":
+    main()
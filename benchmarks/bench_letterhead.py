@@ -0,0 +1,76 @@
+# benchmarks/bench_letterhead.py
+# Letterhead benchmark: shared form XObject vs drawing the header on every page
+#
+# Run from the repository root:
+#   python benchmarks/bench_letterhead.py [runs]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import academic_styles
+from letterhead import Letterhead
+from packet import build_packet
+from templates import load_template
+
+
+PAGES = [2, 5, 10]       # cover letter body repeated to fill about this many pages
+PACKETS = [3, 10, 30]    # letters per packet
+LETTERS = ["cover_letter", "follow_up", "thank_you_letter", "recommendation_request", "resignation_letter"]
+PROFILES = ["fast", "default", "compact"]  # fast: uncompressed, bytes show the drawing work
+
+
+def long_letter(path, pages, profile):
+    body = load_template("cover_letter").BODY
+    load_template("cover_letter", BODY=body * (2 * pages - 1)).build_pdf(path, profile)
+
+
+def packet(path, letters, profile):
+    build_packet(path, [LETTERS[i % len(LETTERS)] for i in range(letters)], profile=profile)
+
+
+def measure(render, size, profile, runs):
+    """{mode: (median seconds, bytes)} for the header drawn inline and as a form"""
+    results = {}
+    for mode, use_forms in (("inline", False), ("form", True)):
+        Letterhead.use_forms = use_forms
+        times = []
+        for _ in range(runs):
+            buf = io.BytesIO()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                render(buf, size, profile)
+            times.append(time.perf_counter() - start)
+        results[mode] = (statistics.median(times), len(buf.getvalue()))
+    Letterhead.use_forms = True
+    return results
+
+
+def report(label, results):
+    (t0, b0), (t1, b1) = results["inline"], results["form"]
+    print(f"  {label:<26}{t0 * 1000:>8.1f} -> {t1 * 1000:>7.1f} ms  {b0:>8,} -> {b1:>8,} bytes ({(b1 - b0) / b0:+.1%})")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    if "ACADEMIC_LETTERHEAD_CONTINUATION" not in os.environ:
+        academic_styles.LETTERHEAD_CONTINUATION = "compact"  # later pages repeat the header too
+    print(f"letterhead {academic_styles.LETTERHEAD_FIRST_PAGE} / {academic_styles.LETTERHEAD_CONTINUATION}: "
+          f"header drawn inline on every page -> shared form XObject (median of {runs})")
+    for profile in PROFILES:
+        print(f"{profile} profile")
+        for pages in PAGES:
+            results = measure(long_letter, pages, profile, runs)
+            report(f"letter, ~{pages} page(s)", results)
+        for letters in PACKETS:
+            results = measure(packet, letters, profile, runs)
+            report(f"packet, {letters} letters", results)
+
+
+if __name__ == "__main__":
+    main()
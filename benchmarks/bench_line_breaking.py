@@ -0,0 +1,86 @@
+# benchmarks/bench_line_breaking.py
+# Line breaking benchmark: greedy vs optimal-fit wrap time and spacing on long letter bodies
+#
+# Run from the repository root:
+#   python benchmarks/bench_line_breaking.py [runs]
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.platypus import Paragraph
+
+from academic_styles import get_academic_margins, get_academic_styles
+from line_breaking import HyphenatedParagraph, OptimalParagraph, text_width
+from templates import load_template
+
+
+LETTERS = ["cover_letter", "follow_up", "salary_negotiation", "resignation_letter", "recommendation_request"]
+LENGTHS = [1, 5, 20]  # letter bodies per paragraph
+
+
+def letter_text(copies):
+    bodies = [load_template(name).BODY.strip() for name in LETTERS]
+    return "<br/><br/>".join(bodies[i % len(bodies)] for i in range(copies)).replace("\n\n", "<br/><br/>")
+
+
+def modes(styles):
+    body = styles["body"]
+    return {
+        "greedy": (Paragraph, ParagraphStyle("greedy", parent=body, wordWrap=None)),
+        "greedy CJK": (Paragraph, body),
+        "optimal": (OptimalParagraph, body),
+        "hyphenated": (HyphenatedParagraph, body),
+    }
+
+
+def spacing(paragraph, words):
+    """(lines, mean stretch, max stretch, split words) of the justified lines; stretch is
+    the space added (or removed, when shrunk) per space as a fraction of a space's width"""
+    lines = paragraph.blPara.lines
+    stretches, split = [], 0
+    for i, line in enumerate(lines[:-1]):
+        if line.lineBreak or lines[i + 1].lineBreak and not lines[i + 1].words[0].text:
+            continue  # last line of a block is not justified
+        text = "".join(w.text for w in line.words if getattr(w, "text", None)).rstrip()
+        spaces = text.count(" ")
+        if not text or not spaces:
+            continue
+        space = text_width(" ", line.words[0].fontName, line.fontSize)
+        stretches.append(abs(line.extraSpace) / (spaces * space))
+        split += text.split()[-1] not in words
+    return len(lines), statistics.mean(stretches), max(stretches), split
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    styles = get_academic_styles()
+    margins = get_academic_margins()
+    width = A4[0] - margins["leftMargin"] - margins["rightMargin"]
+    for copies in LENGTHS:
+        text = letter_text(copies)
+        words = set(text.replace("<br/>", " ").split())
+        print(f"{copies} letter bod{'y' if copies == 1 else 'ies'} ({len(words)} distinct words, {len(text.split())} words)")
+        baseline = None
+        for mode, (cls, style) in modes(styles).items():
+            paragraphs = [cls(text, style) for _ in range(runs + 1)]
+            paragraphs[0].wrap(width, 1e9)  # warm the width caches
+            times = []
+            for p in paragraphs[1:]:
+                start = time.perf_counter()
+                p.wrap(width, 1e9)
+                times.append(time.perf_counter() - start)
+            ms = statistics.median(times) * 1000
+            baseline = baseline or ms
+            lines, mean, worst, split = spacing(paragraphs[-1], words)
+            print(f"  {mode:<12}{ms:>8.2f} ms  x{ms / baseline:<5.2f}{lines:>5} lines  "
+                  f"stretch mean {mean:5.2f} max {worst:5.2f}  split words {split}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_output_profiles.py
+# Output profile benchmark: build time and file size for default, fast and compact
+#
+# Run from the repository root:
+#   python benchmarks/bench_output_profiles.py [template ...]
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from academic_styles import BASE_FONT
+from packet import DEFAULT_PACKET, build_packet
+from pdf_output import OUTPUT_PROFILES
+from templates import load_template
+
+
+DEFAULT_TEMPLATES = ["cover_letter", "cv", "cv_classic", "portfolio_case"]
+
+
+def measure(build, profile, repeat=5):
+    """Returns (best time in ms, size in KB)"""
+    best = None
+    for _ in range(repeat):
+        buf = io.BytesIO()
+        start = time.perf_counter()
+        build(buf, profile)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, len(buf.getvalue()) / 1024
+
+
+def main():
+    names = sys.argv[1:] or DEFAULT_TEMPLATES
+    builds = [(name, lambda buf, profile, m=load_template(name): m.build_pdf(buf, profile)) for name in names]
+    builds.append(("packet", lambda buf, profile: build_packet(buf, DEFAULT_PACKET, profile=profile)))
+
+    print(f"font={BASE_FONT}")
+    print(f"{'document':<16}" + "".join(f"{p + ' ms':>12}{p + ' KB':>12}" for p in OUTPUT_PROFILES))
+    for name, build in builds:
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = [measure(build, profile) for profile in OUTPUT_PROFILES]
+        print(f"{name:<16}" + "".join(f"{ms:>12.1f}{kb:>12.1f}" for ms, kb in results))
+
+
+if __name__ == "__main__":
+    main()
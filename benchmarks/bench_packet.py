@@ -0,0 +1,63 @@
+# benchmarks/bench_packet.py
+# Packet benchmark: one merged PDF vs separately built documents (size and time)
+#
+# Run from the repository root:
+#   python benchmarks/bench_packet.py [template ...]
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from academic_styles import BASE_FONT
+from packet import DEFAULT_PACKET, build_packet
+from templates import load_template
+
+
+def best_of(fn, repeat=5):
+    """Returns (best time in seconds, bytes produced by the last run)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, data
+
+
+def build_separately(names):
+    sizes = []
+    for name in names:
+        buf = io.BytesIO()
+        load_template(name).build_pdf(buf)
+        sizes.append(len(buf.getvalue()))
+    return sizes
+
+
+def build_merged(names):
+    buf = io.BytesIO()
+    build_packet(buf, names)
+    return len(buf.getvalue())
+
+
+def main():
+    names = sys.argv[1:] or DEFAULT_PACKET
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name in names:
+            load_template(name)  # import outside of the timed runs
+        separate_time, sizes = best_of(lambda: build_separately(names))
+        packet_time, packet_size = best_of(lambda: build_merged(names))
+
+    print(f"Documents: {', '.join(names)}  (font={BASE_FONT})")
+    for name, size in zip(names, sizes):
+        print(f"  {name:<24} {size / 1024:>8.1f} KB")
+    print(f"{'separate':<26} {sum(sizes) / 1024:>8.1f} KB  {separate_time * 1000:>8.1f} ms")
+    print(f"{'packet':<26} {packet_size / 1024:>8.1f} KB  {packet_time * 1000:>8.1f} ms")
+    print(f"{'savings':<26} {(1 - packet_size / sum(sizes)) * 100:>7.1f} %   {(1 - packet_time / separate_time) * 100:>7.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_pipeline.py
+# Batch rendering benchmark: one document after another (render_template() to a file)
+# vs the staged pipeline, with per-stage statistics of the pipeline runs
+#
+# Run from the repository root:
+#   python benchmarks/bench_pipeline.py [documents] [runs] [STAGE=N,... ...]
+
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stress_threads import inputs
+
+from pipeline import STAGE_WORKERS, file_sink, parse_workers, render_pipeline
+from templates import render
+from worker_pool import preload
+
+
+def render_serial(jobs, out_dir):
+    for i, job in enumerate(jobs):
+        render(job, os.path.join(out_dir, f"{i}.pdf"))
+
+
+def render_staged(jobs, out_dir, workers):
+    batch = [(job.template, f"{i}.pdf", dict(job.overrides)) for i, job in enumerate(jobs)]
+    return render_pipeline(batch, file_sink(out_dir), workers, profile=jobs[0].profile)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    configs = sys.argv[3:] or ["", "layout=2,serialize=2"]
+    jobs = [job for job in inputs(n * 3) if job.profile == "default"][:n]
+    preload()
+
+    times = {"serial": []}
+    stats = {}
+    with tempfile.TemporaryDirectory() as out_dir, contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(runs):  # interleaved, so both see the same machine state
+            start = time.perf_counter()
+            render_serial(jobs, out_dir)
+            times["serial"].append(time.perf_counter() - start)
+            for config in configs:
+                start = time.perf_counter()
+                stats[config] = render_staged(jobs, out_dir, parse_workers(config))
+                times.setdefault(config, []).append(time.perf_counter() - start)
+
+    serial = statistics.median(times["serial"])
+    print(f"{n} documents, median of {runs} runs, {os.cpu_count()} CPUs")
+    print(f"  one by one:                          {serial:7.2f}s")
+    for config in configs:
+        workers = dict(STAGE_WORKERS, **parse_workers(config))
+        label = ",".join(str(v) for v in workers.values())
+        t = statistics.median(times[config])
+        print(f"  pipeline, {label:<17} threads: {t:7.2f}s ({serial / t:.2f}x)")
+    for config in configs:
+        print(f"\npipeline {config or 'default workers'}, last run:")
+        print(stats[config].format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# benchmarks/bench_rich_text.py
+# Rich text benchmark: Paragraph from markup (parsed) vs from RichText fragments, parse + wrap
+#
+# Run from the repository root:
+#   python benchmarks/bench_rich_text.py [documents]
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import Paragraph
+
+from academic_styles import academic_full_url, get_academic_margins, get_academic_styles
+from rich_text import RichText
+from templates import load_template
+
+
+def cv_content():
+    """[(RichText, style name), ...] of the academic CV with a case study link in every bullet"""
+    data = load_template("cv").DATA
+    contacts = data["contacts"]
+    items = [(RichText(data["name"]), "title"), (RichText(data["title"]), "subsection")]
+    line = RichText().link(contacts["email"], f'mailto:{contacts["email"]}')
+    line.add(" · ").link("LinkedIn", academic_full_url(contacts["linkedin"]))
+    line.add(" · ").link("Portfolio", academic_full_url(contacts["portfolio"]))
+    items.append((line, "meta"))
+    items.append((RichText().bold("SUMMARY"), "section"))
+    items.append((RichText(data["summary"]), "body"))
+    items.append((RichText().bold("EXPERIENCE"), "section"))
+    for job in data["experience"] * 3:
+        items.append((RichText().bold(job["company"]).add(f' — {job["role"]}'), "subsection"))
+        items.append((RichText(f'{job["dates"]} | {job["location"]}'), "meta_text"))
+        for i, bullet in enumerate(job["bullets"]):
+            rich = RichText(bullet + " (").link(f"case study {i + 1}", f"https://johndoe.dev/cases/{i + 1}").add(")")
+            items.append((rich, "body_left"))
+    items.append((RichText().bold("CORE SKILLS"), "section"))
+    items.append((RichText(" · ".join(data["core_skills"])), "body_left"))
+    return items
+
+
+def letter_content():
+    """[(RichText, style name), ...] of the cover letter, plus a link in every body paragraph"""
+    module = load_template("cover_letter")
+    body = module.BODY.strip().split("\n\n")
+    linked = [p + f' See <a href="https://johndoe.dev/{i}" color="#1a1a1a"><u>example {i}</u></a>.'
+              for i, p in enumerate(body)]
+    return [
+        (RichText(module.NAME), "title"),
+        (RichText.from_markup(module.LINKS), "meta"),
+        (RichText.from_markup("<br/><br/>".join(body)), "body"),
+        (RichText.from_markup("<br/><br/>".join(linked)), "body"),
+    ]
+
+
+def run(items, styles, width, n):
+    """(build seconds, wrap seconds, [lines of each paragraph]) for n documents"""
+    build = wrap = 0.0
+    for _ in range(n):
+        t0 = time.perf_counter()
+        paragraphs = [make(styles[style]) for make, style in items]
+        t1 = time.perf_counter()
+        for p in paragraphs:
+            p.wrap(width, 1e6)
+        t2 = time.perf_counter()
+        build += t1 - t0
+        wrap += t2 - t1
+    return build, wrap, [_lines(p) for p in paragraphs]
+
+
+def _lines(p):
+    lines = p.blPara.lines
+    if p.blPara.kind == 0:
+        return [" ".join(words).rstrip() for _, words in lines]
+    return ["".join(w.text for w in line.words if hasattr(w, "text")).rstrip() for line in lines]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    styles = get_academic_styles()
+    margins = get_academic_margins()
+    width = A4[0] - margins["leftMargin"] - margins["rightMargin"]
+    for label, content in (("CV", cv_content()), ("letter", letter_content())):
+        markup = [(lambda style, text=rich.markup(): Paragraph(text, style), style) for rich, style in content]
+        frags = [(rich.paragraph, style) for rich, style in content]
+        links = sum(1 for rich, _ in content for _, attrs in rich.runs if any(isinstance(a, tuple) for a in attrs))
+        run(markup[:2], styles, width, 5)  # warm up font metrics
+        results = {mode: run(items, styles, width, n) for mode, items in (("markup", markup), ("RichText", frags))}
+        same = results["markup"][2] == results["RichText"][2]
+        print(f"{label}: {len(content)} paragraphs, {links} link runs, {n} documents, same lines: {same}")
+        base = None
+        for mode, (build, wrap, _) in results.items():
+            total = (build + wrap) / n * 1000
+            base = base or total
+            print(f"  {mode:<10} build {build / n * 1000:6.3f} ms  wrap {wrap / n * 1000:6.3f} ms  "
+                  f"total {total:6.3f} ms/doc  ({base / total:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
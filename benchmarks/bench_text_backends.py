@@ -0,0 +1,41 @@
+# benchmarks/bench_text_backends.py
+# Text backends benchmark: PDF vs plain text, HTML and Markdown rendering
+#
+# Run from the repository root:
+#   python benchmarks/bench_text_backends.py [template ...]
+
+import contextlib
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import load_template
+from text_backends import FORMATS, render_document
+
+
+DEFAULT_TEMPLATES = ["linkedin_connection", "recruiter_email", "networking_email", "follow_up"]
+
+
+def per_call_us(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    names = sys.argv[1:] or DEFAULT_TEMPLATES
+    print(f"{'template':<22}{'pdf us':>10}" + "".join(f"{f + ' us':>13}{'x':>7}" for f in FORMATS))
+    for name in names:
+        module = load_template(name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            pdf = per_call_us(lambda: module.build_pdf(io.BytesIO()), 20)
+        row = f"{name:<22}{pdf:>10.0f}"
+        for fmt in FORMATS:
+            t = per_call_us(lambda: render_document(module, fmt), 2000)
+            row += f"{t:>13.1f}{pdf / t:>7.0f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_tracker.py
+# Application tracker benchmark: indexed vs unindexed queries, bulk generation
+#
+# Run from the repository root:
+#   python benchmarks/bench_tracker.py [rows] [documents]
+
+import datetime
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tracker import Tracker, generate
+
+
+TODAY = datetime.date(2026, 6, 1)
+
+
+def fill(tracker, n):
+    rng = random.Random(0)
+    rows = []
+    for i in range(n):
+        age = rng.randint(0, 365)
+        applied = TODAY - datetime.timedelta(days=age)
+        # Recent applications are still open; old ones mostly ended in a rejection
+        if age < 45:
+            status = rng.choice(["applied", "applied", "interviewing"])
+        else:
+            status = rng.choice(["rejected"] * 6 + ["withdrawn", "offer", "accepted"])
+        rows.append({
+            "company": f"Company {rng.randint(1, n // 4 or 1)}",
+            "role": "Product Designer",
+            "contact_name": f"Contact {i}",
+            "status": status,
+            "applied_on": applied,
+            "last_contact_on": applied + datetime.timedelta(days=rng.randint(0, 30)),
+        })
+    start = timeit.default_timer()
+    tracker.add_many(rows)
+    return timeit.default_timer() - start
+
+
+def query_ms(fn, number=20):
+    return min(timeit.repeat(fn, number=number, repeat=3)) / number * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    docs = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    with tempfile.TemporaryDirectory() as tmp, Tracker(os.path.join(tmp, "bench.db")) as tracker:
+        print(f"insert {n} rows: {fill(tracker, n):.2f}s")
+
+        queries = {
+            "no reply after 10 days": lambda: tracker.no_reply(10, TODAY),
+            "by company": lambda: tracker.by_company("Company 7"),
+            "by status": lambda: tracker.by_status("offer"),
+        }
+        indexed = {label: query_ms(fn) for label, fn in queries.items()}
+        plan = tracker.explain("status IN (?, ?) AND last_contact_on <= ? AND replied_on IS NULL",
+                               ("applied", "interviewing", "2026-05-22"))
+        tracker.db.executescript("""
+            DROP INDEX idx_applications_company;
+            DROP INDEX idx_applications_status_contact;
+            DROP INDEX idx_applications_applied;
+        """)
+        print(f"{'query':<26}{'rows':>8}{'indexed ms':>13}{'full scan ms':>15}")
+        for label, fn in queries.items():
+            print(f"{label:<26}{len(fn()):>8}{indexed[label]:>13.2f}{query_ms(fn):>15.2f}")
+        print(f"plan: {'; '.join(plan)}")
+
+        rows = tracker.no_reply(10, TODAY)[:docs]
+        out_dir = os.path.join(tmp, "out")
+        for processes in (1, None):
+            paths, seconds = generate(rows, "follow_up", out_dir, processes, today=TODAY)
+            mode = "in-process" if processes == 1 else "worker pool"
+            print(f"generate {len(paths)} follow-ups ({mode}): {seconds:.2f}s, {len(paths) / seconds:.1f} docs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_watch.py
+# Watch mode benchmark: a cold run of the generator script vs edit-to-preview latency
+# in the warm watch process (file saved -> change noticed -> PDF re-rendered ->
+# long-polling preview notified and PDF fetched over HTTP)
+#
+# Edits are simulated by touching the template source (its contents stay the same).
+#
+# Run from the repository root:
+#   python benchmarks/bench_watch.py [edits] [template ...]
+
+import contextlib
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates import template_path
+from watch import Watcher, serve
+
+
+def cold_run(name, out_dir):
+    """Seconds of one `python generate_x.py` run"""
+    script = os.path.abspath(template_path(name))
+    start = time.perf_counter()
+    subprocess.run([sys.executable, script], cwd=out_dir, check=True, stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def edit_to_preview(watcher, port, name, output):
+    """(seconds to the PDF being ready, seconds to it being fetched by a preview page)"""
+    since = watcher.version
+    saved = time.time()
+    os.utime(template_path(name))
+    base = f"http://127.0.0.1:{port}"
+    state = json.loads(urllib.request.urlopen(f"{base}/wait?since={since}").read())
+    urllib.request.urlopen(f"{base}/pdf/{output}?v={state['documents'][output]['version']}").read()
+    return watcher.documents[output].latency, time.time() - saved
+
+
+def main():
+    edits = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    names = sys.argv[2:] or ["cv", "cover_letter", "portfolio_case"]
+    with tempfile.TemporaryDirectory() as out_dir:
+        watcher = Watcher([(name, f"{name}.pdf", None) for name in names], out_dir=out_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            warm_up = watcher.start()
+            server = serve(watcher, 0)
+            threading.Thread(target=watcher.run, daemon=True).start()
+            results = {}
+            for name in names:
+                cold = statistics.median(cold_run(name, out_dir) for _ in range(3))
+                times = [edit_to_preview(watcher, server.server_address[1], name, f"{name}.pdf")
+                         for _ in range(edits)]
+                results[name] = cold, times
+                time.sleep(0.1)
+    print(f"watch mode started in {warm_up:.2f}s ({len(names)} documents); median of {edits} edits")
+    for name, (cold, times) in results.items():
+        ready = statistics.median(t[0] for t in times)
+        preview = statistics.median(t[1] for t in times)
+        worst = max(t[1] for t in times)
+        print(f"  {name:<16} cold script run {cold * 1000:7.0f} ms   edit → PDF {ready * 1000:5.0f} ms   "
+              f"edit → preview {preview * 1000:5.0f} ms (max {worst * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
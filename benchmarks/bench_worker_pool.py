@@ -0,0 +1,75 @@
+# benchmarks/bench_worker_pool.py
+# Worker pool benchmark: spin-up time and per-worker memory by start method
+#
+# Run from the repository root:
+#   python benchmarks/bench_worker_pool.py [workers] [documents]
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import worker_pool
+from templates import TEMPLATES
+
+
+_READY_AT = None
+
+
+def _init_worker():
+    global _READY_AT
+    sys.stdout = open(os.devnull, "w")  # silence per-document output of build_pdf()
+    worker_pool._init_worker()
+    _READY_AT = time.time()
+
+
+def _ready(delay):
+    time.sleep(delay)  # keep this worker busy so every worker gets one task
+    return os.getpid(), _READY_AT
+
+
+def _stats(delay):
+    time.sleep(delay)
+    return worker_pool.worker_stats()
+
+
+def run(start_method, workers, documents, out_dir):
+    ctx = worker_pool.get_context(start_method)
+    names = sorted(TEMPLATES)
+    jobs = [(names[i % len(names)], os.path.join(out_dir, f"{start_method}_{i}.pdf"), None)
+            for i in range(documents)]
+
+    start = time.time()
+    with ctx.Pool(workers, initializer=_init_worker) as pool:
+        ready = dict(pool.map(_ready, [0.2] * workers, chunksize=1))
+        spin_up = max(ready.values()) - start
+
+        render_start = time.perf_counter()
+        pool.map(worker_pool._render_job, jobs)
+        render_time = time.perf_counter() - render_start
+
+        stats = {pid: (rss, private) for pid, rss, private in pool.map(_stats, [0.2] * workers, chunksize=1)}
+
+    rss = sum(v[0] for v in stats.values()) / len(stats) / 1024
+    private = sum(v[1] for v in stats.values()) / len(stats) / 1024
+    return spin_up, render_time, rss, private
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    documents = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    methods = [m for m in ("spawn", "forkserver", "fork") if m in multiprocessing.get_all_start_methods()]
+
+    print(f"Workers: {workers}, documents: {documents}")
+    print(f"{'start method':<12} {'spin-up s':>10} {'render s':>10} {'RSS MB/worker':>14} {'private MB/worker':>18}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for method in methods:
+            spin_up, render_time, rss, private = run(method, workers, documents, out_dir)
+            print(f"{method:<12} {spin_up:>10.3f} {render_time:>10.3f} {rss:>14.1f} {private:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
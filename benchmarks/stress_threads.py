@@ -0,0 +1,131 @@
+# benchmarks/stress_threads.py
+# Thread-safety stress check: many distinct documents rendered concurrently in a
+# thread pool must come out byte-identical to the same documents rendered one by one
+#
+# The first concurrent pass runs before anything else in the process, so the lazily
+# loaded shared state (fallback fonts, kerned fonts, layout cache) is built by
+# competing threads. Set ACADEMIC_KERNING=1, ACADEMIC_LINE_BREAKING=optimal, ...
+# to stress other modes. A last pass renders to files with the document index's
+# render hook installed, which must index every document. Exits with status 1 if
+# any document differs or is missing from the index.
+#
+# Run from the repository root:
+#   python benchmarks/stress_threads.py [documents] [threads] [rounds]
+
+import contextlib
+import hashlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab import rl_config
+
+from doc_index import DocumentIndex
+from pdf_output import OUTPUT_PROFILES
+from templates import RENDER_HOOKS, TEMPLATES, RenderInput, load_template, render, template_settings
+from worker_pool import render_batch_threads
+
+
+NAMES = ["Jane Smith", "John Doe", "Maria Garcia", "Lukas Müller", "Zoë Dupont",
+         "Дмитрий Иванов", "Σωκράτης Παππάς", "Ayşe Yılmaz", "Nguyễn Văn An", "Łukasz Kowalczyk"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises"]
+
+
+def inputs(n):
+    """n distinct RenderInputs across all templates and output profiles (names in
+    several scripts)"""
+    names, profiles = sorted(TEMPLATES), sorted(OUTPUT_PROFILES)
+    jobs = []
+    for i in range(n):
+        template, profile = names[i % len(names)], profiles[i // len(names) % len(profiles)]
+        settings = template_settings(template)
+        name = f"{NAMES[i % len(NAMES)]} {i}"
+        overrides = {"NAME": name} if "NAME" in settings else {}
+        if "DATA" in settings:
+            overrides["DATA"] = dict(load_template(template).DATA, name=name)
+        for key in ("COMPANY", "COMPANY_NAME"):
+            if key in settings:
+                overrides[key] = COMPANIES[i % len(COMPANIES)]
+        jobs.append(RenderInput.of(template, profile, **overrides))
+    return jobs
+
+
+def render_serial(jobs):
+    outputs = []
+    for job in jobs:
+        buf = io.BytesIO()
+        render(job, buf)
+        outputs.append(buf.getvalue())
+    return outputs
+
+
+def render_threads(jobs, threads):
+    outputs = [None] * len(jobs)
+    for profile in OUTPUT_PROFILES:
+        index = [i for i, job in enumerate(jobs) if job.profile == profile]
+        batch = [(jobs[i].template, io.BytesIO(), dict(jobs[i].overrides)) for i in index]
+        for i, buf in zip(index, render_batch_threads(batch, threads, profile)):
+            outputs[i] = buf.getvalue()
+    return outputs
+
+
+def index_threads(jobs, threads):
+    """Number of documents the render hook indexed in a threaded render of jobs to files"""
+    with tempfile.TemporaryDirectory() as tmp, DocumentIndex(os.path.join(tmp, "index.db")) as index:
+        index.install_hook()
+        try:
+            for profile in OUTPUT_PROFILES:
+                batch = [(job.template, os.path.join(tmp, f"{i}.pdf"), dict(job.overrides))
+                         for i, job in enumerate(jobs) if job.profile == profile]
+                render_batch_threads(batch, threads, profile)
+        finally:
+            RENDER_HOOKS.remove(index.hook)
+        return index.count()
+
+
+def digests(outputs):
+    return [hashlib.sha256(data).hexdigest() for data in outputs]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    rounds = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    rl_config.invariant = 1  # no timestamps or random document IDs: equal inputs give equal bytes
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible, to surface races
+    jobs = inputs(n)
+
+    times, results = {"threads": []}, []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(rounds + 1):
+            if i == 1:
+                start = time.perf_counter()
+                serial = digests(render_serial(jobs))
+                times["serial"] = time.perf_counter() - start
+            start = time.perf_counter()
+            results.append(digests(render_threads(jobs, threads)))
+            times["threads"].append(time.perf_counter() - start)
+        indexed = index_threads(jobs, threads)
+
+    failed = 0
+    for i, digest in enumerate(results):
+        wrong = [job for job, d, s in zip(jobs, digest, serial) if d != s]
+        label = "cold caches" if i == 0 else f"round {i}"
+        print(f"{'✅' if not wrong else '⚠️ '} {threads} threads, {label}: "
+              f"{n - len(wrong)}/{n} documents identical to serial renders ({times['threads'][i]:.2f}s)")
+        for job in wrong[:5]:
+            print(f"   differs: {job}")
+        failed += len(wrong)
+    print(f"serial: {times['serial']:.2f}s for {n} documents ({len(set(serial))} distinct outputs)")
+    print(f"{'✅' if indexed == n else '⚠️ '} {threads} threads with the document index hook: "
+          f"{indexed}/{n} documents indexed")
+    failed += n - indexed
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
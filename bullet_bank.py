@@ -0,0 +1,233 @@
+# bullet_bank.py
+# Bullet bank: tagged CV entries with an inverted index, assembled into CV DATA
+#
+# The bank holds far more achievements, skills and AI impact lines than fit on one
+# page. Every entry carries tags, metrics and a priority; tags, metric names and
+# keywords go into inverted indexes, so assembling a CV for a posting only touches
+# the entries that match it. The result is a DATA dict for generate_cv_academic.py
+# ("cv") and generate_cv.py ("cv_classic").
+
+import copy
+import json
+from collections import Counter, defaultdict
+from itertools import groupby, islice
+from operator import itemgetter
+
+from keywords import tokenize
+
+
+SECTIONS = ("ai_impact", "core_skills", "bullets")
+SECTION_LIMITS = {"ai_impact": 3, "core_skills": 5, "bullets": 3}
+PROFILE_KEYS = ("name", "title", "contacts", "summary", "education")
+
+TAG_WEIGHT = 3  # a matching tag counts as much as three matching keywords
+DEFAULT_PRIORITY = 3  # 1 (filler) .. 5 (always worth showing)
+
+
+def _tag_key(tag):
+    """Normalized tag: "Design-Systems" and "design systems" both -> "design system" """
+    return " ".join(tokenize(tag, ngrams=1))
+
+
+class BulletBank:
+    """CV entries with inverted indexes over tags (and metric names) and keywords"""
+
+    def __init__(self, profile=None, jobs=None, entries=None):
+        self.profile = dict(profile or {})
+        self.jobs = []
+        self._job_index = {}
+        self.entries = []
+        self._groups = []  # per entry: ("ai_impact",), ("core_skills",) or ("bullets", job id)
+        self.tag_index = defaultdict(list)  # tag key -> entry numbers
+        self.term_index = defaultdict(list)  # keyword -> entry numbers
+        self._max_tag_words = 1
+        self._by_priority = None  # priority tables, built on demand
+        for job in jobs or []:
+            self.add_job(**job)
+        for entry in entries or []:
+            self.add(**entry)
+
+    # ----- Building -----
+
+    def add_job(self, id, company, role="", dates="", location=""):
+        """Adds experience entry (bullets refer to it by id); jobs keep insertion order"""
+        if id in self._job_index:
+            raise ValueError(f"Duplicate job id: {id}")
+        self._job_index[id] = len(self.jobs)
+        self.jobs.append({"id": id, "company": company, "role": role, "dates": dates, "location": location})
+
+    def add(self, text, section="bullets", job=None, tags=(), metrics=None, priority=DEFAULT_PRIORITY):
+        """Adds entry, returns its number"""
+        if section not in SECTIONS:
+            raise ValueError(f"Unknown section: {section} (use one of {', '.join(SECTIONS)})")
+        if section == "bullets" and job not in self._job_index:
+            raise ValueError(f"Bullet needs a known job id, got {job!r}: {text}")
+        n = len(self.entries)
+        entry = {"text": text, "section": section, "tags": list(tags), "metrics": dict(metrics or {}),
+                 "priority": int(priority)}
+        if section == "bullets":
+            entry["job"] = job
+        self.entries.append(entry)
+        self._groups.append(("bullets", job) if section == "bullets" else (section,))
+        self._by_priority = None
+
+        for key in {_tag_key(t) for t in [*entry["tags"], *entry["metrics"]]}:
+            if key:
+                self.tag_index[key].append(n)
+                self._max_tag_words = max(self._max_tag_words, key.count(" ") + 1)
+        for term in set(tokenize(text, ngrams=1)):
+            self.term_index[term].append(n)
+        return n
+
+    @classmethod
+    def from_data(cls, data):
+        """Bank from a template's CV DATA; earlier items get higher priority"""
+        bank = cls(profile={k: copy.deepcopy(data[k]) for k in PROFILE_KEYS if k in data})
+        for section in ("ai_impact", "core_skills"):
+            for i, text in enumerate(data.get(section, [])):
+                bank.add(text, section, priority=max(DEFAULT_PRIORITY + 1 - i, 1))
+        for j, job in enumerate(data.get("experience", [])):
+            job_id = f"job{j + 1}"
+            bank.add_job(job_id, job["company"], job.get("role", ""), job.get("dates", ""), job.get("location", ""))
+            for i, text in enumerate(job.get("bullets", [])):
+                bank.add(text, "bullets", job_id, priority=max(DEFAULT_PRIORITY + 1 - i, 1))
+        return bank
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("profile"), data.get("jobs"), data.get("entries"))
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"profile": self.profile, "jobs": self.jobs, "entries": self.entries},
+                      f, indent=2, ensure_ascii=False)
+
+    # ----- Querying -----
+
+    def match(self, tags=(), text=""):
+        """Scores of entries matching tags or posting text: {entry number: score}.
+
+        Tags of the bank that occur as phrases in the text count like explicit tags.
+        Only posting lists of the query terms are read, never the whole bank.
+        """
+        terms = set(tokenize(text, ngrams=self._max_tag_words)) if text else set()
+        tag_keys = {_tag_key(t) for t in tags} | {t for t in terms if t in self.tag_index}
+        scores = Counter()  # Counter.update counts posting lists in C
+        for key in tag_keys:
+            for _ in range(TAG_WEIGHT):
+                scores.update(self.tag_index.get(key, ()))
+        for term in terms:
+            if " " not in term:
+                scores.update(self.term_index.get(term, ()))
+        return scores
+
+    def select(self, tags=(), text="", limits=None, fill=True):
+        """Best entries per section (and per job for bullets): {group: [entry number, ...]}.
+
+        Matches rank by score, then priority. With fill=True sections that have fewer
+        matches than their limit are topped up with the highest-priority entries.
+        """
+        limits = dict(SECTION_LIMITS, **(limits or {}))
+        scores = self.match(tags, text)
+        order, by_priority = self._priority_tables()
+
+        wanted = [(s,) for s in SECTIONS if s != "bullets"] + [("bullets", j["id"]) for j in self.jobs]
+        need = {group: limits[group[0]] for group in wanted}
+        selected = {group: [] for group in wanted}
+        open_groups = sum(1 for n in need.values() if n > 0)
+
+        # Walk score levels from the top (sorted in C), priority order within a level,
+        # and stop as soon as every group is full
+        ranked = sorted(scores.items(), key=itemgetter(1), reverse=True)
+        for _, level in groupby(ranked, key=itemgetter(1)):
+            if not open_groups:
+                break
+            for n in sorted(map(itemgetter(0), level), key=order.__getitem__):
+                group = self._groups[n]
+                if need[group]:
+                    selected[group].append(n)
+                    need[group] -= 1
+                    if not need[group]:
+                        open_groups -= 1
+                        if not open_groups:
+                            break
+
+        if fill:
+            for group, count in need.items():
+                if count:
+                    taken = set(selected[group])
+                    selected[group] += islice((n for n in by_priority.get(group, ()) if n not in taken), count)
+        return selected
+
+    def _priority_tables(self):
+        """(rank of every entry by priority, {group: entry numbers by priority}), cached"""
+        if self._by_priority is None:
+            ranked = sorted(range(len(self.entries)), key=lambda n: (-self.entries[n]["priority"], n))
+            order = [0] * len(ranked)
+            groups = defaultdict(list)
+            for rank, n in enumerate(ranked):
+                order[n] = rank
+                groups[self._groups[n]].append(n)
+            self._by_priority = (order, groups)
+        return self._by_priority
+
+    def assemble(self, tags=(), text="", limits=None, fill=True):
+        """CV DATA for a posting (tags and/or posting text); jobs without bullets are left out"""
+        selected = self.select(tags, text, limits, fill)
+        data = copy.deepcopy(self.profile)
+        for section in ("ai_impact", "core_skills"):
+            data[section] = [self.entries[n]["text"] for n in selected[(section,)]]
+        data["experience"] = []
+        for job in self.jobs:
+            bullets = [self.entries[n]["text"] for n in selected[("bullets", job["id"])]]
+            if bullets:
+                data["experience"].append(dict({k: v for k, v in job.items() if k != "id"}, bullets=bullets))
+        return data
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from templates import load_template, render_template
+
+    parser = argparse.ArgumentParser(description="Assemble a CV from a tagged bullet bank")
+    parser.add_argument("bank", help="bullet bank JSON file")
+    parser.add_argument("--init-from", choices=["cv", "cv_classic"], help="create bank from a template's DATA")
+    parser.add_argument("--tag", action="append", default=[], help="tag to match (repeatable)")
+    parser.add_argument("--posting", help="job description text file to match")
+    parser.add_argument("--template", default="cv", choices=["cv", "cv_classic"])
+    parser.add_argument("-o", "--output", help="render tailored CV to this PDF")
+    args = parser.parse_args()
+
+    if args.init_from:
+        bank = BulletBank.from_data(load_template(args.init_from).DATA)
+        bank.save(args.bank)
+        print(f"✅ Created {args.bank} with {len(bank.entries)} entries; add tags, metrics and priorities there")
+        raise SystemExit
+
+    start = time.perf_counter()
+    bank = BulletBank.load(args.bank)
+    load_ms = (time.perf_counter() - start) * 1000
+    text = ""
+    if args.posting:
+        with open(args.posting, encoding="utf-8") as f:
+            text = f.read()
+
+    start = time.perf_counter()
+    data = bank.assemble(args.tag, text)
+    assemble_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(bank.entries)} entries (load + index {load_ms:.1f} ms, assemble {assemble_ms:.2f} ms)")
+    for section in ("ai_impact", "core_skills"):
+        print(f"\n{section}:")
+        for line in data[section]:
+            print(f"  - {line}")
+    for job in data["experience"]:
+        print(f"\n{job['role']} · {job['company']}:")
+        for line in job["bullets"]:
+            print(f"  - {line}")
+
+    if args.output:
+        render_template(args.template, args.output, DATA=data)
@@ -0,0 +1,172 @@
+# bundle.py
+# Streaming ZIP/TAR output for batch runs
+#
+# Rendered documents go straight from memory into the archive, which may be a
+# non-seekable stream (pipe, socket, stdout). Nothing is staged on disk, and at most
+# `max_pending` documents are held in memory at once. A manifest.json with names,
+# SHA-256 digests and sizes is appended as the last archive entry.
+
+import functools
+import hashlib
+import io
+import json
+import os
+import queue
+import tarfile
+import threading
+import time
+import zipfile
+
+
+ARCHIVE_FORMATS = ("zip", "tar", "tar.gz")
+
+_CLOSE = object()
+
+
+class BundleSink:
+    """Writes documents into a ZIP or TAR archive from any number of producer threads.
+
+    add() may be called in any order (e.g. as parallel renders complete); it blocks
+    when `max_pending` documents are already waiting to be written.
+    """
+
+    def __init__(self, target, format="zip", max_pending=8):
+        if format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format: {format} (use one of {', '.join(ARCHIVE_FORMATS)})")
+        self.format = format
+        self._own_file = isinstance(target, (str, os.PathLike))
+        self._file = open(target, "wb") if self._own_file else target
+        if format == "zip":
+            self._archive = zipfile.ZipFile(self._file, "w", compression=zipfile.ZIP_STORED)
+        else:
+            self._archive = tarfile.open(fileobj=self._file, mode="w|gz" if format == "tar.gz" else "w|")
+        self.manifest = []
+        self._names = set()
+        self._names_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._error = None
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def add(self, name, data):
+        """Queues document bytes under archive name `name`"""
+        if self._error:
+            raise self._error
+        with self._names_lock:
+            if name in self._names:
+                raise ValueError(f"Duplicate name in bundle: {name}")
+            self._names.add(name)
+        self._queue.put((name, data))
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            if item is _CLOSE:
+                return
+            if self._error:
+                continue  # drain, so producers don't block forever
+            name, data = item
+            try:
+                self._write_entry(name, data)
+                self.manifest.append({
+                    "name": name,
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                    "size": len(data),
+                })
+            except Exception as e:
+                self._error = e
+
+    def _write_entry(self, name, data):
+        # PDF streams are already compressed, so ZIP entries are stored as-is
+        if self.format == "zip":
+            info = zipfile.ZipInfo(name, time.localtime()[:6])
+            self._archive.writestr(info, data)
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, io.BytesIO(data))
+
+    def close(self, write_manifest=True):
+        """Writes manifest.json and finishes the archive; returns manifest entries"""
+        if self._closed:
+            return self.manifest
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._writer.join()
+        try:
+            if self._error:
+                raise self._error
+            self.manifest.sort(key=lambda e: e["name"])
+            if write_manifest:
+                self._write_entry("manifest.json", json.dumps(self.manifest, indent=2).encode("utf-8"))
+            return self.manifest
+        finally:
+            self._archive.close()
+            if self._own_file:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(write_manifest=exc_type is None)
+
+
+# ---------- Batch Rendering into a Bundle ----------
+
+def _bounded(jobs, slots, stop):
+    """Yields jobs, waiting for a free slot before each one (until stop is set)"""
+    for job in jobs:
+        while not slots.acquire(timeout=0.1):
+            if stop.is_set():
+                return
+        yield job
+
+
+def render_to_bundle(jobs, target, format="zip", processes=None, start_method="forkserver",
+                     profile="default", max_pending=8):
+    """Renders jobs [(template, entry name, overrides), ...] in worker processes into an archive.
+
+    Documents are added in completion order; at most `max_pending` rendered documents
+    are in flight between the workers and the archive. Returns manifest entries.
+    """
+    import worker_pool
+
+    ctx = worker_pool.get_context(start_method)
+    slots = threading.BoundedSemaphore(max_pending)
+    stop = threading.Event()
+    render = functools.partial(worker_pool._render_job_bytes, profile=profile)
+    with BundleSink(target, format, max_pending) as sink:
+        with ctx.Pool(processes, initializer=worker_pool._init_worker) as pool:
+            try:
+                for name, data in pool.imap_unordered(render, _bounded(jobs, slots, stop)):
+                    sink.add(name, data)
+                    slots.release()
+            finally:
+                stop.set()  # unblock the job feeder if a render failed
+        return sink.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    from pdf_output import OUTPUT_PROFILES
+    from worker_pool import read_jobs
+
+    parser = argparse.ArgumentParser(description="Render a batch into a ZIP/TAR archive")
+    parser.add_argument("jobs", help='CSV with columns "template", "output" and configuration overrides')
+    parser.add_argument("-o", "--output", default="-", help='archive path ("-" for stdout)')
+    parser.add_argument("--format", default="zip", choices=ARCHIVE_FORMATS)
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("--profile", default="default", choices=sorted(OUTPUT_PROFILES))
+    parser.add_argument("--max-pending", type=int, default=8)
+    args = parser.parse_args()
+
+    target = sys.stdout.buffer if args.output == "-" else args.output
+    start = time.perf_counter()
+    manifest = render_to_bundle(read_jobs(args.jobs), target, args.format, args.processes,
+                                profile=args.profile, max_pending=args.max_pending)
+    print(f"✅ Bundled {len(manifest)} documents in {time.perf_counter() - start:.2f}s", file=sys.stderr)
@@ -0,0 +1,219 @@
+# dedupe.py
+# Pre-send check: near-duplicate letters in a batch (MinHash + LSH)
+#
+# Every letter body is rendered as plain text (text_backends), split into word
+# shingles and summarized by a MinHash signature. Locality-sensitive hashing puts
+# signatures into band buckets, so only letters that share a bucket are compared:
+# work grows roughly linearly with batch size instead of with the number of pairs.
+
+# pip install numpy  (optional, ~20x faster signatures)
+
+import random
+import re
+import time
+import zlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from text_backends import render_text
+
+
+_MASK64 = (1 << 64) - 1
+_SHINGLE_MULT = 0x9E3779B97F4A7C15  # odd 64-bit constant for combining word hashes
+_WORD_RE = re.compile(r"\w+")
+
+# (permutation, shingle) hashes computed per step of minhash_signatures(): bounds its
+# uint64 temporaries to 64 MB whatever the number and length of the documents
+CHUNK_HASHES = 1 << 23
+
+
+# ---------- Shingles and Signatures ----------
+
+def shingles(text, size=5, word_hashes=None):
+    """Unique 32-bit hashes of word `size`-grams (lowercased, punctuation ignored).
+
+    Returns a set, or a sorted array when numpy is installed. word_hashes may be a
+    dict shared between calls, so each distinct word is hashed only once.
+    """
+    cache = {} if word_hashes is None else word_hashes
+    words = _WORD_RE.findall(text.lower())
+    for w in set(words).difference(cache):
+        cache[w] = zlib.crc32(w.encode("utf-8"))
+    ids = list(map(cache.__getitem__, words)) or [0]
+    size = min(size, len(ids))
+    n = len(ids) - size + 1
+
+    if np is None:
+        out = set()
+        for i in range(n):
+            h = 0
+            for x in ids[i:i + size]:
+                h = (h * _SHINGLE_MULT + x) & _MASK64
+            out.add(h >> 32)
+        return out
+
+    ids = np.array(ids, dtype=np.uint64)
+    h = np.zeros(n, dtype=np.uint64)
+    for k in range(size):
+        h = h * np.uint64(_SHINGLE_MULT) + ids[k:k + n]  # wraps modulo 2**64
+    return np.unique(h >> np.uint64(32))
+
+
+def _permutations(num_perm, seed):
+    # multiply-shift hashing: h(x) = ((a * x + b) mod 2**64) >> 32, with odd a
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) | 1 for _ in range(num_perm)], [rng.getrandbits(64) for _ in range(num_perm)]
+
+
+def minhash_signatures(shingle_sets, num_perm=128, seed=1):
+    """MinHash signatures, one row of `num_perm` values per shingle set"""
+    if np is None:
+        a, b = _permutations(num_perm, seed)
+        return [
+            tuple(min(((ai * x + bi) & _MASK64) >> 32 for x in s) if s else 0 for ai, bi in zip(a, b))
+            for s in shingle_sets
+        ]
+
+    a, b = (np.array(v, dtype=np.uint64)[:, None] for v in _permutations(num_perm, seed))
+    signatures = np.full((len(shingle_sets), num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    step = max(1, CHUNK_HASHES // num_perm)  # shingles per step
+    for docs, pieces in _shingle_chunks(shingle_sets, step):
+        x = np.concatenate(pieces)
+        offsets = np.cumsum([0] + [len(p) for p in pieces[:-1]])
+        hashed = a * x  # in place from here on: the temporary is num_perm x shingles
+        hashed += b
+        hashed >>= np.uint64(32)
+        # A document split over several pieces (or steps) keeps the minimum of them
+        np.minimum.at(signatures, docs, np.minimum.reduceat(hashed, offsets, axis=1).T.astype(np.uint32))
+    return signatures
+
+
+def _shingle_chunks(shingle_sets, step):
+    """Yields (document indexes, shingle arrays) of at most step shingles in total;
+    sets larger than step are split into pieces over several chunks"""
+    docs, pieces, size = [], [], 0
+    for i, s in enumerate(shingle_sets):
+        s = np.fromiter(s, dtype=np.uint64) if isinstance(s, (set, frozenset)) else s
+        if not len(s):
+            s = np.zeros(1, dtype=np.uint64)
+        for start in range(0, len(s), step):
+            piece = s[start:start + step]
+            if pieces and size + len(piece) > step:
+                yield docs, pieces
+                docs, pieces, size = [], [], 0
+            docs.append(i)
+            pieces.append(piece)
+            size += len(piece)
+    if pieces:
+        yield docs, pieces
+
+
+def lsh_bands(num_perm, threshold):
+    """Chooses (bands, rows) with bands * rows == num_perm.
+
+    Pairs with similarity s share a bucket with probability 1 - (1 - s**rows)**bands;
+    the steepest part of that curve sits at about (1 / bands) ** (1 / rows). Takes the
+    most selective split whose curve still starts below the threshold, so few true
+    near-duplicates are missed.
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows == 0 and (rows / num_perm) ** (1 / rows) <= threshold:
+            best = (num_perm // rows, rows)
+    return best
+
+
+def _similarity(signatures, i, j):
+    """Estimated Jaccard similarity: fraction of equal signature values"""
+    if np is None:
+        return sum(x == y for x, y in zip(signatures[i], signatures[j])) / len(signatures[i])
+    return float(np.count_nonzero(signatures[i] == signatures[j])) / signatures.shape[1]
+
+
+# ---------- Near-Duplicate Search ----------
+
+def near_duplicates(texts, threshold=0.8, shingle_size=5, num_perm=128):
+    """Groups near-duplicate texts.
+
+    Returns (clusters, pairs): clusters are sorted lists of text indexes with two or
+    more members; pairs are the verified (i, j, similarity) links that formed them.
+    """
+    if not 0 < threshold <= 1:
+        raise ValueError(f"Threshold must be in (0, 1]: {threshold}")
+    word_hashes = {}
+    signatures = minhash_signatures([shingles(t, shingle_size, word_hashes) for t in texts], num_perm)
+    bands, rows = lsh_bands(num_perm, threshold)
+
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    pairs = []
+    for band in range(bands):
+        buckets = {}
+        for i in range(len(texts)):
+            if np is None:
+                key = signatures[i][band * rows:(band + 1) * rows]
+            else:
+                key = signatures[i, band * rows:(band + 1) * rows].tobytes()
+            buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            for n, j in enumerate(members[1:], 1):
+                # Letters already in one cluster need no further checks, so a bucket
+                # of m copies of the same letter costs m - 1 comparisons, not m**2 / 2
+                for i in members[:n]:
+                    if find(i) == find(j):
+                        break
+                    similarity = _similarity(signatures, i, j)
+                    if similarity >= threshold:
+                        pairs.append((i, j, similarity))
+                        parent[find(j)] = find(i)
+                        break
+
+    clusters = {}
+    for i in range(len(texts)):
+        clusters.setdefault(find(i), []).append(i)
+    return sorted(c for c in clusters.values() if len(c) > 1), pairs
+
+
+def batch_texts(jobs):
+    """Renders letter bodies of jobs [(template, name, overrides), ...] as plain text"""
+    names, texts = [], []
+    for template, name, overrides in jobs:
+        names.append(name)
+        texts.append(render_text(template, "text", False, **(overrides or {})))
+    return names, texts
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from worker_pool import read_jobs
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate letters in a batch before sending")
+    parser.add_argument("jobs", help='CSV with columns "template", "output" and configuration overrides')
+    parser.add_argument("--threshold", type=float, default=0.8, help="minimum similarity (default: 0.8)")
+    parser.add_argument("--shingle-size", type=int, default=5, help="words per shingle (default: 5)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    names, texts = batch_texts(read_jobs(args.jobs))
+    render_s = time.perf_counter() - start
+    start = time.perf_counter()
+    clusters, pairs = near_duplicates(texts, args.threshold, args.shingle_size)
+    search_s = time.perf_counter() - start
+
+    for cluster in clusters:
+        print(f"⚠️ {len(cluster)} near-duplicates:")
+        for i in cluster:
+            print(f"    {names[i]}")
+    if not clusters:
+        print(f"✅ No near-duplicates among {len(texts)} letters")
+    print(f"({len(texts)} letters, text {render_s:.2f}s, search {search_s:.2f}s)")
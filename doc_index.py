@@ -0,0 +1,276 @@
+# doc_index.py
+# Full-text index of generated documents (SQLite FTS5)
+#
+# Every indexed document keeps its source text (letter body, CV data, story text)
+# and metadata: template, company, role, variant and date. Searches run against an
+# FTS5 index with porter stemming, so "which companies got the AI assistant case
+# study?" is a single query. Re-indexing a path replaces its entry; unchanged text
+# is skipped.
+
+import datetime
+import hashlib
+import inspect
+import os
+import sqlite3
+import time
+
+from templates import RENDER_HOOKS, load_template
+
+
+DEFAULT_DB = "documents.db"
+
+# Template configuration variables that hold document metadata (first one present wins)
+COMPANY_VARS = ("COMPANY_NAME", "COMPANY", "NEW_COMPANY")
+ROLE_VARS = ("POSITION", "ROLE", "NEW_POSITION", "THEIR_ROLE")
+VARIANT_VARS = ("FOLLOW_UP_TYPE", "CONNECTION_TYPE", "NETWORKING_TYPE", "RESPONSE_TYPE", "BREAK_REASON")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id         INTEGER PRIMARY KEY,
+    path       TEXT NOT NULL UNIQUE,
+    template   TEXT NOT NULL,
+    company    TEXT NOT NULL DEFAULT '',
+    role       TEXT NOT NULL DEFAULT '',
+    variant    TEXT NOT NULL DEFAULT '',
+    created_on TEXT NOT NULL,
+    text_hash  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_documents_company ON documents (company);
+CREATE INDEX IF NOT EXISTS idx_documents_template_created ON documents (template, created_on);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5 (
+    body, company, role, tokenize = 'porter unicode61'
+);
+"""
+
+
+# ---------- Source Text and Metadata ----------
+
+def _plain_story_text(module):
+    from academic_styles import get_academic_styles
+    story = module.build_story(get_academic_styles())
+    return "\n".join(f.getPlainText() for f in story if hasattr(f, "getPlainText"))
+
+
+def _flatten(value):
+    if isinstance(value, dict):
+        return [s for v in value.values() for s in _flatten(v)]
+    if isinstance(value, (list, tuple)):
+        return [s for v in value for s in _flatten(v)]
+    return [str(value)] if value else []
+
+
+def source_text(module):
+    """Plain source text of a loaded template (letter body, CV DATA or story text)"""
+    if hasattr(module, "BODY"):
+        from text_backends import render_document
+        return render_document(module, "text")
+    if hasattr(module, "DATA"):
+        return "\n".join(_flatten(module.DATA))
+    if hasattr(module, "build_story"):
+        return _plain_story_text(module)
+    raise ValueError(f"Template {module.__name__} has no text to index")
+
+
+def _first(module, names):
+    for name in names:
+        value = getattr(module, name, None)
+        if isinstance(value, str) and value:
+            return value
+    return ""
+
+
+def document_metadata(module):
+    """(company, role, variant) from the template configuration"""
+    return _first(module, COMPANY_VARS), _first(module, ROLE_VARS), _first(module, VARIANT_VARS)
+
+
+def _default_path(module):
+    return inspect.signature(module.build_pdf).parameters["path"].default
+
+
+def _quote(word):
+    return '"' + word.replace('"', '""') + '"'
+
+
+def _fts_query(text):
+    """Quotes every word, so user input can't break FTS5 query syntax"""
+    return " ".join(_quote(word) for word in text.split())
+
+
+# ---------- Index ----------
+
+class DocumentIndex:
+    """Full-text index of generated documents backed by one SQLite file"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode = WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ----- Updating -----
+
+    def add(self, path, template, text, company="", role="", variant="", created_on=None):
+        """Indexes (or re-indexes) document at path; returns False if its text is unchanged"""
+        return self.add_many([(path, template, text, company, role, variant, created_on)]) == 1
+
+    def add_many(self, documents):
+        """Indexes [(path, template, text, company, role, variant, created_on), ...] in one
+        transaction; returns the number of new or changed documents"""
+        changed = 0
+        with self.db:
+            for path, template, text, company, role, variant, created_on in documents:
+                path = os.path.abspath(path)
+                digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+                row = self.db.execute("SELECT id, text_hash FROM documents WHERE path = ?", (path,)).fetchone()
+                if row and row["text_hash"] == digest:
+                    continue
+                if row:
+                    # Re-insert under a new id, so the newest-first order sees the update
+                    self.db.execute("DELETE FROM documents WHERE id = ?", (row["id"],))
+                    self.db.execute("DELETE FROM documents_fts WHERE rowid = ?", (row["id"],))
+                doc_id = self.db.execute(
+                    "INSERT INTO documents (path, template, company, role, variant, created_on, text_hash)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (path, template, company, role, variant,
+                     created_on or datetime.date.today().isoformat(), digest)).lastrowid
+                self.db.execute("INSERT INTO documents_fts (rowid, body, company, role) VALUES (?, ?, ?, ?)",
+                                (doc_id, text, company, role))
+                changed += 1
+        return changed
+
+    def add_rendered(self, jobs):
+        """Indexes rendered jobs [(template, path, overrides), ...]; returns changed count"""
+        documents = []
+        for name, path, overrides in jobs:
+            module = load_template(name, **(overrides or {}))
+            documents.append((path, name, source_text(module), *document_metadata(module), None))
+        return self.add_many(documents)
+
+    def remove_missing(self):
+        """Drops entries whose files no longer exist; returns their number"""
+        gone = [row["id"] for row in self.db.execute("SELECT id, path FROM documents")
+                if not os.path.exists(row["path"])]
+        with self.db:
+            self.db.executemany("DELETE FROM documents WHERE id = ?", [(i,) for i in gone])
+            self.db.executemany("DELETE FROM documents_fts WHERE rowid = ?", [(i,) for i in gone])
+        return len(gone)
+
+    def hook(self, name, path, module, overrides):
+        """render_template() hook: indexes every document rendered to a file"""
+        path = _default_path(module) if path is None else path
+        if isinstance(path, (str, os.PathLike)):
+            self.add(path, name, source_text(module), *document_metadata(module))
+
+    def install_hook(self):
+        """Indexes every render_template() call in this process from now on"""
+        RENDER_HOOKS.append(self.hook)
+
+    # ----- Queries -----
+
+    def _where(self, query, raw, template=None, company=None, since=None):
+        """WHERE clause and parameters: FTS match plus metadata filters"""
+        match = f"({query if raw else _fts_query(query)})"
+        where, params = ["documents_fts MATCH ?"], []
+        if company:
+            # Narrow the match inside FTS5 (posting list intersection), then compare exactly
+            match += f" AND company : ({' + '.join(_quote(w) for w in company.split())})"
+            where.append("d.company = ?")
+            params.append(company)
+        if template:
+            where.append("d.template = ?")
+            params.append(template)
+        if since:
+            where.append("d.created_on >= ?")
+            params.append(since)
+        return " AND ".join(where), [match, *params]
+
+    def search(self, query, template=None, company=None, since=None, limit=20, raw=False, rank=False):
+        """Matching documents, most recently indexed first (best match first with rank=True).
+
+        Returns sqlite3.Row objects with metadata and a text snippet. Newest-first
+        results stream from the index and stop at `limit`; ranking has to score
+        every match, which is slower for common words.
+        """
+        where, params = self._where(query, raw, template, company, since)
+        order = "rank" if rank else "documents_fts.rowid DESC"
+        return self.db.execute(
+            "SELECT d.*, snippet(documents_fts, 0, '[', ']', '…', 12) AS snippet"
+            " FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid"
+            f" WHERE {where} ORDER BY {order} LIMIT ?",
+            [*params, limit]).fetchall()
+
+    def companies(self, query, template=None, since=None, raw=False):
+        """[(company, documents, last date), ...] of documents matching the query"""
+        where, params = self._where(query, raw, template, None, since)
+        return self.db.execute(
+            "SELECT d.company, COUNT(*) AS documents, MAX(d.created_on) AS last"
+            " FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid"
+            f" WHERE {where} GROUP BY d.company ORDER BY last DESC",
+            params).fetchall()
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search generated documents")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite file (default: {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for command, text in (("search", "find documents"), ("companies", "companies that received matching documents")):
+        sub = commands.add_parser(command, help=text)
+        sub.add_argument("query", help='words to find; with --raw, FTS5 syntax such as "AI assistant" OR chatbot')
+        sub.add_argument("--template")
+        sub.add_argument("--since", help="only documents from this date (YYYY-MM-DD)")
+        sub.add_argument("--raw", action="store_true", help="pass query to FTS5 unchanged")
+        if command == "search":
+            sub.add_argument("--company")
+            sub.add_argument("-n", "--limit", type=int, default=20)
+            sub.add_argument("--rank", action="store_true", help="best match first instead of most recent first")
+
+    add = commands.add_parser("add", help="index a generated PDF")
+    add.add_argument("path")
+    add.add_argument("template")
+    add.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                     help="configuration override used for the render (repeatable)")
+
+    commands.add_parser("prune", help="drop entries of deleted files")
+    commands.add_parser("stats", help="number of indexed documents")
+    args = parser.parse_args()
+
+    with DocumentIndex(args.db) as index:
+        start = time.perf_counter()
+        if args.command == "search":
+            rows = index.search(args.query, args.template, args.company, args.since, args.limit, args.raw, args.rank)
+            elapsed = (time.perf_counter() - start) * 1000
+            for row in rows:
+                print(f"{row['created_on']}  {row['template']:<22} {row['company'] or '-':<24} {row['path']}")
+                print(f"    {' '.join(row['snippet'].split())}")
+            print(f"{len(rows)} document(s) ({elapsed:.1f} ms)")
+        elif args.command == "companies":
+            rows = index.companies(args.query, args.template, args.since, args.raw)
+            elapsed = (time.perf_counter() - start) * 1000
+            for row in rows:
+                print(f"{row['company'] or '(no company)':<32} {row['documents']:>5} document(s), last {row['last']}")
+            print(f"{len(rows)} compan{'y' if len(rows) == 1 else 'ies'} ({elapsed:.1f} ms)")
+        elif args.command == "add":
+            overrides = dict(item.split("=", 1) for item in args.set)
+            changed = index.add_rendered([(args.template, args.path, overrides)])
+            print(f"✅ Indexed {args.path}" if changed else f"✅ {args.path} is up to date")
+        elif args.command == "prune":
+            print(f"✅ Removed {index.remove_missing()} entries")
+        else:
+            print(f"{index.count()} documents in {args.db}")
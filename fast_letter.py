@@ -0,0 +1,84 @@
+# fast_letter.py
+# Fast path for simple one-page letters: the story drawn straight onto the canvas
+#
+# Most letters are a title, a meta line and one justified body (the CV is a longer
+# run of paragraphs): a handful of flowables on one page. SimpleDocTemplate still
+# runs its page templates, frames, hanging-action queue and per-flowable bookkeeping
+# for them. build_letter() places such stories itself with the frame's arithmetic
+# (padding, collapsed space before/after) and draws each flowable on a canvas made
+# the way the document makes it, so the PDF comes out the same. Stories with other
+# flowables, or that overflow one page, go through doc.build() as before.
+
+from reportlab import rl_config
+from reportlab.platypus import Paragraph, Spacer
+
+import academic_styles
+from letterhead import LetterheadFlowable
+
+
+FRAME_PADDING = 6  # SimpleDocTemplate frame padding on every side (points)
+_FUZZ = 1e-6
+
+SIMPLE_FLOWABLES = (Paragraph, Spacer, LetterheadFlowable)
+
+
+# ---------- Layout ----------
+
+def is_simple(story):
+    """True for stories the fast path can draw: paragraphs, spacers and letterheads"""
+    for f in story:
+        if not isinstance(f, SIMPLE_FLOWABLES):
+            return False
+        style = getattr(f, "style", None)
+        if style is not None and (getattr(style, "pageBreakBefore", 0) or getattr(style, "frameBreakBefore", 0)):
+            return False
+    return True
+
+
+def place_on_page(story, doc):
+    """Positions of story's flowables in the document's single frame, placed as
+    Frame.add does: [(flowable, x, y, spare width), ...], or None if it overflows"""
+    x = doc.leftMargin + FRAME_PADDING
+    y = doc.bottomMargin + doc.height - FRAME_PADDING
+    bottom = doc.bottomMargin + FRAME_PADDING
+    aW = doc.width - 2 * FRAME_PADDING
+    placed, at_top, prev_after = [], True, 0
+    for f in story:
+        s = 0 if at_top else f.getSpaceBefore()
+        if not at_top and rl_config.overlapAttachedSpace:
+            s = max(s - prev_after, 0)
+        avail = y - bottom - s
+        if avail <= 0 and not getattr(f, "_ZEROSIZE", False):
+            return None
+        w, h = f.wrap(aW, avail)
+        if y - s - h < bottom - _FUZZ:
+            return None
+        y -= s + h
+        placed.append((f, x, y, aW - w))
+        prev_after = f.getSpaceAfter()
+        y -= prev_after
+        if s + h + prev_after:
+            at_top = False
+    return placed
+
+
+# ---------- Build ----------
+
+def build_letter(doc, story):
+    """Builds story into doc's file: drawn directly if it is simple and fits one page,
+    else with doc.build(story). Returns True if the fast path was taken."""
+    if academic_styles.FAST_LETTER and is_simple(story):
+        doc._calc()  # frame geometry from the current margins, as build() does
+        placed = place_on_page(story, doc)
+        if placed is not None:
+            canv = doc._makeCanvas()
+            for f, x, y, spare in placed:
+                f.drawOn(canv, x, y, _sW=spare)
+            canv.setPageRotation(doc.rotation)
+            canv.showPage()
+            doc.canv = canv
+            if getattr(doc, "_doSave", 1):  # as in doc.build(): 0 leaves saving to the caller
+                canv.save()
+            return True
+    doc.build(story)
+    return False
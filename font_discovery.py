@@ -0,0 +1,179 @@
+# font_discovery.py
+# Index of the TrueType fonts installed on this machine, by family and style
+#
+# The academic font is Times New Roman where it is found, else a metric-compatible serif
+# (Liberation Serif, Tinos, ...) or DejaVu Serif. Instead of hardcoded paths, the
+# standard font directories (FONT_DIRS) are scanned once: for every font file only the
+# table directory, the 'name' table (family, name ID 1) and the 'head' table (bold and
+# italic bits of macStyle) are read. The index is saved as JSON (INDEX_PATH) with the
+# mtime of every directory scanned; later runs load it after a stat() per directory
+# and scan again only if a directory changed (a font added or removed).
+#
+# Only fonts reportlab can embed are indexed: TrueType outlines ('glyf') in .ttf/.otf
+# files. CFF-flavoured OpenType (.otf with 'CFF ') and collections (.ttc) are skipped.
+
+import json
+import os
+import struct
+import sys
+
+
+FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "~/.local/share/fonts",
+    "~/.fonts",
+    "/Library/Fonts",
+    "/System/Library/Fonts",
+    "~/Library/Fonts",
+]
+FONT_EXTENSIONS = (".ttf", ".otf")
+TRUETYPE_TAGS = (b"\x00\x01\x00\x00", b"true")
+
+INDEX_PATH = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                          "academic-templates", "font-index.json")
+INDEX_VERSION = 1
+
+STYLES = [(False, False), (True, False), (False, True), (True, True)]  # regular, bold, italic, bold italic
+
+
+# ---------- Font Files ----------
+
+def _family_name(data):
+    """Family name (name ID 1) of a 'name' table: Windows English first, then any
+    Windows name, then Macintosh"""
+    _, count, strings = struct.unpack_from(">HHH", data)
+    best = None
+    for i in range(count):
+        platform, _, language, name_id, length, offset = struct.unpack_from(">6H", data, 6 + 12 * i)
+        if name_id != 1 or platform not in (1, 3):
+            continue
+        rank = 0 if (platform, language) == (3, 0x409) else 1 if platform == 3 else 2
+        if best is None or rank < best[0]:
+            raw = data[strings + offset:strings + offset + length]
+            best = (rank, raw.decode("utf-16-be" if platform == 3 else "mac_roman", errors="ignore"))
+    return best[1].strip() if best else None
+
+
+def read_font(path):
+    """(family, bold, italic) of a TrueType font file, or None for fonts reportlab
+    can't embed and for unreadable files"""
+    try:
+        with open(path, "rb") as f:
+            header = f.read(12)
+            if len(header) < 12 or header[:4] not in TRUETYPE_TAGS:
+                return None
+            count = struct.unpack_from(">H", header, 4)[0]
+            directory = f.read(16 * count)
+            tables = {}
+            for i in range(count):
+                tag, _, offset, length = struct.unpack_from(">4sIII", directory, 16 * i)
+                tables[tag] = (offset, length)
+            if not all(tag in tables for tag in (b"glyf", b"name", b"head")):
+                return None
+            f.seek(tables[b"head"][0] + 44)
+            mac_style = struct.unpack(">H", f.read(2))[0]
+            f.seek(tables[b"name"][0])
+            family = _family_name(f.read(tables[b"name"][1]))
+    except (OSError, struct.error):
+        return None
+    return (family, bool(mac_style & 1), bool(mac_style & 2)) if family else None
+
+
+# ---------- Scanning ----------
+
+def _mtime(directory):
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+
+
+def scan(roots):
+    """({directory: mtime or None if missing}, [[path, family, bold, italic], ...]) of
+    the font files under roots"""
+    mtimes, fonts = {}, []
+    for root in map(os.path.expanduser, roots):
+        mtimes[root] = _mtime(root)
+        for directory, subdirs, names in os.walk(root):
+            subdirs.sort()
+            mtimes[directory] = _mtime(directory)
+            for name in sorted(names):
+                if name.lower().endswith(FONT_EXTENSIONS):
+                    path = os.path.join(directory, name)
+                    found = read_font(path)
+                    if found:
+                        fonts.append([path, *found])
+    return mtimes, fonts
+
+
+def _fresh(mtimes):
+    return all(_mtime(directory) == mtime for directory, mtime in mtimes.items())
+
+
+# ---------- Index ----------
+
+class FontIndex:
+    """Installed TrueType fonts: {family (lower case): {(bold, italic): path}}"""
+
+    def __init__(self, fonts):
+        self.fonts = fonts
+        self.families = {}
+        for path, family, bold, italic in fonts:
+            self.families.setdefault(family.lower(), {}).setdefault((bold, italic), path)
+
+    def find(self, families):
+        """(name, regular, bold, italic, bold italic) of the first of families that is
+        installed with a regular style, as in FONT_CANDIDATES ("" for missing styles);
+        None if none is"""
+        for family in families:
+            styles = self.families.get(family.lower(), {})
+            if (False, False) in styles:
+                return (family.replace(" ", ""), *(styles.get(style, "") for style in STYLES))
+        return None
+
+
+_INDEXES = {}
+
+
+def load_index(roots=FONT_DIRS, path=INDEX_PATH, rescan=False):
+    """FontIndex of the fonts under roots: from the saved index if no directory changed
+    since it was made, else from a new scan (saved for the next run)"""
+    key = (tuple(roots), path)
+    if key in _INDEXES and not rescan:
+        return _INDEXES[key]
+    data = None
+    if not rescan:
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            pass
+    if (not isinstance(data, dict) or data.get("version") != INDEX_VERSION or data.get("roots") != list(roots)
+            or not _fresh(data.get("dirs", {}))):
+        mtimes, fonts = scan(roots)
+        data = {"version": INDEX_VERSION, "roots": list(roots), "dirs": mtimes, "fonts": fonts}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError:
+            pass  # read-only cache directory: scan again next run
+    _INDEXES[key] = FontIndex(data["fonts"])
+    return _INDEXES[key]
+
+
+def find_family(families):
+    """(name, regular, bold, italic, bold italic) of the first installed of families"""
+    return load_index().find(families)
+
+
+if __name__ == "__main__":
+    index = load_index(rescan="--rescan" in sys.argv)
+    print(f"✅ {len(index.fonts)} TrueType fonts in {len(index.families)} families (index: {INDEX_PATH})")
+    for family in sorted({family for _, family, _, _ in index.fonts}):
+        styles = index.families[family.lower()]
+        names = [" ".join(filter(None, ("bold" * b, "italic" * i))) or "regular" for b, i in styles]
+        print(f"  {family}: {', '.join(names)}")
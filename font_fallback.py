@@ -0,0 +1,183 @@
+# font_fallback.py
+# Fallback fonts for characters the academic font has no glyph for
+#
+# The academic font is the first of FONT_CANDIDATES that exists, and a name or company
+# in another script (Cyrillic, Greek, Arabic, CJK, ...) may have characters it lacks:
+# reportlab then draws them as empty boxes (TrueType) or drops them (standard fonts).
+# coverage() indexes the codepoints of a font once, from its cmap, as 256-bit masks per
+# block of 256 codepoints, so a lookup is one dict get and a shift. fallback_story()
+# splits the text fragments of a story's paragraphs into runs by covering font: the
+# paragraph's own font wherever it has the glyph, else the first of FALLBACK_FONTS that
+# has it (bold fallbacks for bold text). Fallback fonts are loaded only when a
+# character needs them, and text the font covers (all of it, usually) is left as is.
+
+import re
+import threading
+
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph
+
+from academic_styles import FALLBACK_FONTS, SharedTTFont
+
+
+FALLBACK_PREFIX = "Fallback-"
+
+T1_CODECS = {"WinAnsiEncoding": "cp1252", "MacRomanEncoding": "mac_roman"}
+
+
+# ---------- Coverage ----------
+
+class Coverage:
+    """Codepoints a font has glyphs for, as {codepoint >> 8: 256-bit mask}"""
+
+    __slots__ = ("blocks", "ascii")
+
+    def __init__(self, codepoints):
+        blocks = {}
+        for c in codepoints:
+            blocks[c >> 8] = blocks.get(c >> 8, 0) | 1 << (c & 0xFF)
+        self.blocks = blocks
+        self.ascii = all(self.covers(chr(c)) for c in range(32, 127))  # printable ASCII
+
+    def covers(self, char):
+        c = ord(char)
+        return self.blocks.get(c >> 8, 0) >> (c & 0xFF) & 1 == 1
+
+    def __len__(self):
+        return sum(bin(mask).count("1") for mask in self.blocks.values())
+
+
+_T1_COVERAGE = {}
+
+
+def coverage(font_name):
+    """Coverage of registered font font_name: built once per TrueType face (kept on the
+    face) or standard font encoding; None if it can't be told"""
+    font = pdfmetrics.getFont(font_name)
+    if isinstance(font, TTFont):
+        face = font.face
+        if getattr(face, "_coverage", None) is None:
+            face._coverage = Coverage(c for c, glyph in face.charToGlyph.items() if glyph)
+        return face._coverage
+    codec = T1_CODECS.get(getattr(font.encoding, "name", None))
+    if codec is None:
+        return None
+    if codec not in _T1_COVERAGE:
+        _T1_COVERAGE[codec] = Coverage(map(ord, bytes(range(32, 256)).decode(codec, errors="ignore")))
+    return _T1_COVERAGE[codec]
+
+
+# ---------- Fallback Fonts ----------
+
+_fallbacks = {}  # bold: [registered fallback font names], loaded in FALLBACK_FONTS order
+_pending = {}  # bold: iterator over the FALLBACK_FONTS not loaded yet
+_choices = {}  # (font name, character): font to set it in
+_lock = threading.Lock()  # loading fallback fonts advances the shared _pending iterators
+
+
+def _is_bold(font_name):
+    return "Bold" in font_name
+
+
+def _candidates(bold):
+    seen = set()
+    for name, regular, bold_file in FALLBACK_FONTS:
+        path = bold_file if bold and bold_file else regular
+        if name in seen or not path:
+            continue
+        try:
+            font_name = FALLBACK_PREFIX + name + ("-Bold" if path == bold_file else "")
+            if font_name not in pdfmetrics.getRegisteredFontNames():
+                pdfmetrics.registerFont(SharedTTFont(font_name, path))
+        except Exception:
+            continue  # missing or unreadable file: try the next candidate
+        seen.add(name)
+        yield font_name
+
+
+def _fallback_fonts(bold):
+    """Fallback font names in order, loading the next one only when the loaded ones
+    are exhausted"""
+    loaded = _fallbacks.setdefault(bold, [])
+    pending = _pending.setdefault(bold, _candidates(bold))
+    yield from loaded
+    for font_name in pending:
+        loaded.append(font_name)
+        yield font_name
+
+
+def fallback_for(char, font_name):
+    """Font to set char in where font_name has no glyph for it: the first fallback
+    font with one, else font_name itself"""
+    key = (font_name, char)
+    if key not in _choices:
+        with _lock:
+            _choices[key] = next((f for f in _fallback_fonts(_is_bold(font_name)) if coverage(f).covers(char)),
+                                 font_name)
+    return _choices[key]
+
+
+# ---------- Text Runs ----------
+
+def font_runs(text, font_name):
+    """[(font name, text), ...]: text split into runs by covering font. Spaces between
+    characters of one fallback font stay in its run."""
+    own = coverage(font_name)
+    if own is None or (own.ascii and text.isascii()):
+        return [(font_name, text)]
+    fonts = {c: fallback_for(c, font_name) for c in set(text) if not own.covers(c)}
+    if not fonts:
+        return [(font_name, text)]
+    missing = "".join(map(re.escape, fonts))
+    single = len(set(fonts.values())) == 1  # usually: one script, one fallback font
+    runs, pos = [], 0
+    for match in re.finditer(f"[{missing}](?:[{missing}\\s]*[{missing}])?", text):
+        span = match.group()
+        runs.append((font_name, text[pos:match.start()]))
+        start, current = 0, fonts[span[0]]
+        if not single:
+            for i, c in enumerate(span):
+                name = current if c.isspace() else fonts[c]
+                if name != current:
+                    runs.append((current, span[start:i]))
+                    start, current = i, name
+        runs.append((current, span[start:]))
+        pos = match.end()
+    runs.append((font_name, text[pos:]))
+    merged = []
+    for name, run in runs:
+        if merged and merged[-1][0] == name:
+            merged[-1] = (name, merged[-1][1] + run)
+        elif run:
+            merged.append((name, run))
+    return merged
+
+
+def fallback_frags(frags):
+    """Paragraph fragments with each text fragment split into runs by covering font
+    (frags itself if nothing needs a fallback font)"""
+    out, changed = [], False
+    for frag in frags:
+        text = getattr(frag, "text", "")
+        if not text or getattr(frag, "cbDefn", None) is not None:
+            out.append(frag)
+            continue
+        runs = font_runs(text, frag.fontName)
+        if len(runs) == 1 and runs[0][0] == frag.fontName:
+            out.append(frag)
+            continue
+        out += [frag.clone(text=run, fontName=name) for name, run in runs]
+        changed = True
+    return out if changed else frags
+
+
+def fallback_story(story):
+    """Sets the characters of the story's paragraphs their fonts lack in fallback
+    fonts, in place"""
+    for flowable in story:
+        if isinstance(flowable, Paragraph):
+            flowable.frags = fallback_frags(flowable.frags)
+        elif isinstance(getattr(flowable, "_content", None), list):
+            fallback_story(flowable._content)
+    return story
@@ -16,8 +16,12 @@ from academic_styles import (
     format_academic_url_link,
     format_academic_simple_url,
     format_academic_email_link,
+    body_paragraphs,
+    prepare_story,
     BASE_FONT
 )
+from pdf_output import get_output_options, finalize_output
+from fast_letter import build_letter
 
 
 # ---------- Helpers ----------
@@ -72,20 +76,9 @@ Sincerely,
 
 # ---------- Build PDF with Academic Style ----------
 
-def build_pdf(path="Style_Document.pdf"):
-    """Generates PDF in academic style"""
-    
-    margins = get_academic_margins()
-    
-    doc = SimpleDocTemplate(
-        path,
-        pagesize=A4,
-        **margins
-    )
-    
-    s = get_academic_styles()
-    
-    story = [
+def build_story(s):
+    """Returns story (list of flowables) in academic style"""
+    return [
         # Title
         Paragraph(nz(NAME), s["title"]),
         
@@ -96,10 +89,28 @@ def build_pdf(path="Style_Document.pdf"):
         # Paragraph(nz(TODAY), s["date"]),
         
         # Main text
-        Paragraph(nz(BODY).replace("\n\n", "<br/><br/>"), s["body"]),
+        *body_paragraphs(nz(BODY), s["body"]),
     ]
+
+
+def build_pdf(path="Style_Document.pdf", profile="default"):
+    """Generates PDF in academic style"""
+    
+    margins = get_academic_margins()
+    
+    doc = SimpleDocTemplate(
+        path,
+        pagesize=A4,
+        **margins,
+        **get_output_options(profile)
+    )
+    
+    s = get_academic_styles()
+    
+    story = build_story(s)
     
-    doc.build(story)
+    build_letter(doc, prepare_story(story))
+    finalize_output(path, profile)
     print(f"✅ Generated: {path}  (font={BASE_FONT})")
 
 
@@ -12,8 +12,12 @@ from academic_styles import (
     format_academic_url_link,
     format_academic_simple_url,
     format_academic_email_link,
+    body_paragraphs,
+    prepare_story,
     BASE_FONT
 )
+from pdf_output import get_output_options, finalize_output
+from fast_letter import build_letter
 
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -73,21 +77,27 @@ Best regards,
 
 # ---------- Build PDF ----------
 
-def build_pdf(path="Application_Withdrawal.pdf"):
-    """Generates PDF in academic style"""
-    margins = get_academic_margins()
-    doc = SimpleDocTemplate(path, pagesize=A4, **margins)
-    s = get_academic_styles()
-    
-    story = [
+def build_story(s):
+    """Returns story (list of flowables) in academic style"""
+    return [
         Paragraph(nz(NAME), s["title"]),
         Spacer(1, 3*mm),
         Paragraph(nz(LINKS), s["meta"]),
         Spacer(1, 8*mm),
-        Paragraph(nz(BODY).replace("\n\n", "<br/><br/>"), s["body"]),
+        *body_paragraphs(nz(BODY), s["body"]),
     ]
+
+
+def build_pdf(path="Application_Withdrawal.pdf", profile="default"):
+    """Generates PDF in academic style"""
+    margins = get_academic_margins()
+    doc = SimpleDocTemplate(path, pagesize=A4, **margins, **get_output_options(profile))
+    s = get_academic_styles()
+    
+    story = build_story(s)
     
-    doc.build(story)
+    build_letter(doc, prepare_story(story))
+    finalize_output(path, profile)
     print(f"✅ Generated: {path}  (font={BASE_FONT})")
 
 
@@ -14,8 +14,12 @@ from academic_styles import (
     get_academic_margins,
     format_academic_url_link,
     format_academic_simple_url,
+    body_paragraphs,
+    prepare_story,
     BASE_FONT
 )
+from pdf_output import get_output_options, finalize_output
+from fast_letter import build_letter
 
 
 # ---------- Helpers ----------
@@ -73,29 +77,36 @@ Best regards,
 
 # ---------- Build PDF with Academic Style ----------
 
-def build_pdf(path="Cover_Letter.pdf"):
+def build_story(s):
+    """Returns story (list of flowables) in academic style"""
+    return [
+        Paragraph(nz(NAME), s["title"]),
+        Spacer(1, 3*mm),
+        Paragraph(nz(LINKS), s["meta"]),
+        Spacer(1, 8*mm),
+        # Uncomment next line if date is needed:
+        # Paragraph(nz(TODAY), s["date"]),
+        *body_paragraphs(nz(BODY), s["body"]),
+    ]
+
+
+def build_pdf(path="Cover_Letter.pdf", profile="default"):
     """Generates PDF in academic style"""
     margins = get_academic_margins()
     
     doc = SimpleDocTemplate(
         path,
         pagesize=A4,
-        **margins
+        **margins,
+        **get_output_options(profile)
     )
     
     s = get_academic_styles()
     
-    story = [
-        Paragraph(nz(NAME), s["title"]),
-        Spacer(1, 3*mm),
-        Paragraph(nz(LINKS), s["meta"]),
-        Spacer(1, 8*mm),
-        # Uncomment next line if date is needed:
-        # Paragraph(nz(TODAY), s["date"]),
-        Paragraph(nz(BODY).replace("\n\n", "<br/><br/>"), s["body"]),
-    ]
+    story = build_story(s)
     
-    doc.build(story)
+    build_letter(doc, prepare_story(story))
+    finalize_output(path, profile)
     print(f"✅ Generated: {path}  (font={BASE_FONT})")
 
 
@@ -8,6 +8,8 @@ from reportlab.lib.colors import blue
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
 
+from pdf_output import get_output_options, finalize_output
+
 PAGE_W, PAGE_H = A4
 MARGIN_X = 16 * mm
 MARGIN_TOP = 16 * mm
@@ -120,10 +122,9 @@ DATA = {
 }
 
 
-def main():
-    # Output file name
-    out = "CV_Resume_Classic.pdf"
-    c = canvas.Canvas(out, pagesize=A4)
+def build_pdf(path="CV_Resume_Classic.pdf", profile="default"):
+    """Generates CV in standard style"""
+    c = canvas.Canvas(path, pagesize=A4, **get_output_options(profile))
 
     x = MARGIN_X
     w = PAGE_W - 2 * MARGIN_X
@@ -237,7 +238,12 @@ def main():
         y = draw_wrapped_text(c, f"• {e}", x, y, w, FONT_MAIN, 10, leading=13)
 
     c.save()
-    print(f"✅ Generated: {out}")
+    finalize_output(path, profile)
+    print(f"✅ Generated: {path}")
+
+
+def main():
+    build_pdf()
 
 
 if __name__ == "__main__":
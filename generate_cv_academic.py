@@ -4,7 +4,7 @@
 # pip install reportlab
 
 from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, KeepTogether
+from reportlab.platypus import SimpleDocTemplate, Spacer
 from reportlab.lib.units import mm
 from reportlab.lib.colors import HexColor
 import unicodedata
@@ -13,13 +13,16 @@ import unicodedata
 from academic_styles import (
     get_academic_styles,
     get_academic_margins,
-    format_academic_email_link,
-    format_academic_url_link,
+    academic_full_url,
+    prepare_story,
     BASE_FONT,
     BOLD_FONT,
     TEXT_COLOR,
     META_COLOR
 )
+from pdf_output import get_output_options, finalize_output
+from fast_letter import build_letter
+from rich_text import RichText
 
 
 # ---------- Helpers ----------
@@ -90,74 +93,89 @@ DATA = {
 
 # ---------- Build PDF with Academic Style ----------
 
-def build_pdf(path="CV_Resume.pdf"):
-    """Generates CV in academic style"""
-    margins = get_academic_margins()
-    
-    doc = SimpleDocTemplate(
-        path,
-        pagesize=A4,
-        **margins
-    )
-    
-    s = get_academic_styles()
-    
+def build_story(s):
+    """Returns CV story (list of flowables) in academic style"""
+    # Paragraphs are built with RichText: DATA is plain text (no markup escaping needed)
     story = []
     
     # Header
-    story.append(Paragraph(nz(DATA["name"]), s["title"]))
-    story.append(Paragraph(nz(DATA["title"]), s["subsection"]))
+    story.append(RichText(nz(DATA["name"])).paragraph(s["title"]))
+    story.append(RichText(nz(DATA["title"])).paragraph(s["subsection"]))
     story.append(Spacer(1, 2*mm))
     
     # Contacts
     contacts = DATA.get("contacts", {})
-    contact_parts = []
+    contact_links = []
     if contacts.get("email"):
-        contact_parts.append(format_academic_email_link(contacts["email"]))
+        contact_links.append((contacts["email"], f'mailto:{contacts["email"]}'))
     if contacts.get("linkedin"):
-        contact_parts.append(format_academic_url_link("LinkedIn", contacts["linkedin"]))
+        contact_links.append(("LinkedIn", academic_full_url(contacts["linkedin"])))
     if contacts.get("portfolio"):
-        contact_parts.append(format_academic_url_link("Portfolio", contacts["portfolio"]))
+        contact_links.append(("Portfolio", academic_full_url(contacts["portfolio"])))
     
-    if contact_parts:
-        story.append(Paragraph(" · ".join(contact_parts), s["meta"]))
+    if contact_links:
+        line = RichText()
+        for i, (name, url) in enumerate(contact_links):
+            if i:
+                line.add(" · ")
+            line.link(name, url)
+        story.append(line.paragraph(s["meta"]))
         story.append(Spacer(1, 6*mm))
     
     # Summary
-    story.append(Paragraph(nz("<b>SUMMARY</b>"), s["section"]))
-    story.append(Paragraph(nz(DATA.get("summary", "")), s["body"]))
+    story.append(RichText().bold("SUMMARY").paragraph(s["section"]))
+    story.append(RichText(nz(DATA.get("summary", ""))).paragraph(s["body"]))
     
     # AI & Product Impact
-    story.append(Paragraph(nz("<b>AI & PRODUCT IMPACT</b>"), s["section"]))
+    story.append(RichText().bold("AI & PRODUCT IMPACT").paragraph(s["section"]))
     for line in DATA.get("ai_impact", []):
-        story.append(Paragraph(nz(line), s["body_left"]))
+        story.append(RichText(nz(line)).paragraph(s["body_left"]))
     
     # Core Skills
-    story.append(Paragraph(nz("<b>CORE SKILLS</b>"), s["section"]))
+    story.append(RichText().bold("CORE SKILLS").paragraph(s["section"]))
     skills_text = " · ".join(DATA.get("core_skills", []))
-    story.append(Paragraph(nz(skills_text), s["body_left"]))
+    story.append(RichText(nz(skills_text)).paragraph(s["body_left"]))
     
     # Experience
-    story.append(Paragraph(nz("<b>EXPERIENCE</b>"), s["section"]))
+    story.append(RichText().bold("EXPERIENCE").paragraph(s["section"]))
     for job in DATA.get("experience", []):
         header = f'{job["company"]} — {job["role"]}'
         meta = f'{job.get("dates", "")} | {job.get("location", "")}'
         
-        story.append(Paragraph(nz(header), s["subsection"]))
-        story.append(Paragraph(nz(meta), s["meta_text"]))
+        story.append(RichText(nz(header)).paragraph(s["subsection"]))
+        story.append(RichText(nz(meta)).paragraph(s["meta_text"]))
         
         # Bullets as paragraphs (no bullet points in academic style)
         for b in job.get("bullets", []):
-            story.append(Paragraph(nz(b), s["body_left"]))
+            story.append(RichText(nz(b)).paragraph(s["body_left"]))
         
         story.append(Spacer(1, 2*mm))
     
     # Education
-    story.append(Paragraph(nz("<b>EDUCATION</b>"), s["section"]))
+    story.append(RichText().bold("EDUCATION").paragraph(s["section"]))
     for e in DATA.get("education", []):
-        story.append(Paragraph(nz(e), s["body_left"]))
+        story.append(RichText(nz(e)).paragraph(s["body_left"]))
+    
+    return story
+
+
+def build_pdf(path="CV_Resume.pdf", profile="default"):
+    """Generates CV in academic style"""
+    margins = get_academic_margins()
+    
+    doc = SimpleDocTemplate(
+        path,
+        pagesize=A4,
+        **margins,
+        **get_output_options(profile)
+    )
+    
+    s = get_academic_styles()
+    
+    story = build_story(s)
     
-    doc.build(story)
+    build_letter(doc, prepare_story(story))
+    finalize_output(path, profile)
     print(f"✅ Generated: {path}  (font={BASE_FONT})")
 
 
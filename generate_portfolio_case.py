@@ -8,7 +8,7 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Page
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER
 from reportlab.lib.styles import ParagraphStyle
-import unicodedata, datetime, os, random
+import unicodedata, datetime, os, io, random
 
 # Import academic styles
 from academic_styles import (
@@ -17,11 +17,16 @@ from academic_styles import (
     format_academic_url_link,
     format_academic_simple_url,
     format_academic_email_link,
+    academic_font,
+    prepare_story,
     BASE_FONT,
     BOLD_FONT,
     TEXT_COLOR,
     META_COLOR
 )
+from pdf_output import get_output_options, finalize_output
+from image_loader import PIL_AVAILABLE, ImageLoader, PrefetchedImage
+import academic_styles
 
 
 # ---------- Helpers ----------
@@ -38,15 +43,13 @@ def nz(s: str) -> str:
 
 
 def create_placeholder_image(width, height, base_path=None):
-    """Creates a placeholder image using PIL/Pillow"""
+    """Creates a placeholder image using PIL/Pillow (in memory unless base_path is given)"""
     try:
         from PIL import Image as PILImage, ImageDraw, ImageFont
-        import tempfile
         
         if base_path is None:
-            # Create temporary file with absolute path
-            fd, path = tempfile.mkstemp(suffix='.png', prefix='placeholder_')
-            os.close(fd)
+            # Keep in memory, so no temporary files need cleanup
+            path = io.BytesIO()
         else:
             path = os.path.abspath(base_path)
         
@@ -74,7 +77,9 @@ def create_placeholder_image(width, height, base_path=None):
             font=font
         )
         
-        img.save(path)
+        img.save(path, format='PNG')
+        if base_path is None:
+            path.seek(0)
         return path
     except ImportError:
         # If PIL not available, return None (image will be skipped)
@@ -84,9 +89,26 @@ def create_placeholder_image(width, height, base_path=None):
         return None
 
 
-def add_image_with_caption(story, image_path, caption, styles, max_width=160*mm, placeholder_files=None):
-    """Adds image with caption in academic style"""
+def prefetch_image(loader, image_path, max_width=160*mm):
+    """Starts loading image (or its placeholder) in the loader's threads, returns the future"""
     if image_path and os.path.exists(image_path):
+        return loader.load(image_path)
+    return loader.submit(("placeholder", max_width), lambda: create_placeholder_image(max_width, max_width * 0.6))
+
+
+def add_image_with_caption(story, image_path, caption, styles, max_width=160*mm, loader=None):
+    """Adds image with caption in academic style (drawn from the loader's prefetched
+    images if a loader is given)"""
+    if loader is not None:
+        real = image_path and os.path.exists(image_path)
+        img = PrefetchedImage(prefetch_image(loader, image_path, max_width), max_width,
+                              None if real else max_width * 0.6)
+        story.append(Spacer(1, 4*mm))
+        story.append(img)
+        story.append(Spacer(1, 2*mm))
+        story.append(Paragraph(f'<i>{nz(caption)}</i>', styles["caption"]))
+        story.append(Spacer(1, 4*mm))
+    elif image_path and os.path.exists(image_path):
         # Load image and scale proportionally
         try:
             from PIL import Image as PILImage
@@ -126,9 +148,6 @@ def add_image_with_caption(story, image_path, caption, styles, max_width=160*mm,
             )
             story.append(caption_para)
             story.append(Spacer(1, 4*mm))
-            # Track placeholder files for cleanup
-            if placeholder_files is not None:
-                placeholder_files.append(placeholder_path)
 
 
 # ========== CONFIGURATION: Replace with your data ==========
@@ -196,25 +215,15 @@ IMAGES = [
 
 # ---------- Build PDF with Academic Style ----------
 
-def build_pdf(path="Portfolio_Case_Study.pdf"):
-    """Generates PDF in academic style with images"""
-    margins = get_academic_margins()
-    
-    doc = SimpleDocTemplate(
-        path,
-        pagesize=A4,
-        **margins
-    )
-    
-    s = get_academic_styles()
-    
+def build_story(s):
+    """Returns story (list of flowables) in academic style with images"""
     # Add caption style for images
     from reportlab.lib.styles import getSampleStyleSheet
     base = getSampleStyleSheet()
     s["caption"] = ParagraphStyle(
         "caption",
         parent=base["Normal"],
-        fontName=BASE_FONT,
+        fontName=academic_font(BASE_FONT),
         fontSize=9,
         leading=11,
         textColor=META_COLOR,
@@ -223,8 +232,13 @@ def build_pdf(path="Portfolio_Case_Study.pdf"):
         fontStyle='Italic'
     )
     
+    # Start reading and decoding every image now; the text below is assembled meanwhile
+    loader = ImageLoader() if academic_styles.IMAGE_PREFETCH and PIL_AVAILABLE else None
+    if loader is not None:
+        for image in IMAGES:
+            prefetch_image(loader, image["path"])
+    
     story = []
-    placeholder_files = []  # Track placeholder files for cleanup
     
     # Title
     story.append(Paragraph(nz(CASE_TITLE), s["title"]))
@@ -250,7 +264,7 @@ def build_pdf(path="Portfolio_Case_Study.pdf"):
     
     # Add first image
     if IMAGES:
-        add_image_with_caption(story, IMAGES[0]["path"], IMAGES[0]["caption"], s, placeholder_files=placeholder_files)
+        add_image_with_caption(story, IMAGES[0]["path"], IMAGES[0]["caption"], s, loader=loader)
     
     # Methods
     story.append(Paragraph(nz("<b>2. Methods</b>"), s["section"]))
@@ -259,7 +273,7 @@ def build_pdf(path="Portfolio_Case_Study.pdf"):
     
     # Add second image
     if len(IMAGES) > 1:
-        add_image_with_caption(story, IMAGES[1]["path"], IMAGES[1]["caption"], s, placeholder_files=placeholder_files)
+        add_image_with_caption(story, IMAGES[1]["path"], IMAGES[1]["caption"], s, loader=loader)
     
     # Results
     story.append(Paragraph(nz("<b>3. Results</b>"), s["section"]))
@@ -268,22 +282,36 @@ def build_pdf(path="Portfolio_Case_Study.pdf"):
     
     # Add third image
     if len(IMAGES) > 2:
-        add_image_with_caption(story, IMAGES[2]["path"], IMAGES[2]["caption"], s, placeholder_files=placeholder_files)
+        add_image_with_caption(story, IMAGES[2]["path"], IMAGES[2]["caption"], s, loader=loader)
     
     # Discussion
     story.append(Paragraph(nz("<b>4. Discussion</b>"), s["section"]))
     story.append(Paragraph(nz(DISCUSSION), s["body"]))
     
-    doc.build(story)
+    # Further images (a portfolio book) follow the discussion
+    for image in IMAGES[3:]:
+        add_image_with_caption(story, image["path"], image["caption"], s, loader=loader)
     
-    # Clean up placeholder files
-    for placeholder_file in placeholder_files:
-        try:
-            if os.path.exists(placeholder_file):
-                os.remove(placeholder_file)
-        except Exception as e:
-            print(f"Warning: Could not remove placeholder file {placeholder_file}: {e}")
+    return story
+
+
+def build_pdf(path="Portfolio_Case_Study.pdf", profile="default"):
+    """Generates PDF in academic style with images"""
+    margins = get_academic_margins()
+    
+    doc = SimpleDocTemplate(
+        path,
+        pagesize=A4,
+        **margins,
+        **get_output_options(profile)
+    )
+    
+    s = get_academic_styles()
+    
+    story = build_story(s)
     
+    doc.build(prepare_story(story))
+    finalize_output(path, profile)
     print(f"✅ Generated: {path}  (font={BASE_FONT})")
 
 
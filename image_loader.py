@@ -0,0 +1,200 @@
+# image_loader.py
+# Concurrent prefetch and decode of the images of a document
+#
+# reportlab reads and decodes an image (and compresses it into a PDF image XObject)
+# only when the page it is on is drawn: one image at a time, in the thread building
+# the document, after the whole story has been assembled and laid out. An ImageLoader
+# starts loading every image of a document in a shared thread pool as soon as story
+# assembly begins: reading the file, decoding it and building its XObject (PIL and
+# zlib release the GIL, so images decode in parallel). PrefetchedImage flowables are
+# laid out from the loaded image's size and draw the XObject the loader built, so an
+# image is decoded once; sources a document uses twice (the same file, equal
+# placeholders) are loaded once.
+#
+# XObjects are named as canvas.drawImage() names them, so documents come out the same
+# as with reportlab's Image flowable.
+#
+# Without reportlab's C accelerator (rl_accel), ASCII85 encoding of the compressed
+# pixels takes most of the time of an image, in pure Python holding the GIL.
+# use_fast_ascii85() has reportlab use the standard library's encoder instead, which
+# gives the same text about three times faster; it changes reportlab for the whole
+# process, so it is left to the application to call.
+
+import base64
+import concurrent.futures
+import copy
+import os
+import threading
+import warnings
+
+from reportlab.lib import rl_accel
+from reportlab.lib.utils import ImageReader, _digester
+from reportlab.pdfbase import pdfdoc, pdfutils
+from reportlab.platypus import Flowable
+
+try:
+    import PIL  # noqa: F401  (reportlab decodes everything but JPEG files with it)
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+JPEG_EXTENSIONS = (".jpg", ".JPG", ".jpeg", ".JPEG")  # embedded without decoding, as by reportlab's Image
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+# ---------- Loading ----------
+
+def _ascii_base85_encode(data):
+    """rl_accel.asciiBase85Encode(), through base64.a85encode()"""
+    if isinstance(data, str):
+        data = data.encode("latin-1")
+    return base64.a85encode(data).decode("latin-1") + "~>"
+
+
+def use_fast_ascii85():
+    """Has reportlab ASCII85-encode (all PDF streams of this process) with the standard
+    library; returns False if it already uses a compiled or faster encoder"""
+    if pdfdoc.asciiBase85Encode is not rl_accel._py_asciiBase85Encode:
+        return False
+    pdfdoc.asciiBase85Encode = _ascii_base85_encode
+    return True
+
+
+class LoadedImage:
+    """Image as a PDF image XObject, with its name and size in pixels"""
+
+    __slots__ = ("name", "width", "height", "xobject")
+
+    def __init__(self, xobject):
+        self.name = xobject.name
+        self.width, self.height = xobject.width, xobject.height
+        self.xobject = xobject
+
+
+def _is_jpeg(path):
+    if os.path.splitext(path)[1] not in JPEG_EXTENSIONS:
+        return False
+    try:
+        with open(path, "rb") as f:
+            pdfutils.readJPEGInfo(f)
+        return True
+    except Exception:
+        return False
+
+
+def load_image(source, mask="auto"):
+    """LoadedImage of an image file name, file object or PIL image: named and built as
+    canvas.drawImage() does for an Image flowable of the same source"""
+    if isinstance(source, str) and _is_jpeg(source):
+        name = _digester(f"{source}{mask}".encode("utf-8"))
+        return LoadedImage(pdfdoc.PDFImageXObject(name, source, mask=mask))
+    reader = ImageReader(source)
+    rawdata = reader.getRGBData()
+    smask = reader._dataA
+    mdata = smask.getRGBData() if mask == "auto" and smask else str(mask).encode("utf-8")
+    return LoadedImage(pdfdoc.PDFImageXObject(_digester(rawdata + mdata), reader, mask=mask))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    """Thread pool shared by all loaders (and documents rendered in threads)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = concurrent.futures.ThreadPoolExecutor(MAX_WORKERS, thread_name_prefix="image-loader")
+        return _pool
+
+
+class ImageLoader:
+    """Images of one document, loaded in the shared thread pool: {key: future LoadedImage}"""
+
+    def __init__(self):
+        self._futures = {}
+
+    def submit(self, key, make_source, mask="auto"):
+        """Future LoadedImage of the image make_source() returns (in a pool thread),
+        loaded once per key"""
+        if key not in self._futures:
+            self._futures[key] = _executor().submit(lambda: load_image(make_source(), mask))
+        return self._futures[key]
+
+    def load(self, path, mask="auto"):
+        """Future LoadedImage of image file path"""
+        return self.submit(("file", path, mask), lambda: path, mask)
+
+
+# ---------- Drawing ----------
+
+def draw_loaded_image(canv, image, x, y, width, height):
+    """Draws LoadedImage image scaled to width x height at (x, y), as canvas.drawImage();
+    the XObject is added to the canvas's document the first time"""
+    canv._currentPageHasImages = 1
+    doc = canv._doc
+    reg_name = doc.getXObjectName(image.name)
+    if not doc.idToObject.get(reg_name, None):
+        # Registering sets attributes on the XObjects: a copy per document
+        xobject = copy.copy(image.xobject)
+        canv._setXObjects(xobject)
+        doc.Reference(xobject, reg_name)
+        doc.addForm(image.name, xobject)
+        smask = getattr(xobject, "_smask", None)
+        if smask:
+            m_reg_name = doc.getXObjectName(smask.name)
+            if not doc.idToObject.get(m_reg_name, None):
+                smask = copy.copy(smask)
+                canv._setXObjects(smask)
+                xobject.smask = doc.Reference(smask, m_reg_name)
+            else:
+                xobject.smask = pdfdoc.PDFObjectReference(m_reg_name)
+            del xobject._smask
+    canv.saveState()
+    canv.translate(x, y)
+    canv.scale(width, height)
+    canv._code.append(f"/{reg_name} Do")
+    canv.restoreState()
+    canv._formsinuse.append(image.name)
+
+
+class PrefetchedImage(Flowable):
+    """Image flowable for a future LoadedImage. Without a height it is scaled to width
+    by the image's aspect ratio, which waits for the image to load (at layout, not
+    when the story is assembled). An image that fails to load takes no space (unlike
+    with add_image_with_caption() without a loader, its caption stays); its exception
+    is kept as error and reported as a RuntimeWarning, which, unlike printing, reaches
+    stderr intact from render threads and from renders with stdout redirected."""
+
+    def __init__(self, future, width, height=None, hAlign="CENTER"):
+        Flowable.__init__(self)
+        self._future = future
+        self.drawWidth = width
+        self.drawHeight = height
+        self.hAlign = hAlign
+        self._image = None
+        self.error = None
+
+    def _loaded(self):
+        if self._image is None:
+            try:
+                self._image = self._future.result()
+            except Exception as e:
+                self.error, self._image = e, False
+                warnings.warn(f"Could not load image: {e}", RuntimeWarning)
+        return self._image
+
+    def wrap(self, availWidth, availHeight):
+        image = self._loaded()
+        if not image:
+            return 0, 0
+        if self.drawHeight is None:
+            self.drawHeight = self.drawWidth * (image.height / image.width)
+        return self.drawWidth, self.drawHeight
+
+    def draw(self):
+        image = self._loaded()
+        if image:
+            draw_loaded_image(self.canv, image, getattr(self, "_offs_x", 0), getattr(self, "_offs_y", 0),
+                              self.drawWidth, self.drawHeight)
@@ -0,0 +1,168 @@
+# job_match.py
+# Job description keyword matching: TF-IDF scores for CV bullets and skills
+#
+# All CV items (bullets, AI impact lines, skills) and all job postings are turned
+# into TF-IDF vectors and scored in one batched computation: postings form a dense
+# matrix over the terms they use, items are stored sparse, and every
+# (item, posting) cosine similarity comes out of a single gather + reduceat pass.
+
+# pip install numpy
+
+import copy
+import math
+from collections import Counter
+
+import numpy as np
+
+from keywords import tokenize
+
+
+SECTION_LIMITS = {"ai_impact": 3, "core_skills": 5, "bullets": 3}
+
+
+# ---------- TF-IDF Scoring ----------
+
+def _weights(counts, idf):
+    """Sublinear TF-IDF weights and their L2 norm for one document"""
+    weights = {t: (1 + math.log(c)) * idf[t] for t, c in counts.items()}
+    return weights, math.sqrt(sum(w * w for w in weights.values())) or 1.0
+
+
+def score_matrix(items, postings, ngrams=2, chunk=4096):
+    """Cosine similarities of TF-IDF vectors, shape (len(items), len(postings)).
+
+    IDF is computed over items and postings together. Items are processed in chunks
+    of `chunk` to bound the (nonzeros x postings) temporary.
+    """
+    item_counts = [Counter(tokenize(t, ngrams)) for t in items]
+    posting_counts = [Counter(tokenize(t, ngrams)) for t in postings]
+    df = Counter()
+    for counts in item_counts + posting_counts:
+        df.update(counts.keys())
+    n_docs = len(items) + len(postings)
+    idf = {t: math.log((1 + n_docs) / (1 + d)) + 1 for t, d in df.items()}
+
+    # Only terms that appear in some posting can contribute to a score
+    vocab = {}
+    rows, cols, vals = [], [], []
+    for p, counts in enumerate(posting_counts):
+        weights, norm = _weights(counts, idf)
+        for t, w in weights.items():
+            rows.append(p)
+            cols.append(vocab.setdefault(t, len(vocab)))
+            vals.append(w / norm)
+    posting_terms = np.zeros((len(vocab), len(postings)), dtype=np.float32)
+    posting_terms[cols, rows] = vals
+
+    # Items as CSR: indptr, term columns and weights (normalized over all their terms)
+    indptr, indices, data = [0], [], []
+    for counts in item_counts:
+        weights, norm = _weights(counts, idf)
+        for t, w in weights.items():
+            col = vocab.get(t)
+            if col is not None:
+                indices.append(col)
+                data.append(w / norm)
+        indptr.append(len(indices))
+    indptr = np.array(indptr)
+    indices = np.array(indices, dtype=np.intp)
+    data = np.array(data, dtype=np.float32)
+
+    scores = np.zeros((len(items), len(postings)), dtype=np.float32)
+    for start in range(0, len(items), chunk):
+        stop = min(start + chunk, len(items))
+        lo, hi = indptr[start], indptr[stop]
+        if lo == hi:
+            continue
+        products = data[lo:hi, None] * posting_terms[indices[lo:hi]]
+        offsets = indptr[start:stop] - lo
+        nonempty = indptr[start + 1:stop + 1] > indptr[start:stop]
+        # reduceat needs strictly valid offsets: sum only rows that have terms
+        scores[start:stop][nonempty] = np.add.reduceat(products, offsets[nonempty], axis=0)
+    return scores
+
+
+# ---------- CV Tailoring ----------
+
+def cv_items(data):
+    """Flattens CV DATA into [(key, text), ...]; keys locate the item in DATA"""
+    items = [(("ai_impact", i), t) for i, t in enumerate(data.get("ai_impact", []))]
+    items += [(("core_skills", i), t) for i, t in enumerate(data.get("core_skills", []))]
+    for j, job in enumerate(data.get("experience", [])):
+        items += [(("experience", j, i), t) for i, t in enumerate(job.get("bullets", []))]
+    return items
+
+
+def _top(scored, limit):
+    """Indexes of the `limit` best (index, score) pairs, best first; ties keep DATA order"""
+    return [i for i, _ in sorted(scored, key=lambda x: -x[1])[:limit]]
+
+
+def tailor_data(data, scores, keys, limits=None):
+    """Returns copy of DATA with items ranked by score and cut to section limits"""
+    limits = dict(SECTION_LIMITS, **(limits or {}))
+    by_key = dict(zip(keys, scores))
+    out = copy.deepcopy(data)
+    for section in ("ai_impact", "core_skills"):
+        if section in data:
+            scored = [(i, by_key[(section, i)]) for i in range(len(data[section]))]
+            out[section] = [data[section][i] for i in _top(scored, limits[section])]
+    for j, job in enumerate(data.get("experience", [])):
+        scored = [(i, by_key[("experience", j, i)]) for i in range(len(job.get("bullets", [])))]
+        out["experience"][j]["bullets"] = [job["bullets"][i] for i in _top(scored, limits["bullets"])]
+    return out
+
+
+def tailor_many(data, postings, limits=None):
+    """Tailored DATA for every posting; all postings are scored in one batch"""
+    items = cv_items(data)
+    keys = [key for key, _ in items]
+    scores = score_matrix([text for _, text in items], postings)
+    return [tailor_data(data, scores[:, p], keys, limits) for p in range(len(postings))]
+
+
+def ranked_items(data, posting):
+    """[(score, key, text), ...] of all CV items for one posting, best first"""
+    items = cv_items(data)
+    scores = score_matrix([text for _, text in items], [posting])[:, 0]
+    return sorted(((float(s), key, text) for s, (key, text) in zip(scores, items)), key=lambda x: -x[0])
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import time
+
+    from templates import load_template, render_template
+
+    parser = argparse.ArgumentParser(description="Score CV bullets against job postings and render tailored CVs")
+    parser.add_argument("postings", nargs="+", help="job description text files")
+    parser.add_argument("--template", default="cv", choices=["cv", "cv_classic"], help="CV template with DATA")
+    parser.add_argument("--render", action="store_true", help="render one tailored CV per posting")
+    parser.add_argument("-o", "--out-dir", default=".")
+    for section, limit in SECTION_LIMITS.items():
+        parser.add_argument(f"--{section.replace('_', '-')}", type=int, default=limit,
+                            help=f"items kept per {'job' if section == 'bullets' else 'section'} (default: {limit})")
+    args = parser.parse_args()
+
+    data = load_template(args.template).DATA
+    postings = []
+    for path in args.postings:
+        with open(path, encoding="utf-8") as f:
+            postings.append(f.read())
+    limits = {section: getattr(args, section) for section in SECTION_LIMITS}
+
+    start = time.perf_counter()
+    tailored = tailor_many(data, postings, limits)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Scored {len(cv_items(data))} items against {len(postings)} posting(s) in {elapsed:.1f} ms")
+    if args.render:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    for path, posting, cv in zip(args.postings, postings, tailored):
+        print(f"\n{path}")
+        for score, key, text in ranked_items(data, posting)[:8]:
+            print(f"  {score:.3f}  {key[0]:<12} {text}")
+        if args.render:
+            name = os.path.splitext(os.path.basename(path))[0]
+            render_template(args.template, os.path.join(args.out_dir, f"CV_{name}.pdf"), DATA=cv)
@@ -0,0 +1,220 @@
+# kerning.py
+# Pairwise kerning for the academic TrueType fonts
+#
+# reportlab sets TrueType text from advance widths only, so pairs like "Te", "Yo" or
+# "AV" keep their full side bearings, which shows most in the large title. kern_table()
+# reads the font's legacy 'kern' table once (format 0 pairs of glyphs, in font units)
+# into a compact lookup of character pairs in 1/1000 em, kept on the font's face, so
+# every font registered from the same file shares it.
+#
+# kerned_font(name) registers "<name>-Kerned", a font whose stringWidth adds the pair
+# adjustments. kern_story() switches a story's paragraphs to subclasses that draw
+# through KernedTextObject, which sets kerned fonts' text as TJ arrays with the same
+# adjustments, so measured and drawn widths agree; reportlab's own text objects (and
+# documents without kerning) are left as they are. A kerned font shares the glyph
+# subsets of the plain font: a PDF that uses both embeds the font once. Pairs with a
+# space are left out, as paragraphs measure words and spaces separately. Fonts
+# without a 'kern' table (and the standard Type 1 fonts) are returned unchanged.
+
+import copy
+import functools
+import struct
+import threading
+from itertools import repeat
+from operator import add
+
+from reportlab.lib.rl_accel import fp_str
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, instanceStringWidthTTF
+from reportlab.pdfgen.textobject import PDFTextObject, ShapedStr
+from reportlab.platypus import Paragraph
+
+
+KERNED_SUFFIX = "-Kerned"
+
+HORIZONTAL = 0x1  # kern subtable coverage bits
+MINIMUM = 0x2
+CROSS_STREAM = 0x4
+OVERRIDE = 0x8
+
+
+# ---------- Kerning Table ----------
+
+class KernTable:
+    """Kerning pairs of a font: {two characters: adjustment in 1/1000 em}, plus the
+    characters that start a pair. Totals are cached per text (words repeat)."""
+
+    def __init__(self, pairs):
+        self.pairs = pairs
+        self.firsts = frozenset(pair[0] for pair in pairs)
+        self.total = functools.lru_cache(maxsize=65536)(self._total)
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def adjustments(self, text):
+        """[(index, adjustment), ...]: kerning before text[index]"""
+        pairs, firsts = self.pairs, self.firsts
+        return [(i + 1, pairs[text[i:i + 2]]) for i, c in enumerate(text[:-1])
+                if c in firsts and text[i:i + 2] in pairs]
+
+    def _total(self, text):
+        """Sum of the pair adjustments of text (1/1000 em)"""
+        if len(text) < 2 or self.firsts.isdisjoint(text):
+            return 0
+        return sum(map(self.pairs.get, map(add, text, text[1:]), repeat(0)))
+
+
+def _read_pairs(face):
+    """{(left glyph, right glyph): value in font units} of the face's 'kern' table"""
+    if "kern" not in face.table:
+        return {}
+    data = face.get_table("kern")
+    version, count = struct.unpack_from(">HH", data)
+    if version != 0:
+        return {}  # Apple's 32-bit 'kern' format is not read
+    values, pos = {}, 4
+    for _ in range(count):
+        _, length, coverage = struct.unpack_from(">HHH", data, pos)
+        if coverage >> 8 == 0 and coverage & (HORIZONTAL | MINIMUM | CROSS_STREAM) == HORIZONTAL:
+            n = struct.unpack_from(">H", data, pos + 6)[0]
+            for left, right, value in struct.iter_unpack(">HHh", data[pos + 14:pos + 14 + 6 * n]):
+                if coverage & OVERRIDE:
+                    values[left, right] = value
+                else:
+                    values[left, right] = values.get((left, right), 0) + value
+        pos += length
+    return values
+
+
+def kern_table(face):
+    """The face's KernTable, read from its 'kern' table on first use"""
+    table = getattr(face, "_kern_table", None)
+    if table is None:
+        scale = 1000 / face.unitsPerEm
+        chars = face.glyphToChar
+        pairs = {}
+        for (left, right), value in _read_pairs(face).items():
+            if not value:
+                continue
+            for a in chars.get(left, ()):
+                for b in chars.get(right, ()):
+                    if not (chr(a).isspace() or chr(b).isspace()):
+                        pairs[chr(a) + chr(b)] = round(value * scale, 3)
+        table = face._kern_table = KernTable(pairs)
+    return table
+
+
+# ---------- Kerned Fonts ----------
+
+class KernedTTFont(TTFont):
+    """A TTFont with kerning: same glyphs, subsets and embedding as the plain font,
+    under a copy of its face named after the kerned font (reportlab registers one
+    font per face name)"""
+
+    def __init__(self, name, font):
+        self.__dict__.update(font.__dict__)
+        self.face = copy.copy(font.face)
+        self.face.name = font.face.name + KERNED_SUFFIX.encode()
+        self.fontName = name
+        self.plain = font
+        self.kerning = kern_table(font.face)
+        self._kern_total = self.kerning.total
+        self.shapable = False
+
+    def stringWidth(self, text, size, encoding="utf8"):
+        if isinstance(text, bytes):
+            text = text.decode(encoding)
+        kern = self._kern_total(text)
+        width = instanceStringWidthTTF(self, text, size, encoding)
+        return width + kern * size * 0.001 if kern else width
+
+    def splitString(self, text, doc, encoding="utf-8"):
+        return self.plain.splitString(text, doc, encoding)
+
+    def getSubsetInternalName(self, subset, doc):
+        return self.plain.getSubsetInternalName(subset, doc)
+
+    def addObjects(self, doc):
+        self.plain.addObjects(doc)
+
+
+_register_lock = threading.Lock()
+
+
+def kerned_font(name):
+    """Name of the kerned variant of registered font name (registered on first use),
+    or name itself if the font has no kerning pairs"""
+    kerned = name + KERNED_SUFFIX
+    if kerned in pdfmetrics.getRegisteredFontNames():
+        return kerned
+    with _register_lock:  # one kerned font per name, also when threads ask at once
+        if kerned in pdfmetrics.getRegisteredFontNames():
+            return kerned
+        font = pdfmetrics.getFont(name)
+        if not isinstance(font, TTFont) or not kern_table(font.face):
+            return name
+        kerned_ttf = KernedTTFont(kerned, font)
+        pdfmetrics.registerFont(kerned_ttf)
+    return kerned
+
+
+# ---------- Drawing ----------
+
+class KernedTextObject(PDFTextObject):
+    """Text object setting text in kerned fonts as TJ arrays with the kerning between
+    its characters (text in other fonts as PDFTextObject does)"""
+
+    def _formatText(self, text):
+        font = pdfmetrics.getFont(self._fontname)
+        if not isinstance(font, KernedTTFont) or isinstance(text, ShapedStr):
+            return PDFTextObject._formatText(self, text)
+        if isinstance(text, bytes):
+            text = text.decode("utf-8")
+        canv = self._canvas
+        kerns = font.kerning.adjustments(text)
+        code, start, k = [], 0, 0
+        for subset, chunk in font.splitString(text, canv._doc):
+            if subset != self._curSubset:
+                code.append(f"{font.getSubsetInternalName(subset, canv._doc)} "
+                            f"{fp_str(self._fontsize)} Tf {fp_str(self._leading)} TL")
+                self._curSubset = subset
+            end = start + len(chunk)
+            items, run = [], start
+            while k < len(kerns) and kerns[k][0] < end:
+                i, value = kerns[k]
+                if i > run:
+                    items.append(f"({canv._escape(chunk[run - start:i - start])})")
+                items.append(fp_str(-value))
+                run, k = i, k + 1
+            items.append(f"({canv._escape(chunk[run - start:])})")
+            code.append(f"[{' '.join(items)}] TJ" if len(items) > 1 else f"{items[0]} Tj")
+            start = end
+        return " ".join(code)
+
+
+def _begin_kerned_text(self, x, y):
+    return KernedTextObject(self.canv, x, y)
+
+
+_KERNED_CLASSES = {}
+
+
+def kerned_class(cls):
+    """Subclass of Paragraph class cls drawing its lines through KernedTextObject
+    (split parts keep it: Paragraph.split() makes instances of self.__class__)"""
+    if cls not in _KERNED_CLASSES:
+        _KERNED_CLASSES[cls] = type("Kerned" + cls.__name__, (cls,),
+                                    {"beginText": _begin_kerned_text, "_kerned_base": cls})
+    return _KERNED_CLASSES[cls]
+
+
+def kern_story(story):
+    """Switches the story's paragraphs to kerned drawing, in place"""
+    for flowable in story:
+        if isinstance(flowable, Paragraph):
+            if "_kerned_base" not in type(flowable).__dict__:
+                flowable.__class__ = kerned_class(type(flowable))
+        elif isinstance(getattr(flowable, "_content", None), list):
+            kern_story(flowable._content)
+    return story
@@ -0,0 +1,36 @@
+# keywords.py
+# Keyword extraction shared by job matching and the bullet bank
+#
+# Lowercased words without stopwords, with light suffix stemming so that
+# "designed", "designing" and "designs" all become "design", plus word n-grams.
+
+import re
+
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being but by can could did do does
+for from had has have having he her here him his how i if in into is it its just may me more
+most must my no nor not of on once only or other our out over own per same she should so some
+such than that the their them then there these they this those through to too under until up
+very was we were what when where which while who whom why will with would you your yours
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[/+#][a-z0-9+#]*)*")
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+
+def _stem(word):
+    """Strips common English suffixes so "designed", "designing" and "designs" match"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text, ngrams=2):
+    """Lowercased, stemmed terms without stopwords, plus word n-grams up to `ngrams`"""
+    words = [_stem(w) for w in _TOKEN_RE.findall(text.lower()) if w not in STOPWORDS]
+    terms = list(words)
+    for n in range(2, ngrams + 1):
+        terms += [" ".join(words[i:i + n]) for i in range(len(words) - n + 1)]
+    return terms
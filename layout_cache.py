@@ -0,0 +1,196 @@
+# layout_cache.py
+# Cross-document paragraph layout cache
+#
+# In a mail merge most paragraphs repeat from document to document: the name title,
+# the LINKS meta line, the sign-off and every body paragraph the merge leaves alone.
+# Line breaking restarts at every hard break (<br/>), so the lines of each block of
+# a paragraph depend only on its text fragments, the style and the available width.
+# Blocks are wrapped once per process and their lines are reused by later documents.
+#
+# The cache is an LRU bounded by the number of blocks, with hit-rate statistics.
+# Only the paragraph text (after markup parsing) and style values go into the keys,
+# so new style objects built for every document still hit.
+
+import threading
+from collections import OrderedDict
+
+from reportlab.platypus import Paragraph
+from reportlab.platypus.paragraph import ParaLines, _processed_frags
+
+
+DEFAULT_SIZE = 4096  # blocks; a letter body has 10-20
+
+
+# ---------- LRU ----------
+
+class LayoutCache:
+    """LRU of wrapped paragraph blocks: key -> (lines, frags, widest line)"""
+
+    def __init__(self, maxsize=DEFAULT_SIZE):
+        if maxsize < 1:
+            raise ValueError(f"Cache size must be at least 1: {maxsize}")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self), "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+    def format_stats(self):
+        s = self.stats()
+        return (f"layout cache: {s['hits']} hits, {s['misses']} misses ({s['hit_rate']:.1%} hit rate), "
+                f"{s['size']}/{s['maxsize']} blocks, {s['evictions']} evictions")
+
+
+LAYOUT_CACHE = LayoutCache()  # shared by every document rendered in this process
+
+
+# ---------- Keys ----------
+
+def _value_key(value):
+    return value if isinstance(value, (str, int, float, bool, type(None))) else repr(value)
+
+
+def style_key(style):
+    """Hashable key of a ParagraphStyle's values (its name and parent don't matter)"""
+    return tuple(sorted((k, _value_key(v)) for k, v in style.__dict__.items() if k not in ("name", "parent")))
+
+
+def _frag_key(frag):
+    return tuple(sorted((k, _value_key(v)) for k, v in frag.__dict__.items()))
+
+
+def _blocks(frags):
+    """Parsed fragments split after hard breaks, at least two per block: reportlab
+    lays out a single fragment differently (kind 0 lines), which can't be combined"""
+    blocks, block = [], []
+    for f in frags:
+        block.append(f)
+        if getattr(f, "lineBreak", False) and len(block) > 1:
+            blocks.append(block)
+            block = []
+    if block:
+        if blocks and len(block) == 1:
+            blocks[-1] += block
+        else:
+            blocks.append(block)
+    return blocks
+
+
+# ---------- Paragraphs ----------
+
+class _CachedLayout:
+    """Mixin for Paragraph classes: line breaking goes through the layout cache"""
+
+    layout_cache = None  # None: LAYOUT_CACHE
+
+    def breakLines(self, width):
+        return self._cached_break(width, "breakLines")
+
+    def breakLinesCJK(self, width):
+        return self._cached_break(width, "breakLinesCJK")
+
+    def _cached_break(self, width, method):
+        base = self._layout_base
+        widths = list(width) if isinstance(width, (list, tuple)) else [width]
+        style = self.style
+        if (getattr(self, "_splitpara", 0) or self.text is None or self.bulletText or not self.frags
+                or _processed_frags(self.frags) or len(widths) > 2
+                or (style.wordWrap or "").upper() in ("RTL", "LTR")):
+            return getattr(base, method)(self, width)  # split parts, bullets and bidi text are wrapped as usual
+
+        cache = self.layout_cache or LAYOUT_CACHE
+        common = (base, method, style_key(style), getattr(self, "autoLeading", None))
+        blocks = _blocks(self.frags)
+        entries = []
+        for i, block in enumerate(blocks):
+            block_widths = (widths[0], widths[-1]) if i == 0 else (widths[-1], widths[-1])
+            key = (common, block_widths, tuple(_frag_key(f) for f in block))
+            entry = cache.get(key)
+            if entry is None:
+                part = base(None, style, frags=list(block))
+                entry = (getattr(part, method)(list(block_widths)), part.frags, getattr(part, "_width_max", 0))
+                cache.put(key, entry)
+            entries.append(entry)
+
+        if len(entries) == 1:
+            para_lines, frags, self._width_max = entries[0]
+            self.frags = [w.__class__(w) for w in frags] if _processed_frags(frags) else list(frags)
+            return para_lines
+        lines, frags = [], []
+        for para_lines, block_frags, _ in entries:
+            if _processed_frags(block_frags):
+                # Lines point into the paragraph's word list; copy the words split() may modify
+                offset = len(frags)
+                lines += [line.clone(sFW=line.sFW + offset) if hasattr(line, "sFW") else line
+                          for line in para_lines.lines]
+                frags += [w.__class__(w) for w in block_frags]
+            else:
+                lines += para_lines.lines
+                frags += block_frags
+        self.frags = frags
+        self._width_max = max(width_max for _, _, width_max in entries)
+        return ParaLines(kind=1, lines=lines)
+
+    def split(self, availWidth, availHeight):
+        # reportlab's split appends spaces to the words of the lines it splits at, and
+        # cached lines are shared with other documents: split a private copy
+        if not hasattr(self, "blPara"):
+            self.wrap(availWidth, availHeight)
+        if self.blPara.kind == 1:
+            self.blPara = ParaLines(kind=1, lines=[line.clone(words=[w.clone() for w in line.words])
+                                                   for line in self.blPara.lines])
+        return super().split(availWidth, availHeight)
+
+
+_CACHED_CLASSES = {}
+
+
+def cached_class(cls):
+    """Subclass of a Paragraph class whose line breaking goes through the layout cache"""
+    if cls not in _CACHED_CLASSES:
+        _CACHED_CLASSES[cls] = type("Cached" + cls.__name__, (_CachedLayout, cls), {"_layout_base": cls})
+    return _CACHED_CLASSES[cls]
+
+
+def cache_story(story):
+    """Switches the story's paragraphs to cached line breaking, in place. Applies to
+    Paragraph and to subclasses marked layout_cacheable (breaks depend only on frags,
+    style and widths)."""
+    for flowable in story:
+        cls = type(flowable)
+        if cls is Paragraph or getattr(cls, "layout_cacheable", False) and "_layout_base" not in cls.__dict__:
+            flowable.__class__ = cached_class(cls)
+        elif isinstance(getattr(flowable, "_content", None), list):
+            cache_story(flowable._content)
+    return story
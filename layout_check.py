@@ -0,0 +1,216 @@
+# layout_check.py
+# Layout-only dry run: page count and overflow without writing a PDF
+#
+# Wraps and paginates a template's story the same way SimpleDocTemplate does
+# (one frame per page, collapsing space before/after, splitting paragraphs), but
+# never draws, embeds fonts or serializes. Fast enough to run on every keystroke.
+
+# pip install reportlab
+
+from collections import deque
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import PageBreak, Paragraph
+from reportlab.platypus.doctemplate import ActionFlowable
+
+from academic_styles import get_academic_styles, get_academic_margins, prepare_story
+from templates import load_template
+
+
+FRAME_PADDING = 6  # SimpleDocTemplate frame padding on every side (points)
+_FUZZ = 1e-6
+
+_STYLES = None
+
+
+def _styles():
+    global _STYLES
+    if _STYLES is None:
+        _STYLES = get_academic_styles()
+    return _STYLES
+
+
+def _text(flowable, limit=60):
+    """Short text excerpt of paragraph flowables (None for others)"""
+    if not hasattr(flowable, "getPlainText"):
+        return None
+    text = " ".join(flowable.getPlainText().split())
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _blank_line(line):
+    """True for wrapped lines that hold nothing but a line break"""
+    words = getattr(line, "words", None)
+    return bool(words) and all(getattr(w, "lineBreak", False) and not w.text for w in words)
+
+
+def _lines_that_fit(p, n, avail):
+    """Lines of paragraph p (n lines left) placed in avail points, as Paragraph.split does.
+
+    Returns 0 when the paragraph must move to the next page instead.
+    """
+    style = p.style
+    s = int(avail / style.leading)
+    allow_orphans = getattr(p, "allowOrphans", getattr(style, "allowOrphans", 0))
+    if (not allow_orphans and s <= 1) or s == 0:
+        return 0
+    if n <= s:
+        return n
+    allow_widows = getattr(p, "allowWidows", getattr(style, "allowWidows", 1))
+    if not allow_widows and n == s + 1:
+        if (allow_orphans and n == 3) or n > 3:
+            s -= 1
+        else:
+            return 0
+    return s
+
+
+def _group_height(group, aW):
+    """Height of flowables kept together, with spaces between them merged"""
+    height, prev_after, at_top = 0, 0, True
+    for f in group:
+        _, h = f.wrap(aW, 0xfffffff)
+        if h <= _FUZZ:
+            continue
+        height += h if at_top else h + max(f.getSpaceBefore() - prev_after, 0)
+        at_top = False
+        prev_after = f.getSpaceAfter()
+        height += prev_after
+    return height - prev_after
+
+
+def dry_run(story, pagesize=A4, margins=None, max_pages=1):
+    """Lays out story without rendering. Returns dict with:
+
+    pages      - number of pages
+    flowables  - [(story index, page, height), ...]; split paragraphs appear once per part
+    remaining  - free space on the last page (points)
+    overflow   - [(story index, text excerpt), ...] of flowables that reach past max_pages
+    fits       - True if the story fits in max_pages
+    """
+    margins = margins or get_academic_margins()
+    aW = pagesize[0] - margins["leftMargin"] - margins["rightMargin"] - 2 * FRAME_PADDING
+    aH = pagesize[1] - margins["topMargin"] - margins["bottomMargin"] - 2 * FRAME_PADDING
+
+    page, y, at_top, prev_after = 1, aH, True, 0
+    placed = []
+    overflow = {}
+    pending = deque(enumerate(story))
+    kept_until = -1  # story index of the last flowable of the current keep-with-next group
+
+    def place(index, f, space_before, h):
+        nonlocal y, at_top, prev_after
+        placed.append((index, page, h))
+        if page > max_pages and index not in overflow:
+            overflow[index] = _text(story[index])
+        prev_after = f.getSpaceAfter()
+        y -= space_before + h + prev_after
+        at_top = False
+
+    def new_page():
+        nonlocal page, y, at_top, prev_after
+        page, y, at_top, prev_after = page + 1, aH, True, 0
+
+    while pending:
+        index, f = pending.popleft()
+        if isinstance(f, PageBreak):
+            new_page()
+            continue
+        if isinstance(f, ActionFlowable):
+            continue
+
+        zero = getattr(f, "_ZEROSIZE", False)
+        s = 0 if at_top else max(f.getSpaceBefore() - prev_after, 0)
+        avail = y - s
+        if index > kept_until and f.getKeepWithNext():
+            # the group moves to a new page unless it fits here (KeepTogether)
+            group = [f]
+            for next_index, g in pending:
+                group.append(g)
+                kept_until = next_index
+                if not g.getKeepWithNext():
+                    break
+            if not at_top and _group_height(group, aW) > avail:
+                new_page()
+                s, avail = 0, y
+        if avail > 0 or zero:
+            w, h = f.wrap(aW, avail)
+            if y - s - h >= -_FUZZ:
+                place(index, f, s, h)
+                continue
+
+        if avail > 0 and isinstance(f, Paragraph) and getattr(f.style, "autoLeading", "") in ("", "off"):
+            # Paginate wrapped lines arithmetically instead of re-wrapping split
+            # remainders on every page (quadratic for long bodies)
+            lines = f.blPara.lines
+            n = len(lines)
+            while n:
+                fit = _lines_that_fit(f, n, avail)
+                if not fit and at_top:
+                    fit = n  # would not fit an empty page either
+                if fit:
+                    place(index, f, s, fit * f.style.leading)
+                    n -= fit
+                    if n == 1 and _blank_line(lines[-1]):
+                        # a split-off trailing <br/> re-wraps to zero height
+                        if y <= 0:
+                            new_page()
+                        place(index, f, 0, 0)
+                        break
+                if n:
+                    new_page()
+                    s, avail = 0, y
+            continue
+
+        parts = f.splitOn(None, aW, avail) if avail > 0 else []
+        if parts:
+            first = parts[0]
+            w, h = first.wrap(aW, avail)
+            place(index, first, s, h)
+            pending.extendleft((index, p) for p in reversed(parts[1:]))
+        elif not at_top:
+            new_page()
+            pending.appendleft((index, f))
+        else:
+            # too large even for an empty page: reportlab would raise LayoutError
+            w, h = f.wrap(aW, aH)
+            place(index, f, 0, h)
+            overflow.setdefault(index, _text(f))
+
+    return {
+        "pages": page,
+        "flowables": placed,
+        "remaining": max(y, 0),
+        "overflow": sorted(overflow.items()),
+        "fits": page <= max_pages and not overflow,
+    }
+
+
+def dry_run_template(name, max_pages=1, **overrides):
+    """Dry run of template story (with configuration overrides)"""
+    module = load_template(name, **overrides)
+    if not hasattr(module, "build_story"):
+        raise ValueError(f"Template {name} has no build_story (layout check not supported)")
+    return dry_run(prepare_story(module.build_story(_styles())), max_pages=max_pages)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Check page count and overflow without writing a PDF")
+    parser.add_argument("template", help="template name, e.g. cover_letter")
+    parser.add_argument("--max-pages", type=int, default=1)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override configuration variable (repeatable)")
+    args = parser.parse_args()
+
+    overrides = dict(item.split("=", 1) for item in args.set)
+    start = time.perf_counter()
+    report = dry_run_template(args.template, args.max_pages, **overrides)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    status = "✅ Fits" if report["fits"] else "⚠️ Overflows"
+    print(f"{status}: {report['pages']} page(s), {report['remaining'] / 72 * 25.4:.1f} mm left on last page ({elapsed:.1f} ms)")
+    for index, text in report["overflow"]:
+        print(f"  overflow: #{index} {text or ''}")
@@ -0,0 +1,248 @@
+# letterhead.py
+# Letterhead: the NAME / LINKS header drawn once per PDF as a shared form XObject
+#
+# Every letter starts with NAME in the title style over LINKS in the meta style. The
+# header is drawn once per PDF into a form XObject; each page then shows it with a
+# single "Do" operator: the first page of a document in the first page layout ("full",
+# as the story had it). Continuation pages get no header by default ("none"); with
+# "compact" (one line) or "full" they show it in the top margin. Documents of a packet
+# with the same header share one form.
+#
+# A form costs an object of its own, so a layout's first appearance in a PDF is drawn
+# as plain paragraphs (one-page letters come out unchanged) and the form is made when
+# the layout is shown again. Link annotations belong to pages, not to forms: the
+# header's links are recorded while its form is drawn and added wherever it is shown.
+
+import hashlib
+
+from reportlab.lib.units import mm
+from reportlab.platypus import Flowable, PageBreak, Paragraph, Spacer
+
+import academic_styles
+from academic_styles import LETTERHEAD_LAYOUTS
+from layout_cache import style_key
+
+
+CONTINUATION_GAP = 4*mm  # between a continuation header and the top of the frame
+FORM_BLEED = 2*mm        # form bounding box margin for glyph overhang and underlines
+
+
+# ---------- Layouts ----------
+
+def _stack(flowables, width):
+    """Wraps flowables stacked the way a frame does: [(flowable, bottom), ...], height
+    (bottom: distance from the top of the stack to the flowable's bottom edge)"""
+    placed, y, after = [], 0, None
+    for f in flowables:
+        _, h = f.wrap(width, 1e6)
+        if after is not None:
+            y += after + max(f.getSpaceBefore() - after, 0)
+        y += h
+        placed.append((f, y))
+        after = f.getSpaceAfter()
+    return placed, y
+
+
+def _record_links(canv, links):
+    """Replaces the canvas link methods with ones that record (method, args, rect, kw)
+    in form space; paragraphs always pass rectangles relative to the current transform"""
+    def recorder(method):
+        def record(*args, relative=0, **kw):
+            *head, (x0, y0, x1, y1) = args
+            if relative:
+                (x0, y0), (x1, y1) = canv.absolutePosition(x0, y0), canv.absolutePosition(x1, y1)
+            links.append((method, head, (x0, y0, x1, y1), kw))
+        return record
+    canv.linkURL = recorder("linkURL")
+    canv.linkRect = recorder("linkRect")
+
+
+class Letterhead:
+    """Name and links header of one document; draws its layouts as form XObjects"""
+
+    use_forms = True  # False: draw the paragraphs on every page instead (for comparison)
+
+    def __init__(self, title, meta, between=(), first_page="full", continuation="none"):
+        for layout in (first_page, continuation):
+            if layout not in LETTERHEAD_LAYOUTS:
+                raise ValueError(f"Unknown letterhead layout: {layout} (use one of {', '.join(LETTERHEAD_LAYOUTS)})")
+        self.title = title
+        self.meta = meta
+        self.between = list(between)
+        self.first_page = first_page
+        self.continuation = continuation
+        self._flowables = {}
+        self._stacks = {}
+
+    def flowables(self, layout):
+        if layout not in self._flowables:
+            if layout == "full":
+                flowables = [self.title, *self.between, self.meta]
+            elif layout == "compact":
+                text = f'<font name="{self.title.style.fontName}">{self.title.text}</font> · {self.meta.text}'
+                flowables = [Paragraph(text, self.meta.style)]
+                if academic_styles.FONT_FALLBACK:
+                    from font_fallback import fallback_story
+                    fallback_story(flowables)
+            else:
+                flowables = []
+            if academic_styles.KERNING:
+                from kerning import kern_story
+                kern_story(flowables)
+            self._flowables[layout] = flowables
+        return self._flowables[layout]
+
+    def stack(self, layout, width):
+        """Wrapped layout: [(flowable, bottom), ...], height"""
+        key = (layout, width)
+        if key not in self._stacks:
+            self._stacks[key] = _stack(self.flowables(layout), width)
+        return self._stacks[key]
+
+    def form_name(self, layout, width):
+        """Form name: the same header, layout and width give the same form"""
+        key = (layout, round(width, 3), self.title.text, self.meta.text,
+               style_key(self.title.style), style_key(self.meta.style))
+        if layout == "full":
+            key += tuple((type(f).__name__, getattr(f, "height", 0)) for f in self.between)
+        return "Letterhead" + hashlib.sha1(repr(key).encode("utf8")).hexdigest()[:16]
+
+    def _form(self, canv, name, layout, width):
+        """Recorded links of the layout's form on canv, drawing the form if needed"""
+        forms = canv.__dict__.setdefault("_letterhead_forms", {})
+        if name not in forms:
+            placed, height = self.stack(layout, width)
+            links = []
+            canv.beginForm(name, -FORM_BLEED, -FORM_BLEED, width + FORM_BLEED, height + FORM_BLEED)
+            _record_links(canv, links)
+            try:
+                for f, bottom in placed:
+                    f.drawOn(canv, 0, height - bottom)
+            finally:
+                del canv.linkURL, canv.linkRect
+            canv.endForm()
+            forms[name] = links
+        return forms[name]
+
+    def draw(self, canv, layout, width, x=0, y=0):
+        """Draws layout with its bottom left corner at (x, y)"""
+        if layout == "none":
+            return
+        shown = canv.__dict__.setdefault("_letterhead_shown", set())
+        name = self.form_name(layout, width)
+        if not self.use_forms or name not in shown:
+            shown.add(name)
+            placed, height = self.stack(layout, width)
+            for f, bottom in placed:
+                f.drawOn(canv, x, y + height - bottom)
+            return
+        links = self._form(canv, name, layout, width)
+        canv.saveState()
+        canv.translate(x, y)
+        canv.doForm(name)
+        for method, head, rect, kw in links:
+            getattr(canv, method)(*head, rect, relative=1, **kw)
+        canv.restoreState()
+
+
+# ---------- Continuation Pages ----------
+
+def _draw_continuation(doc):
+    letterhead, page = getattr(doc, "_letterhead", None) or (None, None)
+    canv = doc.canv
+    if letterhead is None or page == canv.getPageNumber():
+        return
+    frame = doc.frame
+    width = frame._width - frame._leftPadding - frame._rightPadding
+    letterhead.draw(canv, letterhead.continuation, width, frame._x1 + frame._leftPadding, frame._y2 + CONTINUATION_GAP)
+
+
+def _set_letterhead(doc, value):
+    """Makes value ((letterhead, first page) or None) the header of the following pages"""
+    if "afterPage" not in doc.__dict__:
+        after_page = doc.afterPage
+
+        def afterPage():
+            _draw_continuation(doc)
+            after_page()
+        doc.afterPage = afterPage
+    doc._letterhead = value
+
+
+# ---------- Flowables ----------
+
+class LetterheadFlowable(Flowable):
+    """Header in the story: takes the space of its first page layout, draws it as a form
+    and shows the continuation layout on the document's later pages"""
+
+    def __init__(self, letterhead):
+        Flowable.__init__(self)
+        self.letterhead = letterhead
+        self._content = letterhead.flowables("full")  # for code that looks for paragraphs
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = self.letterhead.stack(self.letterhead.first_page, availWidth)[1]
+        return self.width, self.height
+
+    def split(self, availWidth, availHeight):
+        return []
+
+    def getSpaceBefore(self):
+        flowables = self.letterhead.flowables(self.letterhead.first_page)
+        return flowables[0].getSpaceBefore() if flowables else 0
+
+    def getSpaceAfter(self):
+        flowables = self.letterhead.flowables(self.letterhead.first_page)
+        return flowables[-1].getSpaceAfter() if flowables else 0
+
+    def draw(self):
+        self.letterhead.draw(self.canv, self.letterhead.first_page, self.width)
+        doc = getattr(self.canv, "_doctemplate", None)
+        if doc is not None:
+            _set_letterhead(doc, (self.letterhead, self.canv.getPageNumber()))
+
+
+class EndLetterhead(Flowable):
+    """Zero-size flowable: pages from here on get no continuation header"""
+
+    _ZEROSIZE = 1
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        doc = getattr(self.canv, "_doctemplate", None)
+        if doc is not None:
+            _set_letterhead(doc, None)
+
+
+# ---------- Story ----------
+
+def _styled(flowable, style_name):
+    return isinstance(flowable, Paragraph) and getattr(flowable.style, "name", None) == style_name
+
+
+def letterhead_story(story, first_page="full", continuation="none"):
+    """Replaces the story's NAME / LINKS headers (a title paragraph, spacers, a meta
+    paragraph) with letterhead flowables, in place. A page break ends the continuation
+    header of the document before it (packets)."""
+    out, i, active = [], 0, False
+    while i < len(story):
+        f = story[i]
+        if _styled(f, "title"):
+            j = i + 1
+            while j < len(story) and type(story[j]) is Spacer:
+                j += 1
+            if j < len(story) and _styled(story[j], "meta"):
+                out.append(LetterheadFlowable(Letterhead(f, story[j], story[i + 1:j], first_page, continuation)))
+                active = True
+                i = j + 1
+                continue
+        out.append(f)
+        if active and isinstance(f, PageBreak):
+            out.append(EndLetterhead())
+            active = False
+        i += 1
+    story[:] = out
+    return story
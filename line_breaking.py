@@ -0,0 +1,365 @@
+# line_breaking.py
+# Optimal-fit (Knuth–Plass) line breaking for justified paragraphs
+#
+# reportlab breaks lines greedily: every line takes as many words as fit, so a
+# justified paragraph can have a very loose line right after a tight one. The
+# optimal breaker chooses all breaks of a paragraph together by dynamic programming
+# over feasible breakpoints, minimizing the total demerits of its lines (how far
+# their spaces stretch, plus penalties for hyphens). Word pieces are measured once
+# per (text, font, size).
+#
+# By default lines break only between words, so every word stays whole in the text
+# layer for ATS parsers. HyphenatedParagraph also breaks at hyphens and at Liang's
+# hyphenation patterns (pyphen) for tighter spacing in letters that people read.
+#
+# The chosen lines are returned in reportlab's own line structure (soft breaks kept
+# as injected breaks), so drawing, justification, links and splitting across pages
+# work as for any Paragraph.
+
+# pip install reportlab
+# pip install pyphen  (optional: pattern hyphenation for HyphenatedParagraph)
+
+import functools
+
+from reportlab.pdfbase.pdfmetrics import getAscentDescent, stringWidth
+from reportlab.platypus import Paragraph
+from reportlab.platypus.paragraph import (
+    _FK_BREAK, _FK_TEXT, _HSFrag, _InjectedFrag, _SplitFrag, _SplitFragHS, _SplitFragHY, _getFragWords,
+    _processed_frags, _rejoinSplitFragWords, FragLine, ParaLines, sameFrag
+)
+
+try:
+    import pyphen
+except ImportError:
+    pyphen = None
+
+
+HYPHENATION_LANG = "en_US"
+MIN_HYPHEN_WORD = 7  # shorter words are never hyphenated
+
+# Demerits as in TeX: (LINE_PENALTY + badness)^2 per line, plus penalties
+LINE_PENALTY = 10
+HYPHEN_PENALTY = 100
+DOUBLE_HYPHEN_DEMERITS = 3000  # two hyphenated lines in a row
+FINAL_HYPHEN_DEMERITS = 20000  # hyphen on the second-to-last line
+MAX_BADNESS = 10000
+STRETCH = 0.5  # a space stretched by half its width has badness 100 (as has one shrunk by spaceShrinkage)
+
+
+# ---------- Measuring and Hyphenation ----------
+
+@functools.lru_cache(maxsize=65536)
+def text_width(text, font_name, font_size):
+    """Cached stringWidth"""
+    return stringWidth(text, font_name, font_size)
+
+
+@functools.lru_cache(maxsize=None)
+def _hyphenator(lang):
+    return pyphen.Pyphen(lang=lang, left=2, right=3)
+
+
+@functools.lru_cache(maxsize=65536)
+def hyphen_positions(word, lang=HYPHENATION_LANG):
+    """[(position, explicit), ...] where word may be broken: after its own hyphens
+    (explicit) and at pattern hyphenation points of its alphabetic parts"""
+    if not lang:
+        return ()
+    points = []
+    start = 0
+    for part in word.split("-"):
+        end = start + len(part)
+        if start and start < len(word) and part:
+            points.append((start, True))
+        core_start, core_end = start, end
+        while core_start < end and not word[core_start].isalpha():
+            core_start += 1
+        while core_end > core_start and not word[core_end - 1].isalpha():
+            core_end -= 1
+        core = word[core_start:core_end]
+        if pyphen is not None and len(core) >= MIN_HYPHEN_WORD and core.isalpha():
+            points += [(core_start + p, False) for p in _hyphenator(lang).positions(core)]
+        start = end + 1
+    return tuple(points)
+
+
+# ---------- Optimal Breaks ----------
+
+def _rejoin(pieces):
+    f = pieces[0][1][0]
+    if any(len(w) != 2 or w[1][0] is not f for w in pieces):
+        return _rejoinSplitFragWords(pieces)
+    text = "".join(w[1][1][:-1] if isinstance(w, _SplitFragHY) else w[1][1] for w in pieces)
+    word = _HSFrag if isinstance(pieces[-1], _HSFrag) else list
+    return word([text_width(text, f.fontName, f.fontSize), (f, text)])
+
+
+def frag_words(frags, max_width):
+    """reportlab's frag words of a paragraph; words split by an earlier wrap are
+    rejoined keeping their own hyphens (reportlab strips a trailing "-" on rejoin)"""
+    if not _processed_frags(frags):
+        return _getFragWords(frags, max_width)
+    words, pieces = [], []
+    for w in frags:
+        if isinstance(w, _InjectedFrag):
+            continue
+        if isinstance(w, _SplitFrag):
+            pieces.append(w)
+            if isinstance(w, _HSFrag):
+                words.append(_rejoin(pieces))
+                pieces = []
+            continue
+        if pieces:
+            words.append(_rejoin(pieces))
+            pieces = []
+        words.append(w)
+    if pieces:
+        words.append(_rejoin(pieces))
+    return words
+
+
+def _is_break(word):
+    return getattr(word[1][0], "_fkind", None) == _FK_BREAK
+
+
+def _breakpoints(words, lang):
+    """Feasible breakpoints of a run of frag words (no hard breaks inside).
+
+    Each is (word index, char position or None, end x, next start x, space width
+    before the break, space width consumed by the break, hyphenated); x values are
+    measured from the start of the run.
+    """
+    points = [(-1, None, 0.0, 0.0, 0.0, 0.0, False)]
+    x = spaces = 0.0
+    last = len(words) - 1
+    for k, w in enumerate(words):
+        f = w[-1][0]
+        space = text_width(" ", f.fontName, f.fontSize) if isinstance(w, _HSFrag) else 0.0
+        if type(w) is _HSFrag and len(w) == 2 and not hasattr(f, "cbDefn"):
+            text = w[1][1]
+            hyphen = text_width("-", f.fontName, f.fontSize)
+            for pos, explicit in hyphen_positions(text, lang):
+                head = text_width(text[:pos], f.fontName, f.fontSize)
+                end_x = x + head + (0.0 if explicit else hyphen)
+                points.append((k, pos, end_x, x + head, spaces, spaces, not explicit))
+        if space or k == last:
+            points.append((k, None, x + w[0], x + w[0] + space, spaces, spaces + space, False))
+        x += w[0] + space
+        spaces += space
+    return points
+
+
+def optimal_breaks(words, first_width, width, lang=HYPHENATION_LANG, shrinkage=0.0):
+    """Breakpoints [(word index, char position or None), ...] of one run of frag words.
+
+    Justified lines may shrink their spaces by shrinkage (reportlab's spaceShrinkage)
+    to fit their width (first_width for the first line); the last line is not
+    justified, so it must fit as it is and has no badness. Returns None if a word
+    is wider than the line.
+    """
+    points = _breakpoints(words, lang)
+    n = len(points)
+    best = [0.0] + [float("inf")] * (n - 1)
+    prev = [0] * n
+    widest = max(first_width, width)
+    for q in range(1, n):
+        _, _, end_x, _, end_spaces, _, hyphen_q = points[q]
+        last = q == n - 1
+        for p in range(q - 1, -1, -1):
+            _, _, _, start_x, _, start_spaces, hyphen_p = points[p]
+            natural = end_x - start_x
+            if natural * (1 - shrinkage) > widest + 1e-6:
+                break
+            if best[p] == float("inf"):
+                continue
+            limit = first_width if p == 0 else width
+            spaces = end_spaces - start_spaces
+            slack = limit - natural
+            if slack < -1e-6:
+                if last or -slack > spaces * shrinkage + 1e-6:
+                    continue
+                badness = 100.0 * (-slack / (spaces * shrinkage)) ** 3
+            elif last:
+                badness = 0.0
+            elif spaces:
+                badness = min(100.0 * (slack / (spaces * STRETCH)) ** 3, MAX_BADNESS)
+            else:
+                badness = 0.0 if slack < 1e-6 else MAX_BADNESS
+            demerits = (LINE_PENALTY + badness) ** 2
+            if hyphen_q:
+                demerits += HYPHEN_PENALTY ** 2 + (DOUBLE_HYPHEN_DEMERITS if hyphen_p else 0)
+            elif last and hyphen_p:
+                demerits += FINAL_HYPHEN_DEMERITS
+            total = best[p] + demerits
+            if total < best[q]:
+                best[q] = total
+                prev[q] = p
+    if best[-1] == float("inf"):
+        return None
+    breaks = []
+    q = prev[-1]
+    while q:
+        breaks.append(points[q][:2])
+        q = prev[q]
+    return breaks[::-1]
+
+
+def _run_lines(words, breaks):
+    """Lines [[word, ...], ...] of a run broken at breaks; hyphenated words are split reportlab-style"""
+    splits = {}
+    for k, pos in breaks:
+        splits.setdefault(k, []).append(pos)
+    lines = [[]]
+    for k, w in enumerate(words):
+        positions = splits.get(k)
+        if not positions:
+            lines[-1].append(w)
+            continue
+        f, text = w[1]
+        start = used = 0
+        for pos in positions:
+            if pos is None:
+                continue
+            head = text_width(text[start:pos], f.fontName, f.fontSize)
+            if text[pos - 1] == "-":  # the word's own hyphen
+                lines[-1].append(_SplitFrag([head, (f, text[start:pos])]))
+            else:
+                hyphen = text_width("-", f.fontName, f.fontSize)
+                lines[-1].append(_SplitFragHY([head + hyphen, (f, text[start:pos] + "-")]))
+            lines.append([])
+            used += head
+            start = pos
+        if start:
+            w = _SplitFragHS([w[0] - used, (f, text[start:])])
+        lines[-1].append(w)
+        if positions[-1] is None:
+            lines.append([])
+    return lines
+
+
+def break_words(words, widths, lang=HYPHENATION_LANG, shrinkage=0.0):
+    """Optimal lines [(words, hard break word or None), ...] of a paragraph's frag words,
+    or None if a word is wider than its line. widths are [first line, later lines]."""
+    first_width, width = widths[0], widths[-1]
+    lines, run = [], []
+    for w in words + [None]:
+        if w is None or _is_break(w):
+            if run:
+                breaks = optimal_breaks(run, first_width, width, lang, shrinkage)
+                if breaks is None:
+                    return None
+                lines += [(line, None) for line in _run_lines(run, breaks)]
+                run = []
+                if w is not None:
+                    lines[-1] = (lines[-1][0], w)
+            elif w is not None:
+                lines.append(([], w))
+            first_width = width  # only the paragraph's first line can differ
+        else:
+            run.append(w)
+    return lines
+
+
+def _frag_line(words, hard_break, max_width, justify_breaks):
+    """reportlab FragLine of frag words, merged into frags as Paragraph.breakLines does"""
+    f = (words[0] if words else hard_break)[1][0]
+    size = f.fontSize
+    ascent, descent = getAscentDescent(f.fontName, size)
+    frags, width, space, n, g = [], 0.0, 0.0, 0, None
+    for w in words:
+        f, text = w[1]
+        width += space + w[0]
+        n += bool(text)
+        if g is None or not sameFrag(g, f):
+            if g is not None and space:
+                for prev in reversed(frags):
+                    if prev._fkind == _FK_TEXT:
+                        if not prev.text.endswith(" "):
+                            prev.text += " "
+                        break
+            g = f.clone()
+            g.text = text
+            frags.append(g)
+        elif space and not g.text.endswith(" "):
+            g.text += " " + text
+        else:
+            g.text += text
+        for i, (piece, piece_text) in enumerate(w[1:]):
+            if i:
+                g = piece.clone()
+                g.text = piece_text
+                frags.append(g)
+            size = max(size, piece.fontSize)
+            a, d = getAscentDescent(piece.fontName, piece.fontSize)
+            ascent, descent = max(ascent, a), min(descent, d)
+        space = text_width(" ", w[-1][0].fontName, w[-1][0].fontSize) if isinstance(w, _HSFrag) else 0.0
+    if hard_break is not None:
+        frags.append(hard_break[1][0].clone())
+    return FragLine(extraSpace=max_width - width, wordCount=n, lineBreak=hard_break is not None and not justify_breaks,
+                    words=frags, fontSize=size, ascent=ascent, descent=descent, maxWidth=max_width), width
+
+
+# ---------- Paragraph ----------
+
+class OptimalParagraph(Paragraph):
+    """Paragraph with optimal-fit line breaking between words (falls back to reportlab for
+    bullets, bidirectional or shaped text, inline images, dot leaders and words wider than the line)"""
+
+    hyphenation_lang = None
+    layout_cacheable = True  # lines depend only on frags, style and widths (see layout_cache.py)
+
+    def breakLines(self, width):
+        if getattr(self, "_splitpara", 0) and hasattr(self, "blPara"):
+            return self.blPara  # first part of a split keeps the lines it was split with
+        widths = list(width) if isinstance(width, (list, tuple)) else [width]
+        style = self.style
+        if (len(widths) > 2 or self.bulletText or style.endDots or style.shaping or not self.frags
+                or (style.wordWrap or "").upper() in ("RTL", "LTR")
+                or getattr(self, "autoLeading", getattr(style, "autoLeading", "")) not in ("", "off")):
+            return Paragraph.breakLines(self, width)
+        words = frag_words(self.frags, widths[0])
+        if _processed_frags(self.frags):
+            self.frags = words  # so a fallback to reportlab sees whole words
+        lines = None
+        if not any(hasattr(f, "cbDefn") for w in words for f, _ in w[1:]):
+            lines = break_words(words, widths, self.hyphenation_lang, style.spaceShrinkage)
+        if lines is None:
+            return Paragraph.breakLines(self, width)
+
+        # Consumed frag words with the soft breaks injected, as reportlab keeps them for split()
+        frags, para_lines = [], []
+        self._width_max = self._splitLongWordCount = self._hyphenations = 0
+        for i, (line, hard_break) in enumerate(lines):
+            max_width = widths[min(i, len(widths) - 1)]
+            frag_line, line_width = _frag_line(line, hard_break, max_width, style.justifyBreaks)
+            frag_line.sFW = len(frags)
+            para_lines.append(frag_line)
+            frags += line
+            if hard_break is not None:
+                frags.append(hard_break)
+            elif i < len(lines) - 1:
+                frags.append(_InjectedFrag([0, (line[-1][-1][0].clone(_fkind=_FK_BREAK, text=""), "")]))
+            self._width_max = max(self._width_max, line_width)
+            self._hyphenations += bool(line) and isinstance(line[-1], _SplitFragHY)
+        self.frags = frags
+        return ParaLines(kind=1, lines=para_lines)
+
+    breakLinesCJK = breakLines
+
+
+class HyphenatedParagraph(OptimalParagraph):
+    """OptimalParagraph that may also break words: at their own hyphens and at pattern
+    hyphenation points (smoother spacing, but ATS parsers read the halves as two words)"""
+
+    hyphenation_lang = HYPHENATION_LANG
+
+
+def optimize_story(story, hyphenate=False, alignments=(4,)):
+    """Switches paragraphs with the given alignments (4: justified) to optimal breaking, in place"""
+    cls = HyphenatedParagraph if hyphenate else OptimalParagraph
+    for flowable in story:
+        if type(flowable) is Paragraph and flowable.style.alignment in alignments:
+            flowable.__class__ = cls
+        elif isinstance(getattr(flowable, "_content", None), list):
+            optimize_story(flowable._content, hyphenate, alignments)
+    return story
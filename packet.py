@@ -0,0 +1,90 @@
+# packet.py
+# Application packet: several templates rendered into one PDF (Academic Style)
+#
+# All documents share one document template, one set of styles and one embedding
+# of each font subset; every document gets its own bookmark in the PDF outline.
+
+# pip install reportlab
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate, PageBreak, Flowable
+
+from academic_styles import get_academic_styles, get_academic_margins, prepare_story, BASE_FONT
+from pdf_output import OUTPUT_PROFILES, get_output_options, finalize_output
+from templates import DOCUMENT_TITLES, load_template
+
+
+DEFAULT_PACKET = ["cv", "cover_letter", "reference_check_prep"]
+
+
+class DocumentBookmark(Flowable):
+    """Zero-size flowable that adds a PDF outline entry for the current page"""
+
+    def __init__(self, title, key, level=0):
+        Flowable.__init__(self)
+        self.title = title
+        self.key = key
+        self.level = level
+
+    def wrap(self, availWidth, availHeight):
+        return 0, 0
+
+    def draw(self):
+        self.canv.bookmarkPage(self.key)
+        self.canv.addOutlineEntry(self.title, self.key, level=self.level, closed=False)
+        self.canv.showOutline()
+
+
+def _packet_entry(entry):
+    """Normalizes packet entry: "name" or ("name", {overrides}) -> (name, overrides)"""
+    if isinstance(entry, str):
+        return entry, {}
+    name, overrides = entry
+    return name, overrides or {}
+
+
+def build_packet_story(entries, s):
+    """Returns one story with all documents separated by page breaks"""
+    story = []
+    for i, entry in enumerate(entries):
+        name, overrides = _packet_entry(entry)
+        module = load_template(name, **overrides)
+        if not hasattr(module, "build_story"):
+            raise ValueError(f"Template {name} can't be used in a packet (no build_story)")
+        if i:
+            story.append(PageBreak())
+        story.append(DocumentBookmark(DOCUMENT_TITLES.get(name, name), f"doc{i}"))
+        story.extend(module.build_story(s))
+    return story
+
+
+def build_packet(path="Application_Packet.pdf", entries=DEFAULT_PACKET, title="Application Packet", profile="default"):
+    """Generates one PDF with several documents in academic style"""
+    margins = get_academic_margins()
+
+    doc = SimpleDocTemplate(
+        path,
+        pagesize=A4,
+        title=title,
+        **margins,
+        **get_output_options(profile)
+    )
+
+    s = get_academic_styles()
+
+    story = build_packet_story(entries, s)
+
+    doc.build(prepare_story(story))
+    finalize_output(path, profile)
+    print(f"✅ Generated: {path}  (font={BASE_FONT})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build application packet")
+    parser.add_argument("templates", nargs="*", default=DEFAULT_PACKET, help="template names in packet order")
+    parser.add_argument("-o", "--output", default="Application_Packet.pdf")
+    parser.add_argument("--profile", default="default", choices=sorted(OUTPUT_PROFILES))
+    args = parser.parse_args()
+    build_packet(args.output, args.templates, profile=args.profile)
@@ -0,0 +1,312 @@
+# pipeline.py
+# Staged batch rendering: ingest → template → layout → serialize → sink
+#
+# render_template() takes a document from its data to its file in one go, so in a
+# serial batch the CPU idles while a file is written and the disk idles during
+# layout. Here every document passes through five stages connected by bounded queues:
+#
+#   ingest     job (template, output, overrides) -> RenderInput
+#   template   template module executed with the overrides; story built and prepared
+#   layout     story wrapped and drawn onto a canvas (fast letter path or doc.build)
+#   serialize  canvas saved to PDF bytes (page compression, font subsets), compact pass
+#   sink       PDF written to its file, or added to a ZIP/TAR bundle
+#
+# Each stage runs in its own threads (STAGE_WORKERS, configurable per stage). A full
+# queue blocks the stage feeding it, so at most queue_size documents wait between two
+# stages. For every stage the pipeline measures busy time (and the CPU time of it),
+# time starved for input and time blocked on a full queue downstream: the stage with
+# the highest utilization is the bottleneck. Threads share the GIL, so stages overlap
+# where they wait (file I/O) or run in C without the GIL (zlib, pikepdf); busy time of
+# Python-bound stages includes waiting for the GIL.
+#
+# Templates without build_story() (they draw on a canvas themselves) are rendered
+# whole in the layout stage. Render hooks (RENDER_HOOKS) run in the calling thread as
+# each document leaves the sink.
+
+import contextlib
+import io
+import os
+import queue
+import threading
+import time
+
+from reportlab.lib.pagesizes import A4
+from reportlab.platypus import SimpleDocTemplate
+
+from academic_styles import get_academic_margins, get_academic_styles, prepare_story
+from fast_letter import build_letter
+from pdf_output import finalize_output, get_output_options
+from templates import RenderInput, run_render_hooks
+
+
+STAGES = ("ingest", "template", "layout", "serialize", "sink")
+STAGE_WORKERS = {"ingest": 1, "template": 1, "layout": 1, "serialize": 1, "sink": 2}
+DEFAULT_QUEUE_SIZE = 8
+
+_DONE = object()
+
+
+# ---------- Documents ----------
+
+class Document:
+    """A document on its way through the stages"""
+
+    __slots__ = ("job", "output", "module", "story", "canvas", "buffer", "data", "path")
+
+    def __init__(self, job, output):
+        self.job, self.output = job, output
+        self.module = self.story = self.canvas = self.buffer = self.data = self.path = None
+
+
+def ingest(job, profile="default"):
+    name, output, overrides = job
+    return Document(RenderInput.of(name, profile, **(overrides or {})), output)
+
+
+def template(doc):
+    doc.module = doc.job.load()
+    if hasattr(doc.module, "build_story"):
+        doc.story = prepare_story(doc.module.build_story(get_academic_styles()))
+    return doc
+
+
+_stdout_lock = threading.Lock()  # redirect_stdout() swaps sys.stdout for all threads
+
+
+def layout(doc):
+    doc.buffer = io.BytesIO()
+    if doc.story is None:
+        with _stdout_lock, contextlib.redirect_stdout(io.StringIO()):  # its "Generated" message
+            doc.module.build_pdf(doc.buffer, doc.job.profile)  # draws, saves and finalizes itself
+        return doc
+    pdf = SimpleDocTemplate(doc.buffer, pagesize=A4, **get_academic_margins(),
+                            **get_output_options(doc.job.profile))
+    pdf._doSave = 0  # the canvas is saved in the serialize stage
+    build_letter(pdf, doc.story)
+    doc.canvas, doc.story = pdf.canv, None
+    return doc
+
+
+def serialize(doc):
+    if doc.canvas is not None:
+        doc.canvas.save()
+        finalize_output(doc.buffer, doc.job.profile)
+    doc.data, doc.buffer, doc.canvas = doc.buffer.getvalue(), None, None
+    return doc
+
+
+def file_sink(out_dir="."):
+    """Sink stage writing each document to out_dir/output"""
+    def sink(doc):
+        path = os.path.join(out_dir, doc.output)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(doc.data)
+        doc.data, doc.path = None, path
+        return doc
+    return sink
+
+
+def bundle_sink(bundle):
+    """Sink stage adding each document to a bundle.BundleSink under its output name"""
+    def sink(doc):
+        bundle.add(doc.output, doc.data)
+        doc.data, doc.path = None, bundle  # no file of its own: hooks see the bundle
+        return doc
+    return sink
+
+
+# ---------- Statistics ----------
+
+class StageStats:
+    """Counters of one stage: documents, busy/CPU/starved/blocked seconds (all workers)"""
+
+    __slots__ = ("name", "workers", "items", "busy", "cpu", "starved", "blocked")
+
+    def __init__(self, name, workers):
+        self.name, self.workers = name, workers
+        self.items = 0
+        self.busy = self.cpu = self.starved = self.blocked = 0.0
+
+    def utilization(self, wall):
+        return self.busy / (wall * self.workers) if wall else 0.0
+
+
+class PipelineStats:
+    """Statistics of a pipeline run: wall time and StageStats per stage"""
+
+    def __init__(self, stages, wall):
+        self.stages, self.wall = stages, wall
+
+    @property
+    def bottleneck(self):
+        return max(self.stages, key=lambda s: s.utilization(self.wall))
+
+    def format(self):
+        lines = [f"{'stage':<10} {'workers':>7} {'docs':>6} {'busy':>8} {'cpu':>8} {'starved':>8} "
+                 f"{'blocked':>8} {'util':>6}"]
+        for s in self.stages:
+            lines.append(f"{s.name:<10} {s.workers:>7} {s.items:>6} {s.busy:>7.2f}s {s.cpu:>7.2f}s "
+                         f"{s.starved:>7.2f}s {s.blocked:>7.2f}s {s.utilization(self.wall):>6.0%}")
+        b = self.bottleneck
+        lines.append(f"bottleneck: {b.name} ({b.utilization(self.wall):.0%} busy); "
+                     f"{self.stages[-1].items} documents in {self.wall:.2f}s")
+        return "\n".join(lines)
+
+
+# ---------- Pipeline ----------
+
+class _Source:
+    """Queue-like view of a job iterator for the first stage"""
+
+    def __init__(self, jobs):
+        self._jobs = iter(jobs)
+        self._lock = threading.Lock()
+
+    def get(self):
+        with self._lock:
+            return next(self._jobs, _DONE)
+
+    def put(self, item):
+        pass  # _DONE passed on between the first stage's workers: the iterator stays exhausted
+
+
+class Pipeline:
+    """Stages [(name, function, workers), ...] connected by queues of queue_size items.
+
+    Every function maps one item to the item for the next stage. After the first
+    error the remaining items are drained without processing, and run() raises it.
+    """
+
+    def __init__(self, stages, queue_size=DEFAULT_QUEUE_SIZE):
+        if queue_size < 1:
+            raise ValueError(f"Queue size must be at least 1: {queue_size}")
+        for name, _, workers in stages:
+            if workers < 1:
+                raise ValueError(f"Stage {name} needs at least 1 worker: {workers}")
+        self.stages = stages
+        self.queue_size = queue_size
+        self._error = None
+
+    def _work(self, fn, stats, inbox, outbox, remaining, lock):
+        while True:
+            start = time.perf_counter()
+            item = inbox.get()
+            with lock:
+                stats.starved += time.perf_counter() - start
+            if item is _DONE:
+                inbox.put(_DONE)  # for the stage's other workers
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last and outbox is not None:
+                    outbox.put(_DONE)
+                return
+            if self._error is not None:
+                continue  # drain, so no stage blocks forever
+            try:
+                start, cpu = time.perf_counter(), time.thread_time()
+                item = fn(item)
+                with lock:
+                    stats.busy += time.perf_counter() - start
+                    stats.cpu += time.thread_time() - cpu
+                    stats.items += 1
+            except Exception as e:
+                self._error = self._error or e
+                continue
+            if outbox is not None:
+                start = time.perf_counter()
+                outbox.put(item)
+                with lock:
+                    stats.blocked += time.perf_counter() - start
+
+    def run(self, items, done=None):
+        """Passes items through all stages; returns PipelineStats. done(item), if given,
+        is called in the calling thread for every item leaving the last stage."""
+        stats = [StageStats(name, workers) for name, _, workers in self.stages]
+        inboxes = [_Source(items)] + [queue.Queue(self.queue_size) for _ in self.stages[1:]]
+        results = queue.Queue(self.queue_size) if done else None
+        threads = []
+        start = time.perf_counter()
+        for i, (name, fn, workers) in enumerate(self.stages):
+            outbox = inboxes[i + 1] if i + 1 < len(self.stages) else results
+            remaining, lock = [workers], threading.Lock()
+            for n in range(workers):
+                args = (fn, stats[i], inboxes[i], outbox, remaining, lock)
+                threads.append(threading.Thread(target=self._work, args=args, name=f"{name}-{n}", daemon=True))
+        for t in threads:
+            t.start()
+        if results is not None:
+            for item in iter(results.get, _DONE):
+                if self._error is None:
+                    try:
+                        done(item)
+                    except Exception as e:
+                        self._error = e
+        for t in threads:
+            t.join()
+        if self._error is not None:
+            raise self._error
+        return PipelineStats(stats, time.perf_counter() - start)
+
+
+def render_pipeline(jobs, sink, workers=None, queue_size=DEFAULT_QUEUE_SIZE, profile="default"):
+    """Renders jobs [(template, output, overrides), ...] through the staged pipeline
+    into sink (file_sink() or bundle_sink()); workers {stage: threads} overrides
+    STAGE_WORKERS. Returns PipelineStats."""
+    workers = dict(STAGE_WORKERS, **(workers or {}))
+    unknown = set(workers) - set(STAGES)
+    if unknown:
+        raise ValueError(f"Unknown stage: {', '.join(sorted(unknown))} (use one of {', '.join(STAGES)})")
+    functions = {"ingest": lambda job: ingest(job, profile), "template": template, "layout": layout,
+                 "serialize": serialize, "sink": sink}
+
+    def done(doc):
+        run_render_hooks(doc.job, doc.path, doc.module)  # here, so hooks need not be thread-safe
+        doc.module = None
+
+    return Pipeline([(name, functions[name], workers[name]) for name in STAGES], queue_size).run(jobs, done)
+
+
+def parse_workers(spec):
+    """{stage: threads} of "layout=2,sink=4" """
+    workers = {}
+    for item in filter(None, spec.split(",")):
+        name, _, count = item.partition("=")
+        workers[name.strip()] = int(count)
+    return workers
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from pdf_output import OUTPUT_PROFILES
+    from templates import TEMPLATES
+    from worker_pool import preload, read_jobs
+
+    parser = argparse.ArgumentParser(description="Render a batch through the staged pipeline")
+    parser.add_argument("templates", nargs="*", default=sorted(TEMPLATES), help="template names")
+    parser.add_argument("--jobs", metavar="CSV", help='jobs from CSV: columns "template", "output" and overrides')
+    parser.add_argument("-o", "--out-dir", default=".")
+    parser.add_argument("--bundle", metavar="ARCHIVE", help="write into a ZIP/TAR archive instead of files")
+    parser.add_argument("--workers", default="", metavar="STAGE=N,...",
+                        help=f"threads per stage (default: {','.join(f'{k}={v}' for k, v in STAGE_WORKERS.items())})")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE)
+    parser.add_argument("--profile", default="default", choices=sorted(OUTPUT_PROFILES))
+    args = parser.parse_args()
+
+    preload()  # fonts and template modules, before the stage threads start
+    if args.jobs:
+        jobs = read_jobs(args.jobs)
+    else:
+        jobs = [(name, f"{name}.pdf", None) for name in args.templates]
+    if args.bundle:
+        from bundle import BundleSink
+        fmt = "tar.gz" if args.bundle.endswith(".tar.gz") else "tar" if args.bundle.endswith(".tar") else "zip"
+        with BundleSink(args.bundle, fmt) as bundle:
+            stats = render_pipeline(jobs, bundle_sink(bundle), parse_workers(args.workers), args.queue_size,
+                                    args.profile)
+    else:
+        stats = render_pipeline(jobs, file_sink(args.out_dir), parse_workers(args.workers), args.queue_size,
+                                args.profile)
+    print(stats.format())
@@ -0,0 +1,180 @@
+# rich_text.py
+# Rich text builder: paragraph fragments without the markup parser
+#
+# Templates that build paragraphs from data (CV sections, contacts, headings) used to
+# format reportlab mini-markup (<b>, <a href=...><u>...</u></a>, <br/>) only for
+# reportlab to parse it again in every Paragraph. RichText keeps the content as runs
+# and builds the fragments the parser would produce directly: same fonts, colors,
+# links and underlines, so paragraphs wrap and draw the same. User text needs no
+# escaping; markup() escapes it once for code that reads Paragraph.text.
+#
+# Runs use the text_backends.parse_markup format: (text, attrs) with attrs a frozenset
+# of "b", "i", "u" and ("a", url); a "\n" run is a line break.
+
+from xml.sax.saxutils import escape, quoteattr
+
+from reportlab.lib.fonts import ps2tt, tt2ps
+from reportlab.platypus import Paragraph
+from reportlab.platypus.paragraph import textTransformFrags
+from reportlab.platypus.paraparser import ParaFrag
+from reportlab.rl_config import platypus_link_underline
+
+from academic_styles import LINK_COLOR
+
+
+LINE_BREAK = ("\n", frozenset())
+
+
+def _link(attrs):
+    for a in attrs:
+        if isinstance(a, tuple):
+            return a[1]
+    return None
+
+
+class RichText:
+    """Paragraph content as styled runs; builds reportlab fragments directly"""
+
+    def __init__(self, text="", **attrs):
+        self.runs = []
+        if text:
+            self.add(text, **attrs)
+
+    @classmethod
+    def from_markup(cls, markup):
+        """RichText of reportlab markup (<b>, <i>, <u>, <a href>, <br/>; other tags dropped)"""
+        from text_backends import parse_markup
+        rich = cls()
+        rich.runs = [run for run in parse_markup(markup) if run[0]]
+        return rich
+
+    # ---------- Building ----------
+
+    def add(self, text, bold=False, italic=False, underline=False, link=None):
+        """Appends text (plain, not markup); returns self for chaining"""
+        if text:
+            attrs = {"b"} if bold else set()
+            if italic:
+                attrs.add("i")
+            if underline:
+                attrs.add("u")
+            if link:
+                attrs.add(("a", link))
+            self.runs.append((text, frozenset(attrs)))
+        return self
+
+    def bold(self, text):
+        return self.add(text, bold=True)
+
+    def italic(self, text):
+        return self.add(text, italic=True)
+
+    def link(self, text, url, underline=True):
+        """Link in academic style: link color, underlined"""
+        return self.add(text, underline=underline, link=url)
+
+    def line_break(self):
+        self.runs.append(LINE_BREAK)
+        return self
+
+    def extend(self, other):
+        self.runs.extend(other.runs)
+        return self
+
+    def __bool__(self):
+        return bool(self.runs)
+
+    # ---------- Output ----------
+
+    def plain(self):
+        return "".join(text for text, _ in self.runs)
+
+    def markup(self):
+        """Equivalent reportlab markup, text escaped"""
+        out = []
+        for text, attrs in self.runs:
+            if (text, attrs) == LINE_BREAK:
+                out.append("<br/>")
+                continue
+            text = escape(text)
+            for tag in ("u", "i", "b"):
+                if tag in attrs:
+                    text = f"<{tag}>{text}</{tag}>"
+            url = _link(attrs)
+            if url:
+                text = f'<a href={quoteattr(url)} color="{LINK_COLOR.hexval().replace("0x", "#")}">{text}</a>'
+            out.append(text)
+        return "".join(out)
+
+    def frags(self, style):
+        """Fragments as reportlab's parser builds them from markup() for style"""
+        family, bold, italic = ps2tt(style.fontName)
+        underline = (getattr(style, "underlineColor", ""), getattr(style, "underlineWidth", ""),
+                     getattr(style, "underlineOffset", ""))
+        gap = getattr(style, "underlineGap", "")
+        link_underline = getattr(style, "linkUnderline", platypus_link_underline)
+        frags, nlinks, nlines = [], 0, 0
+        prev_link = prev_line = None
+        space = None  # whether the text so far ends in collapsible whitespace (None: no text yet)
+        for text, attrs in self.runs:
+            frag = ParaFrag()
+            frag.rise = 0
+            frag.greek = 0
+            frag.fontSize = style.fontSize
+            frag.textColor = style.textColor
+            frag.link = []
+            frag.us_lines = []
+            if (text, attrs) == LINE_BREAK:
+                frag.bold, frag.italic = bold, italic
+                frag.fontName = tt2ps(family, bold, italic)
+                frag.lineBreak = True
+                frag.text = ""
+                frags.append(frag)
+                prev_link = prev_line = None
+                space = False
+                continue
+            # whitespace as cleanBlockQuotedText leaves it in markup(): collapsed to one
+            # space, also across untagged runs, and stripped at both ends
+            tagged = bool(attrs)
+            words = text.split()
+            lead = text[0].isspace() and (tagged or space is False)
+            trail = text[-1].isspace() and bool(words)
+            text = " " * lead + " ".join(words) + " " * trail
+            if tagged:
+                space = False
+            elif text:
+                space = text.endswith(" ")
+            if not text:
+                continue
+            frag.bold = 1 if "b" in attrs else bold
+            frag.italic = 1 if "i" in attrs else italic
+            frag.fontName = tt2ps(family, frag.bold, frag.italic)
+            url = _link(attrs)
+            if url:
+                if url != prev_link:
+                    link_id, nlinks = nlinks, nlinks + 1
+                    if link_underline:
+                        link_line, nlines = nlines, nlines + 1
+                frag.link = [(link_id, url)]
+                frag.textColor = LINK_COLOR
+                if link_underline:
+                    frag.us_lines.append((link_line, "underline", *underline, 0, 1, gap))
+            if "u" in attrs:
+                if prev_line is None or url != prev_link:
+                    prev_line, nlines = nlines, nlines + 1
+                frag.us_lines.append((prev_line, "underline", *underline, 0, 1, gap))
+            else:
+                prev_line = None
+            prev_link = url
+            frag.text = text
+            frags.append(frag)
+        if space:  # trailing whitespace of the last untagged run
+            frags[-1].text = frags[-1].text[:-1]
+            if not frags[-1].text:
+                frags.pop()
+        textTransformFrags(frags, style)
+        return frags
+
+    def paragraph(self, style, cls=Paragraph):
+        """Paragraph built from fragments; its text is the equivalent markup"""
+        return cls(self.markup(), style, frags=self.frags(style))
@@ -0,0 +1,236 @@
+# templates.py
+# Registry of document templates and helpers to load them by name
+
+import ast
+import copy
+import dataclasses
+import importlib
+import importlib.util
+import sys
+import types
+
+
+# ---------- Template Registry ----------
+
+# Template name -> generator module
+TEMPLATES = {
+    "academic_style": "generate_academic_style",
+    "application_withdrawal": "generate_application_withdrawal",
+    "career_break": "generate_career_break",
+    "counter_offer_response": "generate_counter_offer_response",
+    "cover_letter": "generate_cover_letter",
+    "cv": "generate_cv_academic",
+    "cv_classic": "generate_cv",
+    "follow_up": "generate_follow_up",
+    "informational_interview": "generate_informational_interview",
+    "linkedin_connection": "generate_linkedin_connection",
+    "networking_email": "generate_networking_email",
+    "portfolio_case": "generate_portfolio_case",
+    "portfolio_project": "generate_portfolio_project",
+    "recommendation_request": "generate_recommendation_request",
+    "recruiter_email": "generate_recruiter_email",
+    "reference_check_prep": "generate_reference_check_prep",
+    "rejection_response": "generate_rejection_response",
+    "resignation_letter": "generate_resignation_letter",
+    "salary_negotiation": "generate_salary_negotiation",
+    "thank_you_letter": "generate_thank_you_letter",
+}
+
+
+# Template name -> human-readable document title (bookmarks, listings)
+DOCUMENT_TITLES = {
+    "academic_style": "Style Document",
+    "application_withdrawal": "Application Withdrawal",
+    "career_break": "Career Break Explanation",
+    "counter_offer_response": "Counter-Offer Response",
+    "cover_letter": "Cover Letter",
+    "cv": "CV / Resume",
+    "cv_classic": "CV / Resume (Classic)",
+    "follow_up": "Follow-up Letter",
+    "informational_interview": "Informational Interview Request",
+    "linkedin_connection": "LinkedIn Connection Request",
+    "networking_email": "Networking Email",
+    "portfolio_case": "Portfolio Case Study",
+    "portfolio_project": "Portfolio Project Description",
+    "recommendation_request": "Recommendation Request",
+    "recruiter_email": "Recruiter Email",
+    "reference_check_prep": "Reference Check Preparation",
+    "rejection_response": "Rejection Response",
+    "resignation_letter": "Resignation Letter",
+    "salary_negotiation": "Salary Negotiation Letter",
+    "thank_you_letter": "Thank You Letter",
+}
+
+
+def template_module_name(name):
+    """Returns generator module name for template name (or module name itself)"""
+    if name in TEMPLATES:
+        return TEMPLATES[name]
+    if name in TEMPLATES.values():
+        return name
+    raise ValueError(f"Unknown template: {name}")
+
+
+# ---------- Loading with Overrides ----------
+
+class _DropAssignments(ast.NodeTransformer):
+    """Removes module-level assignments of overridden configuration variables"""
+
+    def __init__(self, names):
+        self.names = names
+
+    def visit_FunctionDef(self, node):
+        return node  # function bodies are left untouched
+
+    def visit_Assign(self, node):
+        if all(isinstance(t, ast.Name) and t.id in self.names for t in node.targets):
+            return None
+        return node
+
+    def visit_If(self, node):
+        self.generic_visit(node)
+        if not node.body:
+            node.body = [ast.Pass()]
+        return node
+
+
+def _module_settings(tree):
+    """Returns names assigned at module level (including inside variant if-blocks)"""
+    names = set()
+    for node in tree.body:
+        if not isinstance(node, (ast.Assign, ast.If)):
+            continue
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Assign):
+                names.update(t.id for t in sub.targets if isinstance(t, ast.Name))
+    return names
+
+
+_SOURCE_CACHE = {}  # module name -> (path, tree, settings)
+_CODE_CACHE = {}    # (module name, overridden names) -> code object
+
+
+def _read_source(module_name):
+    path = importlib.util.find_spec(module_name).origin
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    return path, tree, _module_settings(tree)
+
+
+def _parsed_source(module_name):
+    if module_name not in _SOURCE_CACHE:
+        _SOURCE_CACHE[module_name] = _read_source(module_name)
+    return _SOURCE_CACHE[module_name]
+
+
+def template_settings(name):
+    """Returns the configuration variables template name can be loaded with"""
+    return _parsed_source(template_module_name(name))[2]
+
+
+def template_path(name):
+    """Returns the source file of template name (whether or not it parses)"""
+    return importlib.util.find_spec(template_module_name(name)).origin
+
+
+def reload_template(name):
+    """Re-reads template name from its (edited) source file, so later loads with and
+    without overrides execute the new source. The imported module is updated with the
+    globals of the new source, executed from the source rather than a bytecode cache
+    that may predate the edit. If that raises, the previous source stays loaded."""
+    module_name = template_module_name(name)
+    source = _read_source(module_name)
+    path, tree, _ = source
+    module = sys.modules.get(module_name)
+    if module is not None:
+        namespace = {key: value for key, value in vars(module).items() if key.startswith("__")}
+        exec(compile(tree, path, "exec"), namespace)
+        module.__dict__.update(namespace)
+    _SOURCE_CACHE[module_name] = source
+    for key in [key for key in _CODE_CACHE if key[0] == module_name]:
+        del _CODE_CACHE[key]
+
+
+def load_template(name, **overrides):
+    """Loads template module; keyword overrides replace its configuration variables.
+
+    Without overrides the regular (shared) module is returned. With overrides a fresh
+    module instance is executed, so letter text such as BODY is rendered from the new
+    values, e.g. load_template("follow_up", COMPANY_NAME="Acme", FOLLOW_UP_TYPE="AFTER_INTERVIEW").
+    """
+    module_name = template_module_name(name)
+    if not overrides:
+        return importlib.import_module(module_name)
+
+    path, tree, settings = _parsed_source(module_name)
+    unknown = set(overrides) - settings
+    if unknown:
+        raise ValueError(f"Unknown settings for {name}: {', '.join(sorted(unknown))}")
+
+    key = (module_name, frozenset(overrides))
+    if key not in _CODE_CACHE:
+        stripped = _DropAssignments(key[1]).visit(copy.deepcopy(tree))
+        _CODE_CACHE[key] = compile(ast.fix_missing_locations(stripped), path, "exec")
+
+    module = types.ModuleType(module_name)
+    module.__file__ = path
+    module.__dict__.update(overrides)
+    exec(_CODE_CACHE[key], module.__dict__)
+    return module
+
+
+# ---------- Rendering ----------
+
+@dataclasses.dataclass(frozen=True)
+class RenderInput:
+    """Everything one render depends on: template name, configuration overrides (as
+    sorted (name, value) pairs) and output profile.
+
+    Renders share no mutable state: each input with overrides is executed as its own
+    module instance (and gets a deep copy of the override values), one without uses
+    the imported module, whose globals build_pdf() only reads. So render() may be
+    called for different inputs from several threads at once.
+    """
+
+    template: str
+    overrides: tuple = ()
+    profile: str = "default"
+
+    @classmethod
+    def of(cls, template, profile="default", **overrides):
+        template_module_name(template)  # raises ValueError for unknown templates
+        return cls(template, tuple(sorted(overrides.items())), profile)
+
+    def load(self):
+        """Returns the template module for this input"""
+        return load_template(self.template, **copy.deepcopy(dict(self.overrides)))
+
+
+# Callables hook(name, path, module, overrides) run after every render. Hooks need
+# not be thread-safe: renders in a thread pool leave them to the submitting thread.
+RENDER_HOOKS = []
+
+
+def run_render_hooks(job, path, module):
+    """Runs RENDER_HOOKS for RenderInput job rendered to path as module"""
+    for hook in RENDER_HOOKS:
+        hook(job.template, path, module, dict(job.overrides))
+
+
+def render(job, path=None, hooks=True):
+    """Renders RenderInput job to PDF at path (file name or file object; the
+    template's default name if None), returns the template module. With hooks=False
+    the caller runs the render hooks (run_render_hooks())."""
+    module = job.load()
+    if path is None:
+        module.build_pdf(profile=job.profile)
+    else:
+        module.build_pdf(path, job.profile)
+    if hooks:
+        run_render_hooks(job, path, module)
+    return module
+
+
+def render_template(name, path=None, profile="default", **overrides):
+    """Renders template to PDF (default output name if path is None)"""
+    return render(RenderInput.of(name, profile, **overrides), path)
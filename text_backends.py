@@ -0,0 +1,204 @@
+# text_backends.py
+# Plain text, HTML email and Markdown output for letter templates
+#
+# Uses the same template content (NAME, LINKS, BODY and their variants) as the PDF
+# generators, but skips layout and font embedding. Useful for messages that are
+# pasted into email or LinkedIn message boxes.
+
+import html
+import re
+
+from templates import load_template
+
+
+FORMATS = ("text", "html", "markdown")
+
+_TAG_RE = re.compile(r"<(/?)(\w+)([^>]*?)/?>")
+_HREF_RE = re.compile(r'href\s*=\s*"([^"]*)"')
+_ENTITY_RE = re.compile(r"&(amp|lt|gt|quot|#\d+);")
+
+
+# ---------- Markup Parsing ----------
+
+def _unescape(text):
+    return _ENTITY_RE.sub(lambda m: html.unescape(m.group(0)), text)
+
+
+def parse_markup(markup):
+    """Splits reportlab paragraph markup into runs.
+
+    Returns list of (text, attrs) where attrs is a frozenset of "b", "i", "u" and
+    ("a", url) entries; line breaks (<br/>) become "\\n" runs.
+    """
+    runs = []
+    active = []
+    pos = 0
+    for m in _TAG_RE.finditer(markup):
+        if m.start() > pos:
+            runs.append((_unescape(markup[pos:m.start()]), frozenset(active)))
+        pos = m.end()
+        closing, tag, attrs = m.group(1), m.group(2).lower(), m.group(3)
+        if tag == "br":
+            runs.append(("\n", frozenset()))
+        elif tag in ("b", "strong", "i", "em", "u", "a"):
+            key = {"strong": "b", "em": "i"}.get(tag, tag)
+            if key == "a":
+                href = _HREF_RE.search(attrs)
+                key = ("a", href.group(1) if href else "")
+            if not closing:
+                active.append(key)
+            else:
+                for i in range(len(active) - 1, -1, -1):
+                    if active[i] == key or (tag == "a" and active[i][0] == "a"):
+                        del active[i]
+                        break
+        # other tags (font, span, ...) only affect PDF appearance
+    if pos < len(markup):
+        runs.append((_unescape(markup[pos:]), frozenset(active)))
+    return runs
+
+
+def _link(attrs):
+    for a in attrs:
+        if isinstance(a, tuple):
+            return a[1]
+    return None
+
+
+def _group_links(runs):
+    """Merges consecutive runs that belong to the same link"""
+    out = []
+    for text, attrs in runs:
+        if out and _link(attrs) and _link(out[-1][1]) == _link(attrs):
+            out[-1] = (out[-1][0] + text, out[-1][1] | attrs)
+        else:
+            out.append((text, attrs))
+    return out
+
+
+# ---------- Inline Renderers ----------
+
+def _display_url(url):
+    return url[len("mailto:"):] if url.startswith("mailto:") else url
+
+
+def markup_to_text(markup):
+    """Plain text; links as "name (url)" unless the name is the URL itself"""
+    out = []
+    for text, attrs in _group_links(parse_markup(markup)):
+        url = _link(attrs)
+        if url and _display_url(url) not in (text, "https://" + text, "http://" + text):
+            out.append(f"{text} ({_display_url(url)})")
+        else:
+            out.append(text)
+    return "".join(out)
+
+
+def markup_to_markdown(markup):
+    """Markdown with **bold**, *italic* and [name](url) links; line breaks kept"""
+    out = []
+    for text, attrs in _group_links(parse_markup(markup)):
+        if text == "\n":
+            out.append(text)
+            continue
+        text = re.sub(r"([\\`*_\[\]])", r"\\\1", text)
+        if "b" in attrs and text.strip():
+            text = f"**{text}**"
+        if "i" in attrs and text.strip():
+            text = f"*{text}*"
+        url = _link(attrs)
+        if url:
+            text = f"[{text}]({url})"
+        out.append(text)
+    return re.sub(r" *\n", "  \n", "".join(out))
+
+
+def markup_to_html(markup):
+    """HTML fragment with escaped text, <b>/<i>/<u> and links"""
+    out = []
+    for text, attrs in _group_links(parse_markup(markup)):
+        if text == "\n":
+            out.append("<br>")
+            continue
+        text = html.escape(text, quote=False)
+        for tag in ("u", "i", "b"):
+            if tag in attrs:
+                text = f"<{tag}>{text}</{tag}>"
+        url = _link(attrs)
+        if url:
+            text = f'<a href="{html.escape(url)}" style="color:#1a1a1a">{text}</a>'
+        out.append(text)
+    return "".join(out)
+
+
+# ---------- Documents ----------
+
+def _paragraphs(body):
+    """Splits letter body into paragraphs (blank-line separated, single newlines kept)"""
+    return [p.strip("\n") for p in re.split(r"\n\s*\n", body.strip()) if p.strip()]
+
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body style="font-family:'Times New Roman',Times,serif;font-size:15px;line-height:1.4;color:#1a1a1a">
+{content}
+</body>
+</html>
+"""
+
+
+def render_document(module, format="text", header=True):
+    """Renders letter template module (NAME, LINKS, BODY) as text, html or markdown"""
+    if format not in FORMATS:
+        raise ValueError(f"Unknown format: {format} (use one of {', '.join(FORMATS)})")
+    if not hasattr(module, "BODY"):
+        raise ValueError(f"Template {module.__name__} has no BODY text")
+    nz = module.nz
+    name, links = nz(module.NAME), nz(getattr(module, "LINKS", ""))
+    paragraphs = _paragraphs(nz(module.BODY))
+
+    if format == "text":
+        parts = [name, markup_to_text(links)] if header else []
+        parts += [markup_to_text(p) for p in paragraphs]
+        return "\n\n".join(p for p in parts if p) + "\n"
+
+    if format == "markdown":
+        parts = [f"**{markup_to_markdown(name)}**", markup_to_markdown(links)] if header else []
+        parts += [markup_to_markdown(p) for p in paragraphs]
+        return "\n\n".join(p for p in parts if p) + "\n"
+
+    content = []
+    if header:
+        content.append(f'<p style="font-weight:bold;font-size:17px;margin:0 0 4px">{markup_to_html(name)}</p>')
+        if links:
+            content.append(f'<p style="color:#4a4a4a;font-size:13px;margin:0 0 24px">{markup_to_html(links)}</p>')
+    content += [f"<p>{markup_to_html(p).replace(chr(10), '<br>')}</p>" for p in paragraphs]
+    return HTML_TEMPLATE.format(title=html.escape(name), content="\n".join(content))
+
+
+def render_text(name, format="text", header=True, **overrides):
+    """Loads template (with configuration overrides) and renders it without PDF layout"""
+    return render_document(load_template(name, **overrides), format, header)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render a letter template as text, HTML or Markdown")
+    parser.add_argument("template", help="template name, e.g. linkedin_connection")
+    parser.add_argument("--format", default="text", choices=FORMATS)
+    parser.add_argument("--no-header", action="store_true", help="omit name and links header")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE",
+                        help="override configuration variable (repeatable)")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args()
+
+    overrides = dict(item.split("=", 1) for item in args.set)
+    result = render_text(args.template, args.format, not args.no_header, **overrides)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(result)
+        print(f"✅ Generated: {args.output}")
+    else:
+        print(result, end="")
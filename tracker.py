@@ -0,0 +1,348 @@
+# tracker.py
+# Local application tracker (SQLite) that drives bulk document generation
+#
+# Applications live in one SQLite file with indexes on company, status and dates,
+# so queries like "no reply after 10 days" stay fast with thousands of rows. Query
+# results are mapped onto template configuration variables (COMPANY_NAME,
+# CONTACT_NAME, FOLLOW_UP_TYPE, ...) and rendered in bulk.
+
+import datetime
+import os
+import re
+import sqlite3
+import time
+
+
+DEFAULT_DB = "applications.db"
+
+STATUSES = ("applied", "interviewing", "offer", "rejected", "withdrawn", "accepted")
+
+# Statuses where we are waiting for the company to get back to us
+WAITING_STATUSES = ("applied", "interviewing")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    id              INTEGER PRIMARY KEY,
+    company         TEXT NOT NULL,
+    role            TEXT NOT NULL DEFAULT '',
+    contact_name    TEXT NOT NULL DEFAULT '',
+    contact_email   TEXT NOT NULL DEFAULT '',
+    status          TEXT NOT NULL DEFAULT 'applied',
+    applied_on      TEXT NOT NULL,
+    interview_on    TEXT,
+    last_contact_on TEXT NOT NULL,
+    replied_on      TEXT,
+    notes           TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (company);
+CREATE INDEX IF NOT EXISTS idx_applications_status_contact ON applications (status, last_contact_on);
+CREATE INDEX IF NOT EXISTS idx_applications_applied ON applications (applied_on);
+"""
+
+COLUMNS = ("company", "role", "contact_name", "contact_email", "status",
+           "applied_on", "interview_on", "last_contact_on", "replied_on", "notes")
+DATE_COLUMNS = ("applied_on", "interview_on", "last_contact_on", "replied_on")
+
+# Template configuration variable -> applications column
+TEMPLATE_FIELDS = {
+    "application_withdrawal": {"CONTACT_NAME": "contact_name", "COMPANY_NAME": "company", "POSITION": "role"},
+    "cover_letter": {"COMPANY": "company", "ROLE": "role"},
+    "follow_up": {"CONTACT_NAME": "contact_name", "COMPANY_NAME": "company"},
+    "recruiter_email": {"RECRUITER_NAME": "contact_name", "COMPANY_NAME": "company", "POSITION": "role"},
+    "rejection_response": {"HIRING_MANAGER_NAME": "contact_name", "COMPANY_NAME": "company", "POSITION": "role"},
+    "salary_negotiation": {"HIRING_MANAGER_NAME": "contact_name", "COMPANY_NAME": "company", "POSITION": "role"},
+    "thank_you_letter": {"INTERVIEWER_NAME": "contact_name", "COMPANY_NAME": "company", "POSITION": "role"},
+}
+
+
+# ---------- Helpers ----------
+
+def _date(value):
+    """Accepts date, datetime or ISO string; returns ISO date string (None stays None)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    try:
+        return datetime.date.fromisoformat(str(value)).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid date: {value!r} (use YYYY-MM-DD)")
+
+
+def _today(today=None):
+    return datetime.date.fromisoformat(_date(today)) if today else datetime.date.today()
+
+
+def time_passed(since, today=None):
+    """Human-readable time span for TIME_PASSED, e.g. "10 days" or "2 weeks" """
+    days = (_today(today) - datetime.date.fromisoformat(since)).days
+    if days < 14:
+        return f"{days} day{'s' if days != 1 else ''}"
+    if days < 60:
+        return f"{days // 7} weeks"
+    return f"{days // 30} months"
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_") or "Company"
+
+
+# ---------- Tracker ----------
+
+class Tracker:
+    """Application tracker backed by one SQLite file"""
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _values(self, fields):
+        unknown = set(fields) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown application fields: {', '.join(sorted(unknown))}")
+        if "status" in fields and fields["status"] not in STATUSES:
+            raise ValueError(f"Unknown status: {fields['status']} (use one of {', '.join(STATUSES)})")
+        return {k: _date(v) if k in DATE_COLUMNS else v for k, v in fields.items()}
+
+    # ----- Writing -----
+
+    def add(self, company, applied_on=None, **fields):
+        """Adds application, returns its id"""
+        return self.add_many([dict(fields, company=company, applied_on=applied_on)])[0]
+
+    def add_many(self, rows):
+        """Adds applications (dicts of column values) in one transaction, returns their ids"""
+        ids = []
+        with self.db:
+            for row in rows:
+                values = self._values({k: v for k, v in row.items() if v not in (None, "")})
+                if not values.get("company"):
+                    raise ValueError("Application needs a company")
+                values.setdefault("applied_on", datetime.date.today().isoformat())
+                values.setdefault("last_contact_on", values["applied_on"])
+                names = ", ".join(values)
+                marks = ", ".join("?" * len(values))
+                cur = self.db.execute(f"INSERT INTO applications ({names}) VALUES ({marks})", list(values.values()))
+                ids.append(cur.lastrowid)
+        return ids
+
+    def import_csv(self, csv_path):
+        """Imports applications from CSV with column names as in the table; returns ids"""
+        import csv
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            return self.add_many(list(csv.DictReader(f)))
+
+    def update(self, app_id, **fields):
+        """Updates columns of one application"""
+        values = self._values(fields)
+        if not values:
+            return
+        assignments = ", ".join(f"{k} = ?" for k in values)
+        with self.db:
+            cur = self.db.execute(f"UPDATE applications SET {assignments} WHERE id = ?", [*values.values(), app_id])
+        if not cur.rowcount:
+            raise ValueError(f"No application with id {app_id}")
+
+    def set_status(self, app_id, status, on=None):
+        """Moves application to a new status; interviews and replies also record the date"""
+        on = _date(on) or datetime.date.today().isoformat()
+        fields = {"status": status}
+        if status == "interviewing":
+            fields.update(interview_on=on, last_contact_on=on)
+        elif status in ("offer", "rejected"):
+            fields["replied_on"] = on
+        self.update(app_id, **fields)
+
+    def record_contact(self, ids, on=None):
+        """Sets last_contact_on (e.g. after sending follow-ups) for applications"""
+        on = _date(on) or datetime.date.today().isoformat()
+        with self.db:
+            self.db.executemany("UPDATE applications SET last_contact_on = ? WHERE id = ?", [(on, i) for i in ids])
+
+    # ----- Queries -----
+
+    def query(self, where="1", params=(), order="applied_on"):
+        """Runs SELECT on applications with a WHERE clause; returns list of sqlite3.Row"""
+        return self.db.execute(f"SELECT * FROM applications WHERE {where} ORDER BY {order}", params).fetchall()
+
+    def get(self, app_id):
+        rows = self.query("id = ?", (app_id,))
+        if not rows:
+            raise ValueError(f"No application with id {app_id}")
+        return rows[0]
+
+    def by_status(self, status):
+        return self.query("status = ?", (status,))
+
+    def by_company(self, company):
+        return self.query("company = ?", (company,))
+
+    def no_reply(self, days, today=None, statuses=WAITING_STATUSES):
+        """Applications still waiting for a reply `days` or more days after the last contact"""
+        cutoff = (_today(today) - datetime.timedelta(days=days)).isoformat()
+        # One index range scan per status on (status, last_contact_on)
+        marks = ", ".join("?" * len(statuses))
+        return self.query(
+            f"status IN ({marks}) AND last_contact_on <= ? AND replied_on IS NULL",
+            (*statuses, cutoff),
+            order="last_contact_on",
+        )
+
+    def explain(self, where, params=()):
+        """Query plan of a WHERE clause (to check that indexes are used)"""
+        rows = self.db.execute(f"EXPLAIN QUERY PLAN SELECT * FROM applications WHERE {where}", params)
+        return [row["detail"] for row in rows]
+
+
+# ---------- Bulk Generation ----------
+
+def template_overrides(template, row, today=None):
+    """Maps application row onto template configuration variables"""
+    if template not in TEMPLATE_FIELDS:
+        raise ValueError(f"Template {template} can't be filled from the tracker (use one of {', '.join(sorted(TEMPLATE_FIELDS))})")
+    overrides = {var: row[column] for var, column in TEMPLATE_FIELDS[template].items() if row[column]}
+    if template == "follow_up":
+        overrides["FOLLOW_UP_TYPE"] = "AFTER_INTERVIEW" if row["status"] == "interviewing" else "AFTER_APPLICATION"
+        overrides["TIME_PASSED"] = time_passed(row["last_contact_on"], today)
+    elif template == "thank_you_letter" and row["interview_on"]:
+        day = datetime.date.fromisoformat(row["interview_on"])
+        overrides["INTERVIEW_DATE"] = f"{day:%B} {day.day}, {day.year}"
+    return overrides
+
+
+def build_jobs(rows, template, out_dir=".", today=None):
+    """Returns worker_pool jobs [(template, path, overrides), ...] for application rows"""
+    return [
+        (template, os.path.join(out_dir, f"{template}_{_slug(row['company'])}_{row['id']}.pdf"),
+         template_overrides(template, row, today))
+        for row in rows
+    ]
+
+
+def generate(rows, template, out_dir=".", processes=None, profile="default", today=None):
+    """Renders template for every application row; returns (paths, seconds).
+
+    processes=1 renders in this process; otherwise a worker pool is used.
+    """
+    import contextlib
+    import io
+
+    from templates import render_template
+    from worker_pool import render_batch
+
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = build_jobs(rows, template, out_dir, today)
+    start = time.perf_counter()
+    if processes == 1:
+        paths = []
+        for name, path, overrides in jobs:
+            with contextlib.redirect_stdout(io.StringIO()):
+                render_template(name, path, profile, **overrides)
+            paths.append(path)
+    else:
+        paths = render_batch(jobs, processes, profile=profile) if jobs else []
+    return paths, time.perf_counter() - start
+
+
+def _print_rows(rows):
+    for row in rows:
+        contact = f" · {row['contact_name']}" if row["contact_name"] else ""
+        print(f"{row['id']:>5}  {row['status']:<12} {row['company']} — {row['role']}{contact}"
+              f"  (applied {row['applied_on']}, last contact {row['last_contact_on']})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from pdf_output import OUTPUT_PROFILES
+
+    parser = argparse.ArgumentParser(description="Track applications and generate documents for them")
+    parser.add_argument("--db", default=DEFAULT_DB, help=f"SQLite file (default: {DEFAULT_DB})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add application")
+    add.add_argument("company")
+    add.add_argument("--role", default="")
+    add.add_argument("--contact", default="")
+    add.add_argument("--email", default="")
+    add.add_argument("--applied", help="date applied (YYYY-MM-DD, default: today)")
+
+    imp = commands.add_parser("import", help="import applications from CSV")
+    imp.add_argument("csv")
+
+    lst = commands.add_parser("list", help="list applications")
+    lst.add_argument("--status", choices=STATUSES)
+    lst.add_argument("--company")
+
+    status = commands.add_parser("status", help="change application status")
+    status.add_argument("id", type=int)
+    status.add_argument("status", choices=STATUSES)
+    status.add_argument("--on", help="date (default: today)")
+
+    wait = commands.add_parser("no-reply", help="applications without reply after N days")
+    wait.add_argument("--days", type=int, default=10)
+
+    gen = commands.add_parser("generate", help="generate a template for matching applications")
+    gen.add_argument("template", choices=sorted(TEMPLATE_FIELDS))
+    select = gen.add_mutually_exclusive_group(required=True)
+    select.add_argument("--no-reply", type=int, metavar="DAYS", help="applications without reply after DAYS")
+    select.add_argument("--status", choices=STATUSES)
+    select.add_argument("--id", type=int, action="append", help="application id (repeatable)")
+    gen.add_argument("-o", "--out-dir", default=".")
+    gen.add_argument("-j", "--processes", type=int, default=None)
+    gen.add_argument("--profile", default="default", choices=sorted(OUTPUT_PROFILES))
+    gen.add_argument("--mark-contacted", action="store_true", help="set last contact date to today")
+
+    args = parser.parse_args()
+
+    with Tracker(args.db) as tracker:
+        if args.command == "add":
+            app_id = tracker.add(args.company, args.applied, role=args.role,
+                                 contact_name=args.contact, contact_email=args.email)
+            print(f"✅ Added application {app_id}")
+        elif args.command == "import":
+            print(f"✅ Imported {len(tracker.import_csv(args.csv))} applications")
+        elif args.command == "list":
+            if args.status:
+                _print_rows(tracker.by_status(args.status))
+            elif args.company:
+                _print_rows(tracker.by_company(args.company))
+            else:
+                _print_rows(tracker.query())
+        elif args.command == "status":
+            tracker.set_status(args.id, args.status, args.on)
+            print(f"✅ Application {args.id}: {args.status}")
+        elif args.command == "no-reply":
+            start = time.perf_counter()
+            rows = tracker.no_reply(args.days)
+            elapsed = (time.perf_counter() - start) * 1000
+            _print_rows(rows)
+            print(f"{len(rows)} application(s) without reply after {args.days} days ({elapsed:.1f} ms)")
+        elif args.command == "generate":
+            start = time.perf_counter()
+            if args.no_reply is not None:
+                rows = tracker.no_reply(args.no_reply)
+            elif args.status:
+                rows = tracker.by_status(args.status)
+            else:
+                rows = [tracker.get(i) for i in args.id]
+            query_ms = (time.perf_counter() - start) * 1000
+            paths, seconds = generate(rows, args.template, args.out_dir, args.processes, args.profile)
+            if args.mark_contacted:
+                tracker.record_contact([row["id"] for row in rows])
+            rate = f", {len(paths) / seconds:.1f} docs/s" if paths else ""
+            print(f"✅ Generated {len(paths)} x {args.template} in {args.out_dir}"
+                  f"  (query {query_ms:.1f} ms, render {seconds:.2f}s{rate})")
@@ -0,0 +1,390 @@
+# watch.py
+# Watch mode: a warm process re-renders documents when their files change, with a
+# live preview in the browser
+#
+# Running a generator script pays the full cold start every time: Python, reportlab,
+# font parsing and registration, the template module. Watch mode pays it once. It then
+# polls the files each document depends on: the template's source file, the jobs CSV,
+# and files named by the template's configuration (IMAGES paths, ...). After a change
+# it re-renders only the affected documents. An edited template is re-executed in
+# place (templates.reload_template()), so the fonts, layout cache and imported modules
+# stay warm.
+#
+# The latest PDF of every document is kept in memory, written to the output
+# directory and served by a small HTTP server on localhost. The preview page long-polls
+# the server and reloads the PDF as soon as a new version exists. For every change the
+# edit-to-preview latency is reported: from the file's modification time to the new
+# PDF being ready (console), and to the browser having loaded it (preview page).
+#
+# A template that fails to render keeps its last good PDF; the preview shows the
+# error until the next change. Changes to shared modules (academic_styles.py, ...)
+# are reported but need a restart.
+
+import contextlib
+import html
+import http.server
+import io
+import json
+import os
+import sys
+import threading
+import time
+import urllib.parse
+
+from templates import TEMPLATES, RenderInput, reload_template, render, template_module_name, template_path
+from worker_pool import REPO_DIR, preload, read_jobs
+
+
+POLL_INTERVAL = 0.05  # seconds between checks of the watched files
+WAIT_TIMEOUT = 25     # seconds a preview page's long poll waits for a new version
+DEFAULT_PORT = 8000
+
+
+# ---------- Documents ----------
+
+class WatchedDocument:
+    """A document kept up to date: its job, the files it depends on and its latest PDF"""
+
+    def __init__(self, output, job):
+        self.output, self.job = output, job
+        self.files = set()
+        self.pdf = None
+        self.version = 0
+        self.error = None
+        self.render_time = None
+        self.changed_at = None  # modification time of the change rendered last
+        self.latency = None     # seconds from that change to the PDF being ready
+
+    def state(self):
+        return {"version": self.version, "error": self.error, "render_ms": _ms(self.render_time),
+                "changed_at": self.changed_at, "latency_ms": _ms(self.latency)}
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000)
+
+
+def _referenced_files(value, found):
+    """Adds the existing files named by strings in value (nested lists, dicts) to found"""
+    if isinstance(value, str):
+        if len(value) < 4096 and "\n" not in value and os.path.isfile(value):
+            found.add(os.path.abspath(value))
+    elif isinstance(value, dict):
+        for item in value.values():
+            _referenced_files(item, found)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _referenced_files(item, found)
+
+
+def _source(name):
+    return os.path.abspath(template_path(name))
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# ---------- Watcher ----------
+
+class Watcher:
+    """Renders jobs [(template, output, overrides), ...] (or those of jobs_csv) and
+    re-renders them whenever their files change"""
+
+    def __init__(self, jobs=None, jobs_csv=None, out_dir=".", profile="default"):
+        self.jobs_csv = os.path.abspath(jobs_csv) if jobs_csv else None
+        self.out_dir, self.profile = out_dir, profile
+        self.documents = {}
+        self.version = 0  # bumped after every render round
+        self._jobs = list(jobs or [])
+        self._stats = {}
+        self._shared = {}
+        self._changed = threading.Condition()
+
+    # Rendering
+
+    def _read_jobs(self):
+        if self.jobs_csv is None:
+            return self._jobs
+        return list(read_jobs(self.jobs_csv))
+
+    def _sync_jobs(self):
+        """Updates documents from the job list; returns those that are new or changed.
+
+        The preview server's threads iterate documents: it is replaced, not changed.
+        """
+        documents, affected = {}, []
+        for name, output, overrides in self._read_jobs():
+            job = RenderInput.of(name, self.profile, **(overrides or {}))
+            doc = self.documents.get(output)
+            if doc is None or doc.job != job:
+                doc = WatchedDocument(output, job)
+                affected.append(doc)
+            documents[output] = doc
+        with self._changed:
+            self.documents = documents
+        return affected
+
+    def _render(self, doc, changed_at=None):
+        start = time.perf_counter()
+        buf = io.BytesIO()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = render(doc.job, buf)
+            if self.out_dir is not None:
+                path = os.path.join(self.out_dir, doc.output)
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(buf.getvalue())
+        except Exception as e:
+            doc.error = f"{type(e).__name__}: {e}"
+            doc.files.add(_source(doc.job.template))
+            print(f"⚠️  {doc.output}: {doc.error}")
+            return False
+        doc.render_time = time.perf_counter() - start
+        doc.pdf, doc.error = buf.getvalue(), None
+        doc.files = {_source(doc.job.template)}
+        for key, value in vars(module).items():
+            if key.isupper():
+                _referenced_files(value, doc.files)
+        doc.changed_at = changed_at
+        doc.latency = time.time() - changed_at if changed_at is not None else None
+        return True
+
+    def _publish(self, docs):
+        with self._changed:
+            self.version += 1
+            for doc in docs:
+                doc.version = self.version
+            self._changed.notify_all()
+
+    def start(self):
+        """Renders every document (warming the process); returns the seconds taken"""
+        start = time.perf_counter()
+        preload()
+        if self.jobs_csv:
+            self._stats[self.jobs_csv] = _stat(self.jobs_csv)
+        docs = self._sync_jobs()
+        for doc in docs:
+            self._render(doc)
+        self._publish(docs)
+        for doc in docs:
+            for path in doc.files:
+                self._stats.setdefault(path, _stat(path))
+        template_files = {_source(name) for name in TEMPLATES}
+        for module in list(sys.modules.values()):
+            path = getattr(module, "__file__", None)
+            path = path and os.path.abspath(path)
+            if path and os.path.dirname(path) == REPO_DIR and path not in template_files:
+                self._shared[path] = _stat(path)
+        return time.perf_counter() - start
+
+    # Watching
+
+    def _changed_files(self):
+        changed = {}
+        for path, old in self._stats.items():
+            new = _stat(path)
+            if new is not None and new != old:  # a missing file is mid-save: wait for it
+                self._stats[path] = new
+                changed[path] = new[0] / 1e9
+        return changed
+
+    def poll(self):
+        """Re-renders the documents affected by files changed since the last call;
+        returns them"""
+        for path, old in self._shared.items():
+            new = _stat(path)
+            if new is not None and new != old:
+                self._shared[path] = new
+                print(f"⚠️  {os.path.basename(path)} changed: restart watch mode to apply it")
+        changed = self._changed_files()
+        if not changed:
+            return []
+        changed_at = max(changed.values())
+
+        affected = {}
+        if self.jobs_csv in changed:
+            try:
+                for doc in self._sync_jobs():
+                    affected[doc.output] = doc
+            except (OSError, ValueError, KeyError) as e:
+                print(f"⚠️  {os.path.basename(self.jobs_csv)}: {e}")
+        broken = {}  # template -> error of its edited source
+        for name in {doc.job.template for doc in self.documents.values()}:
+            try:
+                if _source(name) in changed:
+                    reload_template(name)
+            except SyntaxError as e:
+                broken[name] = f"SyntaxError: {e.msg} ({os.path.basename(e.filename or '')}, line {e.lineno})"
+            except Exception as e:  # raised by the template's top level (NameError in DATA, ...)
+                broken[name] = f"{type(e).__name__}: {e}"
+        for doc in self.documents.values():
+            if doc.files & changed.keys():
+                affected[doc.output] = doc
+
+        rendered = []
+        for doc in affected.values():
+            if doc.job.template in broken:
+                doc.error = broken[doc.job.template]  # the module still holds the previous source
+                print(f"⚠️  {doc.output}: {doc.error}")
+            elif self._render(doc, changed_at):
+                rendered.append(doc)
+        self._publish(affected.values())
+        for doc in rendered:
+            for path in doc.files:
+                self._stats.setdefault(path, _stat(path))
+            print(f"✅ {doc.output}: re-rendered in {_ms(doc.render_time)} ms, "
+                  f"edit → PDF {_ms(doc.latency)} ms")
+        return list(affected.values())
+
+    def run(self, interval=POLL_INTERVAL):
+        """Polls for changes until interrupted; an error in one round is reported and
+        the next round watches on"""
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"⚠️  {type(e).__name__}: {e}")
+            time.sleep(interval)
+
+    def wait(self, since, timeout=WAIT_TIMEOUT):
+        """Blocks until a render round after version since (or timeout); returns the state"""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version > since, timeout)
+            return {"version": self.version,
+                    "documents": {output: doc.state() for output, doc in self.documents.items()}}
+
+
+# ---------- Preview Server ----------
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} — preview</title>
+<style>
+  body {{ margin: 0; font: 14px sans-serif; display: flex; flex-direction: column; height: 100vh; }}
+  header {{ padding: 6px 10px; background: #eee; display: flex; gap: 16px; align-items: center; }}
+  #error {{ color: #b00; white-space: pre-wrap; }}
+  iframe {{ flex: 1; border: 0; }}
+</style></head>
+<body>
+<header><select id="doc">{options}</select><span id="status">loading…</span><span id="error"></span></header>
+<iframe id="pdf"></iframe>
+<script>
+const select = document.getElementById("doc"), frame = document.getElementById("pdf");
+const status = document.getElementById("status"), error = document.getElementById("error");
+let since = 0, shown = null;
+select.onchange = () => {{ location.search = "?doc=" + encodeURIComponent(select.value); }};
+async function update() {{
+  while (true) {{
+    let state;
+    try {{
+      state = await (await fetch("/wait?since=" + since)).json();
+    }} catch (e) {{
+      status.textContent = "preview server stopped";
+      await new Promise(r => setTimeout(r, 1000));
+      continue;
+    }}
+    since = state.version;
+    const doc = state.documents[select.value];
+    if (!doc) continue;
+    error.textContent = doc.error || "";
+    if (doc.version !== shown && !doc.error) {{
+      shown = doc.version;
+      frame.onload = () => {{
+        status.textContent = doc.changed_at === null ? `rendered in ${{doc.render_ms}} ms`
+          : `rendered in ${{doc.render_ms}} ms, edit → preview ${{Date.now() - Math.round(doc.changed_at * 1000)}} ms`;
+      }};
+      frame.src = "/pdf/" + encodeURIComponent(select.value) + "?v=" + doc.version;
+    }}
+  }}
+}}
+update();
+</script>
+</body></html>
+"""
+
+
+class PreviewHandler(http.server.BaseHTTPRequestHandler):
+    """Preview page, latest PDFs (/pdf/<output>) and long-polled state (/wait?since=N)"""
+
+    watcher = None
+
+    def _send(self, body, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        documents = self.watcher.documents
+        if url.path == "/":
+            selected = query.get("doc", [next(iter(documents), "")])[0]
+            options = "".join(f'<option{" selected" if output == selected else ""}>{html.escape(output)}</option>'
+                              for output in sorted(documents))
+            page = PAGE.format(title=html.escape(selected), options=options)
+            self._send(page.encode("utf-8"), "text/html; charset=utf-8")
+        elif url.path == "/wait":
+            try:
+                since = int(query.get("since", ["0"])[0])
+            except ValueError:
+                self._send(b"since must be a version number", "text/plain", 400)
+                return
+            self._send(json.dumps(self.watcher.wait(since)).encode("utf-8"), "application/json")
+        elif url.path.startswith("/pdf/"):
+            doc = documents.get(urllib.parse.unquote(url.path[len("/pdf/"):]))
+            if doc is None or doc.pdf is None:
+                self._send(b"no such document", "text/plain", 404)
+            else:
+                self._send(doc.pdf, "application/pdf")
+        else:
+            self._send(b"not found", "text/plain", 404)
+
+    def log_message(self, format, *args):
+        pass  # one line per request would drown the render reports
+
+
+def serve(watcher, port=DEFAULT_PORT, host="127.0.0.1"):
+    """Starts the preview server for watcher in a background thread; returns it"""
+    handler = type("Handler", (PreviewHandler,), {"watcher": watcher})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="preview-server", daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from pdf_output import OUTPUT_PROFILES
+
+    parser = argparse.ArgumentParser(description="Re-render documents when their files change, with a live preview")
+    parser.add_argument("templates", nargs="*", help="template names (default: cv)")
+    parser.add_argument("--jobs", metavar="CSV", help='jobs from CSV: columns "template", "output" and overrides')
+    parser.add_argument("-o", "--out-dir", default=".")
+    parser.add_argument("--profile", default="default", choices=sorted(OUTPUT_PROFILES))
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="preview server port (0: none)")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="seconds between file checks")
+    args = parser.parse_args()
+
+    for name in args.templates:
+        template_module_name(name)  # unknown names fail before the warm-up
+    jobs = [(name, f"{name}.pdf", None) for name in args.templates or ["cv"]]
+    watcher = Watcher(None if args.jobs else jobs, args.jobs, args.out_dir, args.profile)
+    seconds = watcher.start()
+    print(f"✅ Rendered {len(watcher.documents)} document(s) in {seconds:.2f}s; watching "
+          f"{len(watcher._stats)} file(s)")
+    if args.port:
+        server = serve(watcher, args.port)
+        print(f"   Preview: http://127.0.0.1:{server.server_address[1]}/")
+    try:
+        watcher.run(args.interval)
+    except KeyboardInterrupt:
+        pass
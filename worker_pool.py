@@ -0,0 +1,193 @@
+# worker_pool.py
+# Parallel rendering of templates in worker processes
+#
+# In "forkserver" mode (default) a fork server imports reportlab, academic_styles
+# (which parses and registers the fonts) and all template modules once. Workers are
+# forked from it and share those pages copy-on-write instead of re-importing
+# everything as they would under the "spawn" start method.
+#
+# render_batch_threads() renders in a thread pool of this process instead: every job
+# is an immutable RenderInput rendered from its own module instance, and the caches
+# the renders share (fonts, layout cache) are safe to fill from several threads.
+# Render hooks (RENDER_HOOKS) run in the calling thread as each job completes.
+
+import concurrent.futures
+import contextlib
+import csv
+import functools
+import io
+import multiprocessing
+import os
+import sys
+import time
+
+from pdf_output import OUTPUT_PROFILES
+from templates import TEMPLATES, RenderInput, render, run_render_hooks
+
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules imported once by the fork server (or by the parent in "fork" mode)
+PRELOAD_MODULES = [
+    "reportlab.platypus",
+    "reportlab.pdfgen.canvas",
+    "academic_styles",
+    "templates",
+] + sorted(set(TEMPLATES.values()))
+
+
+# ---------- Process Context ----------
+
+def get_context(start_method="forkserver"):
+    """Returns multiprocessing context; preloads template modules where possible"""
+    ctx = multiprocessing.get_context(start_method)
+    if start_method == "forkserver":
+        # The fork server imports preload modules with its own sys.path,
+        # so make sure this directory is importable regardless of the CWD
+        paths = os.environ.get("PYTHONPATH", "").split(os.pathsep)
+        if REPO_DIR not in paths:
+            os.environ["PYTHONPATH"] = os.pathsep.join([REPO_DIR] + [p for p in paths if p])
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+    elif start_method == "fork":
+        preload()
+    return ctx
+
+
+def preload():
+    """Imports template modules in the current process"""
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    for name in PRELOAD_MODULES:
+        __import__(name)
+
+
+# ---------- Worker Functions ----------
+
+def _init_worker():
+    preload()
+
+
+def _render_job(job, profile="default"):
+    """Renders one (template, path, overrides) job, returns output path"""
+    name, path, overrides = job
+    render(RenderInput.of(name, profile, **(overrides or {})), path)
+    return path
+
+
+def _render_job_unhooked(job, profile="default"):
+    """Renders one (template, path, overrides) job without render hooks, returns
+    (RenderInput, path, module) for the caller to run them"""
+    name, path, overrides = job
+    render_input = RenderInput.of(name, profile, **(overrides or {}))
+    return render_input, path, render(render_input, path, hooks=False)
+
+
+def _render_job_bytes(job, profile="default"):
+    """Renders one (template, name, overrides) job in memory, returns (name, pdf bytes)"""
+    name, entry, overrides = job
+    buf = io.BytesIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        render(RenderInput.of(name, profile, **(overrides or {})), buf)
+    return entry, buf.getvalue()
+
+
+def render_batch(jobs, processes=None, start_method="forkserver", profile="default"):
+    """Renders jobs [(template, path, overrides), ...] in a worker pool.
+
+    Returns output paths in job order.
+    """
+    ctx = get_context(start_method)
+    with ctx.Pool(processes, initializer=_init_worker) as pool:
+        return pool.map(functools.partial(_render_job, profile=profile), list(jobs))
+
+
+# ---------- Thread Pool ----------
+
+def render_batch_threads(jobs, threads=None, profile="default"):
+    """Renders jobs [(template, path, overrides), ...] in a pool of threads of this
+    process; paths may be file objects.
+
+    Returns output paths in job order.
+    """
+    preload()  # module imports register fonts: done once, before the threads start
+    with concurrent.futures.ThreadPoolExecutor(threads) as pool:
+        futures = [pool.submit(_render_job_unhooked, job, profile) for job in jobs]
+        paths = []
+        for future in futures:
+            job, path, module = future.result()
+            run_render_hooks(job, path, module)  # here, so hooks need not be thread-safe
+            paths.append(path)
+        return paths
+
+
+def read_jobs(csv_path):
+    """Reads batch jobs from CSV: columns "template", "output" and configuration overrides.
+
+    Empty override cells keep the template's own value.
+    """
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = row.pop("template")
+            output = row.pop("output", "") or f"{name}.pdf"
+            yield name, output, {k: v for k, v in row.items() if v}
+
+
+# ---------- Memory Statistics ----------
+
+def memory_usage():
+    """Returns (rss_kb, private_kb) of the current process.
+
+    Private memory excludes pages still shared copy-on-write with the parent.
+    On systems without /proc, private memory equals peak RSS.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(
+                (line.split(":")[0], int(line.split()[1]))
+                for line in f if line.split()[-1:] == ["kB"]
+            )
+        return fields["Rss"], fields["Private_Clean"] + fields["Private_Dirty"]
+    except (OSError, KeyError):
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            rss //= 1024  # bytes on macOS
+        return rss, rss
+
+
+def worker_stats(_=None):
+    """Returns (pid, rss_kb, private_kb) of the worker; used by the benchmark"""
+    return (os.getpid(),) + memory_usage()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render templates in parallel")
+    parser.add_argument("templates", nargs="*", default=sorted(TEMPLATES), help="template names")
+    parser.add_argument("-j", "--processes", type=int, default=None)
+    parser.add_argument("-t", "--threads", type=int, metavar="N", help="render in N threads instead of processes")
+    parser.add_argument("--start-method", default="forkserver", choices=["forkserver", "spawn", "fork"])
+    parser.add_argument("-o", "--out-dir", default=".")
+    parser.add_argument("--profile", default="default", choices=sorted(OUTPUT_PROFILES))
+    parser.add_argument("--index", metavar="DB", help="add rendered documents to this search index")
+    parser.add_argument("--verify", action="store_true", help="check that rendered PDFs read back as their source text")
+    args = parser.parse_args()
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    jobs = [(name, os.path.join(args.out_dir, f"{name}.pdf"), None) for name in args.templates]
+    start = time.perf_counter()
+    if args.threads:
+        render_batch_threads(jobs, args.threads, args.profile)
+    else:
+        render_batch(jobs, args.processes, args.start_method, args.profile)
+    mode = f"{args.threads} threads" if args.threads else args.start_method
+    print(f"Rendered {len(jobs)} documents in {time.perf_counter() - start:.2f}s ({mode})")
+    if args.index:
+        from doc_index import DocumentIndex
+        with DocumentIndex(args.index) as index:
+            print(f"Indexed {index.add_rendered(jobs)} new or changed documents in {args.index}")
+    if args.verify:
+        from ats_check import check_batch, print_report
+        start = time.perf_counter()
+        print_report(check_batch(jobs, args.processes, args.start_method), time.perf_counter() - start)